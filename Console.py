@@ -1,6 +1,46 @@
 import pymysql
 import pymysql.cursors
+import collections.abc
+import json
+import os
 import re
+import time
+
+from bulk_loader import BulkLoadError, bulk_load_file, guess_delimiter
+from db_pool import ConnectionPool
+from query_cache import QueryResultCache
+from query_profiler import QueryProfiler, percentile, profiling_cursor_class
+from query_governor import GovernorError, QueryGovernor
+import batch_edit
+import change_capture
+import hierarchy
+import index_advisor
+import migrations
+import record_search
+import relational_division
+import summary_tables
+import table_renderer
+from result_set import ResultSet
+from schema_catalog import SchemaCatalog, is_ddl_statement
+from statement_cache import StatementCache
+
+# async_engine (asyncio), local_backend (sqlite3), sales_analytics (NumPy) and bulk_export (gzip)
+# are imported where first used: scripted runs through console_cli.py never pay for them.
+
+# Every statement run through DB_CONFIG connections is timed; reports and custom SQL also record
+# execute/fetch/render phases and performance_schema server metrics.
+PROFILER_CONFIG = {
+    'enabled': True,
+    'window_size': 1000,
+    'server_metrics': True,
+    'trace_path': None
+}
+PROFILER_TRACE_DEFAULT_PATH = "query_trace.jsonl"
+QUERY_PROFILER = QueryProfiler(**PROFILER_CONFIG)
+# Report and custom SQL results are streamed as tuples into a columnar ResultSet instead of one
+# dict per row; RowView keeps row['col'] access for the display code.
+STREAMING_CURSOR_CLASS = profiling_cursor_class(QUERY_PROFILER, pymysql.cursors.SSCursor)
+RESULT_FETCH_CHUNK_SIZE = 10000
 
 DB_CONFIG = {
     'host': 'localhost',
@@ -8,9 +48,126 @@ DB_CONFIG = {
     'user': 'root',
     'password': 'Bangladesh1!',
     'database': 'project',
-    'cursorclass': pymysql.cursors.DictCursor
+    'local_infile': True,
+    'cursorclass': profiling_cursor_class(QUERY_PROFILER)
+}
+
+POOL_CONFIG = {
+    'min_size': 1,
+    'max_size': 5,
+    'checkout_timeout': 30.0,
+    'connect_retries': 5,
+    'backoff_base': 0.5,
+    'backoff_max': 8.0,
+    'session_settings': {
+        'innodb_lock_wait_timeout': 50
+    }
 }
 
+BULK_IMPORT_CONFIG = {
+    'batch_size': 1000,
+    'commit_interval': 10000,
+    'use_load_data': True
+}
+
+# Batch edits group keys into multi-row IN statements and commit every commit_interval keys.
+BATCH_EDIT_CONFIG = {
+    'chunk_size': 500,
+    'commit_interval': 5000
+}
+
+EXPORT_CONFIG = {
+    'chunk_size': 5000,
+    'default_format': 'csv'
+}
+
+INDEX_ADVISOR_REPORT_PATH = "index_advisor_report.json"
+
+BACKGROUND_JOB_CONFIG = {
+    'max_workers': POOL_CONFIG['max_size'] - 1,
+    'fetch_chunk_size': 1000
+}
+
+SCHEMA_CACHE_TTL_SECONDS = 300
+SCHEMA_CATALOG = SchemaCatalog(ttl_seconds=SCHEMA_CACHE_TTL_SECONDS)
+
+# Predefined report results; entries are dropped when a console write touches a table they read.
+# The TTL bounds staleness from writes made by other clients and from CURDATE()-relative reports.
+QUERY_CACHE_CONFIG = {
+    'max_entries': 64,
+    'max_bytes': 32 * 1024 * 1024,
+    'ttl_seconds': 600
+}
+QUERY_CACHE = QueryResultCache(**QUERY_CACHE_CONFIG)
+
+# Canonical INSERT/UPDATE/DELETE/SELECT-by-PK statements for the record menus. server_prepare
+# switches to server-side PREPARE/EXECUTE, which trades a parse per call for an extra round trip.
+STATEMENT_CACHE_CONFIG = {
+    'max_entries': 256,
+    'server_prepare': False
+}
+STATEMENT_CACHE = StatementCache(**STATEMENT_CACHE_CONFIG)
+
+# Employee supervision and customer referral trees, loaded whole and walked in memory.
+HIERARCHY_CACHE_TTL_SECONDS = 300
+HIERARCHY_CACHE = hierarchy.HierarchyCache(ttl_seconds=HIERARCHY_CACHE_TTL_SECONDS)
+HIERARCHY_DISPLAY_LIMIT = 200
+# Depth bound for the recursive CTE cross-check; it also ends a supervision cycle early.
+HIERARCHY_VERIFY_MAX_DEPTH = 100
+
+# Analytics mode loads sale lines once into typed arrays and answers slices in memory.
+ANALYTICS_CONFIG = {
+    'memory_budget_mb': 256,
+    'chunk_size': 10000,
+    'top_n': 20
+}
+ANALYTICS_SESSION = {'dataset': None}
+
+# Read-only SQLite snapshot of the database. With reports_on_snapshot the predefined reports
+# read the snapshot in-process instead of MySQL; every write still goes to MySQL.
+LOCAL_BACKEND_CONFIG = {
+    'snapshot_path': "project_snapshot.sqlite3",
+    'bucket_size': 1000,
+    'reports_on_snapshot': False
+}
+LOCAL_BACKEND_SESSION = {'connection': None}
+
+# Console writes are logged to change_log (when installed) in the same transaction. The feed is
+# also polled, at most every poll_interval_seconds, to drop cached reports over tables that
+# other clients changed.
+CHANGE_CAPTURE_CONFIG = {
+    'enabled': True,
+    'poll_interval_seconds': 2.0,
+    'excluded_tables': change_capture.CHANGE_LOG_TABLES + tuple(summary_tables.SUMMARY_TABLES.values())
+                       + (summary_tables.REFRESH_STATE_TABLE, 'schema_migrations', 'schema_migration_steps')
+}
+CHANGE_FEED_STATE = {'last_change_id': None, 'polled_at': 0.0}
+
+# Result tables size columns from the first sample_rows rows, cut longer values at
+# max_column_width and write chunk_rows lines at a time. pager: 'auto' pipes a table taller
+# than the terminal through $PAGER (default `less -S`), 'always' or 'never'.
+RENDER_CONFIG = {
+    'max_column_width': 40,
+    'sample_rows': 1000,
+    'chunk_rows': 2000,
+    'pager': 'auto'
+}
+
+# Limits on custom SQL (console, CLI and background jobs) so one ad-hoc statement can't saturate
+# the shared server: an EXPLAIN rows-examined budget, a per-statement time limit, a row cap on
+# SELECT results, and at most max_concurrent_heavy statements over heavy_row_threshold estimated
+# rows per MySQL user at a time (others queue up to queue_timeout_seconds).
+GOVERNOR_CONFIG = {
+    'enabled': True,
+    'max_execution_ms': 30000,
+    'max_rows': 100000,
+    'explain_row_budget': 50000000,
+    'heavy_row_threshold': 1000000,
+    'max_concurrent_heavy': 2,
+    'queue_timeout_seconds': 30.0
+}
+QUERY_GOVERNOR = QueryGovernor(DB_CONFIG, **GOVERNOR_CONFIG)
+
 def establish_db_connection():
     try:
         conn = pymysql.connect(**DB_CONFIG)
@@ -20,60 +177,52 @@ def establish_db_connection():
         print("Please ensure MySQL server is running and configuration is correct.")
         return None
 
+def create_connection_pool():
+    try:
+        return ConnectionPool(DB_CONFIG, **POOL_CONFIG).open()
+    except pymysql.Error as e:
+        print(f"FATAL: Error connecting to the MySQL database: {e}")
+        print("Please ensure MySQL server is running and configuration is correct.")
+        return None
+
 def display_results_as_table(query_results):
     if not query_results:
         print("No data to display or query returned no results.")
         return
 
-    if not isinstance(query_results[0], dict):
+    if not isinstance(query_results[0], collections.abc.Mapping):
         print("Error: Query results are not in the expected dictionary format.")
         return
 
-    headers = query_results[0].keys()
+    headers = list(query_results[0].keys())
     if not headers:
         print("Query returned rows with no columns.")
         return
-        
-    col_widths = {header: len(str(header)) for header in headers}
-    for row_data in query_results:
-        for header_name in headers:
-            col_widths[header_name] = max(col_widths[header_name], len(str(row_data.get(header_name, ''))))
-
-    header_separator_line = " | ".join(f"{'-' * col_widths[header_name]}" for header_name in headers)
-    header_line_text = " | ".join(f"{str(header_name):<{col_widths[header_name]}}" for header_name in headers)
-    
-    print(f"\n{header_line_text}")
-    print(header_separator_line)
 
-    for row_data in query_results:
-        row_line_text = " | ".join(f"{str(row_data.get(header_name, '')):<{col_widths[header_name]}}" for header_name in headers)
-        print(row_line_text)
-    print(header_separator_line)
-    print(f"{len(query_results)} row(s) returned.\n")
+    table_renderer.render_table(
+        headers, table_renderer.row_tuples(query_results, headers), len(query_results),
+        footer=f"{len(query_results)} row(s) returned.\n", max_column_width=RENDER_CONFIG['max_column_width'],
+        sample_rows=RENDER_CONFIG['sample_rows'], chunk_rows=RENDER_CONFIG['chunk_rows'], pager_mode=RENDER_CONFIG['pager']
+    )
 
 def get_table_metadata(connection, table_name):
-    column_details_list = []
-    primary_key_columns = []
     try:
-        with connection.cursor() as cursor:
-            cursor.execute(f"DESCRIBE `{table_name}`;")
-            columns_description = cursor.fetchall()
-            if not columns_description:
-                print(f"Warning: Could not retrieve description for table '{table_name}'. Does it exist?")
-                return [], []
-            for col_desc in columns_description:
-                column_details_list.append({
-                    'name': col_desc['Field'], 'type': col_desc['Type'],
-                    'nullable': col_desc['Null'].upper() == 'YES', 'key_type': col_desc['Key'],
-                    'default_value': col_desc['Default'], 'extra_info': col_desc['Extra']
-                })
-                if col_desc['Key'] == 'PRI':
-                    primary_key_columns.append(col_desc['Field'])
-            return column_details_list, primary_key_columns
+        column_details_list, primary_key_columns = SCHEMA_CATALOG.get_columns(connection, table_name)
+        if not column_details_list:
+            print(f"Warning: Could not retrieve description for table '{table_name}'. Does it exist?")
+            return [], []
+        return column_details_list, primary_key_columns
     except pymysql.Error as e:
         handle_database_error(e, f"fetching metadata for table `{table_name}`")
         return [], []
 
+def preload_schema_catalog(pool):
+    try:
+        with pool.connection() as connection:
+            SCHEMA_CATALOG.load(connection)
+    except pymysql.Error as e:
+        handle_database_error(e, "loading the schema catalog")
+
 def handle_database_error(db_error, operation_context="performing a database operation"):
     error_code = db_error.args[0] if len(db_error.args) > 0 else "N/A"
     error_message = db_error.args[1] if len(db_error.args) > 1 else str(db_error)
@@ -116,37 +265,114 @@ def handle_database_error(db_error, operation_context="performing a database ope
 def get_table_choice(connection, prompt_text="Select a table number or enter its name"):
     print("\n--- Available Tables ---")
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SHOW TABLES;")
-            db_tables = cursor.fetchall()
-            if not db_tables:
-                print("No tables found in the database.")
-                return None
-            
-            table_names_list = [list(tbl.values())[0] for tbl in db_tables]
-            for i, tbl_name in enumerate(table_names_list):
-                print(f"  {i + 1}. {tbl_name}")
-            
-            user_input = input(f"{prompt_text}: ").strip()
-            if user_input.isdigit():
-                choice_idx = int(user_input) - 1
-                if 0 <= choice_idx < len(table_names_list):
-                    return table_names_list[choice_idx]
-                else:
-                    print("Invalid table number selected.")
-                    return None
-            elif user_input in table_names_list:
-                return user_input
-            else:
-                if user_input:
-                    print(f"Warning: '{user_input}' was not in the listed tables. Attempting to use this name.")
-                    return user_input
-                print("No table selected or invalid input.")
-                return None
+        table_names_list = SCHEMA_CATALOG.table_names(connection)
     except pymysql.Error as e:
         handle_database_error(e, "listing tables")
         return None
 
+    if not table_names_list:
+        print("No tables found in the database.")
+        return None
+
+    for i, tbl_name in enumerate(table_names_list):
+        print(f"  {i + 1}. {tbl_name}")
+
+    user_input = input(f"{prompt_text}: ").strip()
+    if user_input.isdigit():
+        choice_idx = int(user_input) - 1
+        if 0 <= choice_idx < len(table_names_list):
+            return table_names_list[choice_idx]
+        else:
+            print("Invalid table number selected.")
+            return None
+    elif user_input in table_names_list:
+        return user_input
+    else:
+        if user_input:
+            print(f"Warning: '{user_input}' was not in the listed tables. Attempting to use this name.")
+            return user_input
+        print("No table selected or invalid input.")
+        return None
+
+VIEW_PAGE_SIZE = 100
+SEARCH_PAGE_SIZE = 25
+VIEW_MAX_COLUMN_WIDTH = 40
+
+def format_table_cell(value, width):
+    cell_text = '' if value is None else str(value)
+    if len(cell_text) > width:
+        cell_text = cell_text[:max(width - 3, 0)] + '...'
+    return f"{cell_text:<{width}}"
+
+def iter_table_pages(connection, table_name, pk_cols, page_size):
+    if not pk_cols:
+        with connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(f"SELECT * FROM `{table_name}`;")
+            page_rows = []
+            for row_data in cursor:
+                page_rows.append(row_data)
+                if len(page_rows) >= page_size:
+                    yield page_rows
+                    page_rows = []
+            if page_rows:
+                yield page_rows
+        return
+
+    pk_tuple_sql = ", ".join(f"`{pk}`" for pk in pk_cols)
+    pk_placeholders = ", ".join(['%s'] * len(pk_cols))
+    last_key = None
+    while True:
+        sql_page_query = f"SELECT * FROM `{table_name}`"
+        if last_key is not None:
+            sql_page_query += f" WHERE ({pk_tuple_sql}) > ({pk_placeholders})"
+        sql_page_query += f" ORDER BY {pk_tuple_sql} LIMIT {int(page_size)};"
+
+        with connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(sql_page_query, last_key)
+            page_rows = list(cursor)
+        if not page_rows:
+            return
+        yield page_rows
+        if len(page_rows) < page_size:
+            return
+        last_key = tuple(page_rows[-1][pk] for pk in pk_cols)
+
+def stream_table_contents(connection, table_name, page_size=VIEW_PAGE_SIZE, max_col_width=VIEW_MAX_COLUMN_WIDTH):
+    column_metadata, pk_cols = get_table_metadata(connection, table_name)
+    if not column_metadata:
+        return
+    if not pk_cols:
+        print(f"Note: `{table_name}` has no primary key; streaming it in a single unbuffered scan.")
+
+    headers = None
+    col_widths = None
+    header_separator_line = ""
+    total_rows = 0
+
+    for page_rows in iter_table_pages(connection, table_name, pk_cols, page_size):
+        if headers is None:
+            headers = list(page_rows[0].keys())
+            col_widths = {header: len(str(header)) for header in headers}
+            for row_data in page_rows:
+                for header_name in headers:
+                    cell_len = len(str(row_data.get(header_name, '')))
+                    col_widths[header_name] = min(max(col_widths[header_name], cell_len), max_col_width)
+            header_separator_line = " | ".join(f"{'-' * col_widths[header_name]}" for header_name in headers)
+            print("\n" + " | ".join(format_table_cell(header_name, col_widths[header_name]) for header_name in headers))
+            print(header_separator_line)
+        elif input(f"-- {total_rows} row(s) shown. Press Enter for the next page or 'q' to stop: ").strip().lower() == 'q':
+            break
+
+        for row_data in page_rows:
+            print(" | ".join(format_table_cell(row_data.get(header_name, ''), col_widths[header_name]) for header_name in headers))
+        total_rows += len(page_rows)
+
+    if headers is None:
+        print("No data to display or query returned no results.")
+        return
+    print(header_separator_line)
+    print(f"{total_rows} row(s) displayed.\n")
+
 def view_table_contents(connection):
     target_table = get_table_choice(connection, "Enter table number/name to view its contents")
     if not target_table:
@@ -154,13 +380,180 @@ def view_table_contents(connection):
 
     print(f"\n--- Contents of table: `{target_table}` ---")
     try:
-        with connection.cursor() as cursor:
-            cursor.execute(f"SELECT * FROM `{target_table}`;")
-            table_data = cursor.fetchall()
-            display_results_as_table(table_data)
+        stream_table_contents(connection, target_table)
     except pymysql.Error as e:
         handle_database_error(e, f"viewing data from `{target_table}`")
 
+# Optional `schema.` qualifier, then the table. Multi-table UPDATE/DELETE and anything the
+# pattern does not recognise yield None, which invalidates every cached result.
+DML_TARGET_TABLE_PATTERN = re.compile(
+    r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+IGNORE)?|DELETE\s+FROM)\s+"
+    r"(?:(?:`[^`]+`|\w+)\s*\.\s*)?(?:`([^`]+)`|(\w+))(?=\s|\(|;|$)",
+    re.IGNORECASE
+)
+
+MULTI_TABLE_PATTERN = re.compile(r"^\s*(?:(?:AS\s+)?\w+\s*)?(?:,|(?:\w+\s+)*JOIN\b|USING\b)", re.IGNORECASE)
+
+def get_dml_target_table(sql_text):
+    target_match = DML_TARGET_TABLE_PATTERN.match(sql_text)
+    if not target_match or MULTI_TABLE_PATTERN.match(sql_text[target_match.end():]):
+        return None
+    return target_match.group(1) or target_match.group(2)
+
+def fetch_row_by_pk(connection, table_name, pk_cols, pk_values):
+    with connection.cursor() as cursor:
+        STATEMENT_CACHE.execute(cursor, table_name, 'select', key_columns=pk_cols, params=tuple(pk_values))
+        return cursor.fetchone()
+
+def installed_summaries(connection):
+    return summary_tables.installed_summaries(SCHEMA_CATALOG.table_names(connection))
+
+def dependent_summaries(connection, table_name):
+    if table_name not in summary_tables.SUMMARY_SOURCE_TABLES:
+        return ()
+    return summary_tables.dependent_summaries(table_name, installed_summaries(connection))
+
+def captures_changes(connection, table_name):
+    return (CHANGE_CAPTURE_CONFIG['enabled'] and table_name not in CHANGE_CAPTURE_CONFIG['excluded_tables']
+            and change_capture.is_installed(SCHEMA_CATALOG.table_names(connection)))
+
+def needs_row_images(connection, table_name):
+    return bool(dependent_summaries(connection, table_name)) or captures_changes(connection, table_name)
+
+def notify_table_write(connection, table_name, row_changes):
+    # Runs inside the caller's transaction, before its commit. row_changes are (before, after)
+    # pairs; before is None for an insert, after is None for a delete.
+    maintain_summaries(connection, table_name, row_changes)
+    record_table_changes(connection, table_name, row_changes)
+
+def maintain_summaries(connection, table_name, row_changes):
+    summary_names = dependent_summaries(connection, table_name)
+    if summary_names:
+        summary_tables.apply_incremental_refresh(connection, table_name, row_changes, summary_names)
+
+def record_table_changes(connection, table_name, row_changes):
+    # Locks the change log's id sequence until the commit, so call it last.
+    if captures_changes(connection, table_name):
+        _, pk_cols = SCHEMA_CATALOG.get_columns(connection, table_name)
+        with connection.cursor() as cursor:
+            change_capture.record_row_changes(cursor, table_name, pk_cols, row_changes)
+
+def notify_statement_write(connection, table_name, statement_text, affected_rows=None):
+    # Writes without row images (custom DML, bulk loads) are logged as one statement event.
+    if captures_changes(connection, table_name):
+        with connection.cursor() as cursor:
+            change_capture.record_statement(cursor, table_name, statement_text, affected_rows)
+
+def notify_bulk_table_write(connection, table_name, rows_loaded=None):
+    notify_statement_write(connection, table_name, f"bulk import into `{table_name}`", rows_loaded)
+    summary_names = dependent_summaries(connection, table_name)
+    if not summary_names:
+        return
+    watermark_info = summary_tables.DELTA_WATERMARKS.get(table_name)
+    if watermark_info and summary_names == (watermark_info['summary'],):
+        summary_tables.refresh_delta(connection, table_name)
+    else:
+        summary_tables.refresh_dependent_summaries_full(connection, table_name, summary_names)
+
+def invalidate_cached_results(table_name=None):
+    # Called after commit. A report that read before the commit took the caches' generation
+    # before its fetch, and put() drops its rows once this invalidation bumps it.
+    if table_name is None:
+        QUERY_CACHE.clear()
+        HIERARCHY_CACHE.clear()
+    else:
+        QUERY_CACHE.invalidate_tables([table_name])
+        HIERARCHY_CACHE.invalidate_tables([table_name])
+    # The analytics dataset is a snapshot; it is only flagged, reloading is up to the analyst.
+    if ANALYTICS_SESSION['dataset'] is not None:
+        import sales_analytics
+        if table_name is None or table_name in sales_analytics.ANALYTICS_SOURCE_TABLES:
+            ANALYTICS_SESSION['dataset'].stale = True
+
+def follow_change_log(connection):
+    # Drops cached results for tables written by other clients since the last poll. The first
+    # poll only takes the position: nothing was cached before it.
+    if not CHANGE_CAPTURE_CONFIG['enabled'] or is_local_connection(connection):
+        return
+    if time.monotonic() - CHANGE_FEED_STATE['polled_at'] < CHANGE_CAPTURE_CONFIG['poll_interval_seconds']:
+        return
+    if not change_capture.is_installed(SCHEMA_CATALOG.table_names(connection)):
+        return
+    CHANGE_FEED_STATE['polled_at'] = time.monotonic()
+    if CHANGE_FEED_STATE['last_change_id'] is None:
+        CHANGE_FEED_STATE['last_change_id'] = change_capture.latest_change_id(connection)
+        return
+    changed_tables, CHANGE_FEED_STATE['last_change_id'] = change_capture.changed_tables_since(connection, CHANGE_FEED_STATE['last_change_id'])
+    if change_capture.ALL_TABLES in changed_tables:
+        invalidate_cached_results()
+        return
+    for changed_table in changed_tables:
+        invalidate_cached_results(changed_table)
+
+# Single-row writes shared by the menu and the command line: summaries and the change log are
+# maintained in the same transaction, cached results are dropped after the commit. A failure
+# anywhere rolls the whole write back, so a caller that keeps the connection (console_cli batch)
+# can't later commit a row without its summary and change-log maintenance.
+def insert_row(connection, table_name, column_metadata, column_values):
+    insert_columns = list(column_values)
+    try:
+        with connection.cursor() as cursor:
+            STATEMENT_CACHE.execute(cursor, table_name, 'insert', insert_columns, params=tuple(column_values.values()))
+            inserted_id = cursor.lastrowid
+        inserted_row = dict(column_values)
+        # Auto-increment columns are not given; the log needs the generated key.
+        for col_meta in column_metadata:
+            if 'auto_increment' in col_meta.get('extra_info', '').lower() and inserted_id and col_meta['name'] not in inserted_row:
+                inserted_row[col_meta['name']] = inserted_id
+        if needs_row_images(connection, table_name):
+            # Summary deltas need typed values and defaults, not the text that was typed in.
+            _, pk_cols = SCHEMA_CATALOG.get_columns(connection, table_name)
+            if pk_cols and all(pk_col in inserted_row for pk_col in pk_cols):
+                inserted_row = fetch_row_by_pk(connection, table_name, pk_cols, [inserted_row[pk_col] for pk_col in pk_cols]) or inserted_row
+        notify_table_write(connection, table_name, [(None, inserted_row)])
+        connection.commit()
+    except pymysql.Error:
+        connection.rollback()
+        raise
+    invalidate_cached_results(table_name)
+    return inserted_row
+
+def update_row_by_pk(connection, table_name, pk_cols, pk_values, new_column_values):
+    updated_columns = list(new_column_values)
+    update_set_values = list(new_column_values.values())
+    try:
+        before_row = fetch_row_by_pk(connection, table_name, pk_cols, pk_values) if needs_row_images(connection, table_name) else None
+        with connection.cursor() as cursor:
+            rows_affected_count = STATEMENT_CACHE.execute(cursor, table_name, 'update', updated_columns, pk_cols,
+                                                          tuple(update_set_values + list(pk_values)))
+        if rows_affected_count > 0:
+            after_row = dict(before_row or {}, **new_column_values)
+            if before_row is not None:
+                after_row = fetch_row_by_pk(connection, table_name, pk_cols, [after_row[pk_col] for pk_col in pk_cols]) or after_row
+            notify_table_write(connection, table_name, [(before_row, after_row)])
+        connection.commit()
+    except pymysql.Error:
+        connection.rollback()
+        raise
+    if rows_affected_count > 0:
+        invalidate_cached_results(table_name)
+    return rows_affected_count
+
+def delete_row_by_pk(connection, table_name, pk_cols, pk_values):
+    try:
+        before_row = fetch_row_by_pk(connection, table_name, pk_cols, pk_values) if needs_row_images(connection, table_name) else None
+        with connection.cursor() as cursor:
+            rows_affected_count = STATEMENT_CACHE.execute(cursor, table_name, 'delete', key_columns=pk_cols, params=tuple(pk_values))
+        if rows_affected_count > 0:
+            notify_table_write(connection, table_name, [(before_row, None)])
+        connection.commit()
+    except pymysql.Error:
+        connection.rollback()
+        raise
+    if rows_affected_count > 0:
+        invalidate_cached_results(table_name)
+    return rows_affected_count
+
 def insert_new_record(connection):
     target_table = get_table_choice(connection, "Enter table number/name to add a record to")
     if not target_table:
@@ -174,7 +567,6 @@ def insert_new_record(connection):
     print("Enter values for each column. Type 'NULL' (case-insensitive) for SQL NULL if allowed.")
     
     insert_columns = []
-    insert_values_placeholders = []
     actual_values_to_insert = []
 
     for col_meta in column_metadata:
@@ -195,8 +587,7 @@ def insert_new_record(connection):
         
         user_val_str = input(prompt_msg).strip()
 
-        insert_columns.append(f"`{col_name}`")
-        insert_values_placeholders.append('%s')
+        insert_columns.append(col_name)
 
         if user_val_str.upper() == 'NULL':
             if is_col_nullable:
@@ -216,17 +607,33 @@ def insert_new_record(connection):
         print("No columns are available for data insertion (e.g., table might only contain auto-increment columns).")
         return
 
-    sql_insert_query = f"INSERT INTO `{target_table}` ({', '.join(insert_columns)}) VALUES ({', '.join(insert_values_placeholders)});"
-    
     try:
-        with connection.cursor() as cursor:
-            cursor.execute(sql_insert_query, tuple(actual_values_to_insert))
-        connection.commit()
+        insert_row(connection, target_table, column_metadata, dict(zip(insert_columns, actual_values_to_insert)))
         print(f"Record successfully added to `{target_table}`!")
     except pymysql.Error as e:
         handle_database_error(e, f"adding record to `{target_table}`")
         connection.rollback()
 
+def prompt_update_values(column_metadata, pk_cols):
+    print("\nWhich column(s) would you like to update? (Primary key columns cannot be updated here)")
+    new_column_values = {}
+    for col_meta in column_metadata:
+        col_name = col_meta['name']
+        if col_name in pk_cols:
+            continue
+
+        user_choice = input(f"  Update column '{col_name}' ({col_meta['type']})? (y/N default is No): ").strip().lower()
+        if user_choice == 'y':
+            new_val_str = input(f"    Enter new value for '{col_name}' (type 'NULL' for SQL NULL if allowed): ").strip()
+            if new_val_str.upper() == 'NULL' and col_meta['nullable']:
+                new_column_values[col_name] = None
+            elif new_val_str.upper() == 'NULL' and not col_meta['nullable']:
+                print(f"    Warning: Column '{col_name}' is not nullable. 'NULL' string will be inserted or may cause an error.")
+                new_column_values[col_name] = new_val_str
+            else:
+                new_column_values[col_name] = new_val_str
+    return new_column_values
+
 def modify_existing_record(connection):
     target_table = get_table_choice(connection, "Enter table number/name to update a record in")
     if not target_table:
@@ -244,52 +651,21 @@ def modify_existing_record(connection):
     print(f"Primary Key column(s) for this table: {', '.join([f'`{pk}`' for pk in pk_cols])}")
     print("Please enter the current values for these primary key column(s) to identify the record:")
 
-    pk_where_conditions = []
     pk_where_values = []
     for pk_col_name in pk_cols:
         pk_val = input(f"  Value for PK column '{pk_col_name}': ").strip()
         if not pk_val:
             print(f"Primary key value for '{pk_col_name}' cannot be empty. Update aborted.")
             return
-        pk_where_conditions.append(f"`{pk_col_name}` = %s")
         pk_where_values.append(pk_val)
-    
-    sql_where_clause = " AND ".join(pk_where_conditions)
-
-    print("\nWhich column(s) would you like to update? (Primary key columns cannot be updated here)")
-    update_set_clauses = []
-    update_set_values = []
-    made_a_change = False
-
-    for col_meta in column_metadata:
-        col_name = col_meta['name']
-        if col_name in pk_cols:
-            continue
 
-        user_choice = input(f"  Update column '{col_name}' ({col_meta['type']})? (y/N default is No): ").strip().lower()
-        if user_choice == 'y':
-            made_a_change = True
-            new_val_str = input(f"    Enter new value for '{col_name}' (type 'NULL' for SQL NULL if allowed): ").strip()
-            update_set_clauses.append(f"`{col_name}` = %s")
-            if new_val_str.upper() == 'NULL' and col_meta['nullable']:
-                update_set_values.append(None)
-            elif new_val_str.upper() == 'NULL' and not col_meta['nullable']:
-                print(f"    Warning: Column '{col_name}' is not nullable. 'NULL' string will be inserted or may cause an error.")
-                update_set_values.append(new_val_str)
-            else:
-                update_set_values.append(new_val_str)
-    
-    if not made_a_change:
+    new_column_values = prompt_update_values(column_metadata, pk_cols)
+    if not new_column_values:
         print("No columns were selected for update. Operation cancelled.")
         return
 
-    sql_update_query = f"UPDATE `{target_table}` SET {', '.join(update_set_clauses)} WHERE {sql_where_clause};"
-    all_sql_values = tuple(update_set_values + pk_where_values)
-
     try:
-        with connection.cursor() as cursor:
-            rows_affected_count = cursor.execute(sql_update_query, all_sql_values)
-        connection.commit()
+        rows_affected_count = update_row_by_pk(connection, target_table, pk_cols, pk_where_values, new_column_values)
         if rows_affected_count > 0:
             print(f"{rows_affected_count} record(s) in `{target_table}` updated successfully!")
         else:
@@ -314,7 +690,6 @@ def remove_record(connection):
     print(f"Primary Key column(s): {', '.join([f'`{pk}`' for pk in pk_cols])}")
     print("Enter values for these primary key column(s) to identify the record for deletion:")
 
-    pk_where_conditions_sql = []
     pk_where_values_sql = []
     pk_display_conditions = []
 
@@ -323,11 +698,9 @@ def remove_record(connection):
         if not pk_val:
             print(f"Primary key value for '{pk_col_name}' cannot be empty. Delete aborted.")
             return
-        pk_where_conditions_sql.append(f"`{pk_col_name}` = %s")
         pk_where_values_sql.append(pk_val)
         pk_display_conditions.append(f"`{pk_col_name}` = '{pk_val}'")
     
-    sql_where_clause_for_delete = " AND ".join(pk_where_conditions_sql)
     display_where_clause = " AND ".join(pk_display_conditions)
 
     confirm_delete = input(f"Are you absolutely sure you want to delete record(s) from `{target_table}` WHERE {display_where_clause}? This cannot be undone. (yes/no): ").strip().lower()
@@ -335,12 +708,8 @@ def remove_record(connection):
         print("Deletion operation cancelled by user.")
         return
 
-    sql_delete_query = f"DELETE FROM `{target_table}` WHERE {sql_where_clause_for_delete};"
-    
     try:
-        with connection.cursor() as cursor:
-            rows_affected_count = cursor.execute(sql_delete_query, tuple(pk_where_values_sql))
-        connection.commit()
+        rows_affected_count = delete_row_by_pk(connection, target_table, pk_cols, pk_where_values_sql)
         if rows_affected_count > 0:
             print(f"{rows_affected_count} record(s) successfully deleted from `{target_table}`.")
         else:
@@ -349,6 +718,147 @@ def remove_record(connection):
         handle_database_error(e, f"deleting record from `{target_table}`")
         connection.rollback()
 
+def batch_edit_records(connection):
+    target_table = get_table_choice(connection, "Enter table number/name to batch update or delete in")
+    if not target_table:
+        return
+
+    column_metadata, pk_cols = get_table_metadata(connection, target_table)
+    if not column_metadata: return
+
+    if not pk_cols:
+        print(f"Batch Edit Aborted: Table `{target_table}` has no defined primary key.")
+        return
+
+    print(f"\n--- Batch Edit in `{target_table}` ---")
+    print(f"Primary Key column(s): {', '.join([f'`{pk}`' for pk in pk_cols])}")
+    edit_action = input("  (u)pdate or (d)elete the listed rows? ").strip().lower()
+    if edit_action not in ('u', 'd'):
+        print("Batch edit cancelled.")
+        return
+
+    print("Give the keys as a CSV/TSV file whose header names the primary key column(s),")
+    print("or type them inline: keys separated by ';', composite key parts by ',' (e.g. 5,7; 5,8).")
+    key_source = input("  Key file path or inline keys: ").strip()
+    error_file_path = None
+    try:
+        if os.path.isfile(key_source):
+            target_keys = batch_edit.read_key_file(key_source, pk_cols, delimiter=guess_delimiter(key_source))
+            error_file_path = f"{os.path.splitext(key_source)[0]}.failed.csv"
+        else:
+            target_keys = batch_edit.parse_key_list(key_source, pk_cols)
+    except batch_edit.BatchEditError as e:
+        print(f"Batch edit aborted: {e}")
+        return
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Batch edit aborted: could not read '{key_source}': {e}")
+        return
+    if not target_keys:
+        print("No keys given. Batch edit cancelled.")
+        return
+
+    new_column_values = None
+    if edit_action == 'u':
+        new_column_values = prompt_update_values(column_metadata, pk_cols)
+        if not new_column_values:
+            print("No columns were selected for update. Operation cancelled.")
+            return
+
+    chunk_size_input = input(f"  Keys per statement (Enter for {BATCH_EDIT_CONFIG['chunk_size']}): ").strip()
+    commit_interval_input = input(f"  Keys per transaction (Enter for {BATCH_EDIT_CONFIG['commit_interval']}): ").strip()
+    if (chunk_size_input and not chunk_size_input.isdigit()) or (commit_interval_input and not commit_interval_input.isdigit()):
+        print("Chunk size and commit interval must be whole numbers. Batch edit aborted.")
+        return
+    edit_options = {
+        'set_values': new_column_values, 'delete': edit_action == 'd',
+        'chunk_size': int(chunk_size_input or BATCH_EDIT_CONFIG['chunk_size']),
+        'commit_interval': int(commit_interval_input or BATCH_EDIT_CONFIG['commit_interval'])
+    }
+
+    try:
+        dry_run_summary = batch_edit.batch_edit(connection, target_table, pk_cols, target_keys, dry_run=True, **edit_options)
+    except batch_edit.BatchEditError as e:
+        print(f"Batch edit aborted: {e}")
+        return
+    except pymysql.Error as e:
+        handle_database_error(e, f"counting rows to edit in `{target_table}`")
+        return
+    action_label = "delete" if edit_action == 'd' else f"update ({', '.join(new_column_values)})"
+    print(f"Dry run: {dry_run_summary['rows_matched']} of {dry_run_summary['keys']} key(s) match a row in `{target_table}`.")
+    if not dry_run_summary['rows_matched']:
+        return
+    confirm_edit = input(f"Apply {action_label} to {dry_run_summary['rows_matched']} row(s)? Each committed transaction cannot be undone. (yes/no): ").strip().lower()
+    if confirm_edit != 'yes':
+        print("Batch edit cancelled by user.")
+        return
+
+    def report_progress(keys_done, rows_affected, elapsed_seconds):
+        print(f"  ... {keys_done} of {len(target_keys)} key(s) committed, {rows_affected} row(s) changed ({elapsed_seconds:.1f}s)")
+
+    # Summaries follow each chunk; the change log is written once per transaction, right before
+    # its commit, so the id sequence is not locked while later chunks run.
+    change_listener = maintain_summaries if dependent_summaries(connection, target_table) else None
+    commit_listener = record_table_changes if captures_changes(connection, target_table) else None
+    try:
+        edit_summary = batch_edit.batch_edit(connection, target_table, pk_cols, target_keys, change_listener=change_listener,
+                                             commit_listener=commit_listener, error_file_path=error_file_path,
+                                             progress_callback=report_progress, **edit_options)
+    except pymysql.Error as e:
+        handle_database_error(e, f"batch editing `{target_table}`")
+        print("The uncommitted part of the batch was rolled back; earlier transactions stay committed.")
+        invalidate_cached_results(target_table)
+        return
+    invalidate_cached_results(target_table)
+
+    print(f"{edit_summary['rows_affected']} row(s) in `{target_table}` {'deleted' if edit_action == 'd' else 'updated'} "
+          f"in {edit_summary['transactions']} transaction(s), {edit_summary['elapsed_seconds']:.2f}s.")
+    if edit_summary['keys_failed']:
+        failed_detail = f"; details written to '{edit_summary['error_file']}'" if edit_summary['error_file'] else ""
+        print(f"{edit_summary['keys_failed']} key(s) were refused by the database and left unchanged{failed_detail}.")
+
+def is_data_returning_sql(sql_text):
+    return sql_text.strip().upper().startswith(("SELECT", "SHOW", "DESC", "EXPLAIN"))
+
+def may_write_summary_sources(sql_text):
+    # For statements whose target could not be parsed (multi-table UPDATE/DELETE, TRUNCATE,
+    # modifiers, INSERT without INTO ...): anything naming a summary source table, or a procedure
+    # call, may have changed one, so every installed summary is rebuilt.
+    return bool(re.match(r"\s*CALL\b", sql_text, re.IGNORECASE)) or any(
+        re.search(rf"\b{source_table}\b", sql_text, re.IGNORECASE) for source_table in summary_tables.SUMMARY_SOURCE_TABLES)
+
+def execute_custom_write(connection, custom_query, statement_profile=None):
+    # Runs a non-SELECT statement, keeps summaries in the same transaction and commits.
+    with connection.cursor() as cursor:
+        affected_rows = cursor.execute(custom_query)
+    if statement_profile is not None:
+        statement_profile.capture_server_metrics()
+    dml_target_table = get_dml_target_table(custom_query)
+    if dml_target_table:
+        summary_names = dependent_summaries(connection, dml_target_table)
+    else:
+        summary_names = installed_summaries(connection) if may_write_summary_sources(custom_query) else ()
+    if summary_names:
+        summary_tables.refresh_summaries_full(connection, summary_names)
+    notify_statement_write(connection, dml_target_table, custom_query, affected_rows)
+    connection.commit()
+    invalidate_cached_results(dml_target_table)
+    return affected_rows
+
+def fetch_result_set_profiled(connection, sql_query, statement_profile, max_rows=None):
+    with connection.cursor(STREAMING_CURSOR_CLASS) as cursor:
+        with statement_profile.phase('execute_ms'):
+            cursor.execute(sql_query)
+        with statement_profile.phase('fetch_ms'):
+            query_data = ResultSet.from_cursor(cursor, RESULT_FETCH_CHUNK_SIZE, max_rows=max_rows)
+    # Unbuffered: the server metrics query can only run once every row has been read.
+    if not is_local_connection(connection):
+        statement_profile.capture_server_metrics()
+    return query_data
+
+def report_governor_wait(governed_statement):
+    print(f"Waiting for a heavy-statement slot (estimated {governed_statement.estimated_rows:,.0f} rows examined; "
+          f"up to {QUERY_GOVERNOR.queue_timeout_seconds:.0f}s)...")
+
 def run_user_custom_sql(connection):
     print("\n--- Execute Custom SQL Query ---")
     print("Enter your SQL query below. For DML (INSERT, UPDATE, DELETE), changes will be committed.")
@@ -359,18 +869,29 @@ def run_user_custom_sql(connection):
         print("No query entered. Returning to menu.")
         return
 
-    is_data_returning_query = custom_query.strip().upper().startswith(("SELECT", "SHOW", "DESC", "EXPLAIN"))
+    is_data_returning_query = is_data_returning_sql(custom_query)
 
     try:
-        with connection.cursor() as cursor:
+        with QUERY_PROFILER.profile(connection, custom_query, label='custom SQL') as statement_profile:
             if is_data_returning_query:
-                cursor.execute(custom_query)
-                query_data = cursor.fetchall()
-                display_results_as_table(query_data)
+                with QUERY_GOVERNOR.govern(connection, custom_query, report_governor_wait) as governed_statement:
+                    query_data = fetch_result_set_profiled(connection, custom_query, statement_profile, governed_statement.max_rows)
+                statement_profile.rows = len(query_data)
+                with statement_profile.phase('render_ms'):
+                    display_results_as_table(query_data)
+                if query_data.truncated:
+                    QUERY_GOVERNOR.note_truncated(custom_query, len(query_data))
+                    print(f"Result cut at the governor's row cap of {len(query_data)} row(s); add a LIMIT or a tighter filter to see the rest.")
             else:
-                affected_rows = cursor.execute(custom_query)
-                connection.commit()
+                with statement_profile.phase('execute_ms'):
+                    with QUERY_GOVERNOR.govern(connection, custom_query, report_governor_wait):
+                        affected_rows = execute_custom_write(connection, custom_query, statement_profile)
+                statement_profile.rows = affected_rows
                 print(f"Query executed. {affected_rows if affected_rows is not None else 'Unknown'} row(s) affected. Commit successful.")
+        print(describe_statement_profile(statement_profile))
+    except GovernorError as e:
+        print(f"\nQUERY GOVERNOR {'stopped' if e.reason == 'timeout' else 'rejected'} the statement ({e.reason}): {e.args[1]}")
+        connection.rollback()
     except pymysql.Error as e:
         handle_database_error(e, f"executing custom query: {custom_query[:50]}...")
         if not is_data_returning_query:
@@ -381,10 +902,110 @@ def run_user_custom_sql(connection):
                 print(f"Error during rollback attempt: {rb_err}")
     except Exception as general_e:
         print(f"An unexpected error occurred: {general_e}")
+    finally:
+        if is_ddl_statement(custom_query):
+            SCHEMA_CATALOG.invalidate()
+            STATEMENT_CACHE.clear()
+            invalidate_cached_results()
+
+def bulk_import_from_file(connection):
+    target_table = get_table_choice(connection, "Enter table number/name to bulk import into")
+    if not target_table:
+        return
+
+    column_metadata, _ = get_table_metadata(connection, target_table)
+    if not column_metadata:
+        return
+
+    print(f"\n--- Bulk Import into `{target_table}` ---")
+    print("The first line of the file must list column names. Empty fields or 'NULL' load as SQL NULL.")
+    file_path = input("  Path to CSV/TSV file: ").strip()
+    if not file_path or not os.path.isfile(file_path):
+        print(f"File '{file_path}' was not found. Import aborted.")
+        return
+
+    default_delimiter = guess_delimiter(file_path)
+    delimiter_input = input(f"  Field delimiter (Enter for {'TAB' if default_delimiter == chr(9) else repr(default_delimiter)}, 'tab' for TAB): ")
+    if delimiter_input.strip().lower() == 'tab':
+        delimiter = '\t'
+    else:
+        delimiter = delimiter_input.strip() or default_delimiter
+
+    batch_size_input = input(f"  Rows per batch (Enter for {BULK_IMPORT_CONFIG['batch_size']}): ").strip()
+    commit_interval_input = input(f"  Rows per commit (Enter for {BULK_IMPORT_CONFIG['commit_interval']}): ").strip()
+    if (batch_size_input and not batch_size_input.isdigit()) or (commit_interval_input and not commit_interval_input.isdigit()):
+        print("Batch size and commit interval must be whole numbers. Import aborted.")
+        return
+    error_file_path = f"{os.path.splitext(file_path)[0]}.rejected.csv"
+
+    def report_progress(rows_loaded, rows_rejected, elapsed_seconds):
+        rate = rows_loaded / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        print(f"  ... {rows_loaded} row(s) committed, {rows_rejected} rejected ({rate:,.0f} rows/s)")
+
+    try:
+        load_summary = bulk_load_file(
+            connection, target_table, file_path, column_metadata, delimiter=delimiter,
+            batch_size=int(batch_size_input or BULK_IMPORT_CONFIG['batch_size']),
+            commit_interval=int(commit_interval_input or BULK_IMPORT_CONFIG['commit_interval']),
+            error_file_path=error_file_path, use_load_data=BULK_IMPORT_CONFIG['use_load_data'],
+            progress_callback=report_progress
+        )
+    except BulkLoadError as e:
+        print(f"Import aborted: {e}")
+        return
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Import aborted: could not read '{file_path}': {e}")
+        return
+    except pymysql.Error as e:
+        handle_database_error(e, f"bulk importing into `{target_table}`")
+        print("The uncommitted part of the import was rolled back.")
+        invalidate_cached_results(target_table)
+        return
+
+    try:
+        notify_bulk_table_write(connection, target_table, load_summary['rows_loaded'])
+        connection.commit()
+    except pymysql.Error as e:
+        connection.rollback()
+        handle_database_error(e, f"refreshing summary tables after importing into `{target_table}`")
+    invalidate_cached_results(target_table)
+
+    method_label = "LOAD DATA LOCAL INFILE" if load_summary['method'] == 'load_data' else "batched INSERT"
+    print(f"Imported {load_summary['rows_loaded']} row(s) into `{target_table}` via {method_label} "
+          f"in {load_summary['elapsed_seconds']:.2f}s ({load_summary['rows_per_second']:,.0f} rows/s).")
+    if load_summary['rows_rejected']:
+        print(f"{load_summary['rows_rejected']} row(s) rejected; details written to '{load_summary['error_file']}'.")
+
+# Q6 and Q11 are relational divisions, answered in one grouped pass instead of nested NOT EXISTS
+# or a correlated COUNT per employee. The original SQL is kept as "original_sql" for comparison.
+SALESMEN_ALL_PREMIUM_TYPES_DIVISION = {
+    "select": "e.employee_id, p.name AS salesman_name",
+    "from": """Employee e
+            JOIN Person p ON e.person_id = p.person_id
+            JOIN Sales_History sh ON sh.employee_id = e.employee_id
+            LEFT JOIN Sale_Product sp ON sp.sale_id = sh.sale_id
+            LEFT JOIN Product p_sold ON p_sold.product_id = sp.product_id AND p_sold.listPrice > 200""",
+    "group_by": ["e.employee_id", "p.name"],
+    "group_key": "e.employee_id",
+    "member": "p_sold.productType",
+    "divisor": "SELECT DISTINCT productType FROM Product WHERE listPrice > 200"
+}
+
+EMPLOYEES_ALL_DEPARTMENTS_DIVISION = {
+    "select": "e.employee_id, p.name AS employee_name",
+    "from": """Employee e
+            JOIN Person p ON e.person_id = p.person_id
+            LEFT JOIN Employee_Department ed ON ed.employee_id = e.employee_id""",
+    "group_by": ["e.employee_id", "p.name"],
+    "group_key": "e.employee_id",
+    "member": "ed.departmentID",
+    "divisor": "SELECT departmentID FROM Department"
+}
 
 YOUR_PROJECT_QUERIES = {
     "1": {
         "description": "Q1: Interviewers for 'Hellen Cole' and job '11111'.",
+        "tables": ["Interview", "Job_Application", "Person", "Job_Position", "Interview_Interviewer", "Interviewer", "Employee"],
         "sql": """
             SELECT e.employee_id, interviewer_person.name AS interviewer_name
             FROM Interview i
@@ -400,17 +1021,19 @@ YOUR_PROJECT_QUERIES = {
     },
     "2": {
         "description": "Q2: Jobs posted by 'Marketing' in Jan 2011.",
+        "tables": ["Job_Position", "Department"],
         "sql": """
             SELECT jp.jobID, jp.description
             FROM Job_Position jp
             JOIN Department d ON jp.departmentID = d.departmentID 
             WHERE d.name = 'Marketing'
-              AND MONTH(jp.postedDate) = 1
-              AND YEAR(jp.postedDate) = 2011;
+              AND jp.postedDate >= '2011-01-01'
+              AND jp.postedDate < '2011-02-01';
         """
     },
     "3": {
         "description": "Q3: Employees with no supervisees.",
+        "tables": ["Employee", "Person"],
         "sql": """
             SELECT e1.employee_id, p.name AS employee_name
             FROM Employee e1
@@ -424,19 +1047,34 @@ YOUR_PROJECT_QUERIES = {
     },
     "4": {
         "description": "Q4: Marketing sites with no sales in March 2011.",
+        "tables": ["Marketing_Site", "Sales_History"],
         "sql": """
             SELECT ms.siteID, ms.name AS site_name, ms.location
             FROM Marketing_Site ms
             WHERE ms.siteID NOT IN (
                 SELECT DISTINCT sh.siteID 
                 FROM Sales_History sh
-                WHERE MONTH(sh.sale_date) = 3 AND YEAR(sh.sale_date) = 2011 AND sh.siteID IS NOT NULL
+                WHERE sh.sale_date >= '2011-03-01' AND sh.sale_date < '2011-04-01' AND sh.siteID IS NOT NULL
             );
         """
     },
     "5": {
         "description": "Q5: Jobs with no suitable hires one month after posting. (Handles text grades)",
+        "tables": ["Job_Position", "Job_Application", "Interview", "summary_application_score"],
         "sql": """
+            SELECT jp.jobID, jp.description
+            FROM Job_Position jp
+            WHERE jp.jobID NOT IN (
+                SELECT ja.jobID
+                FROM Job_Application ja
+                JOIN summary_application_score s ON s.applicationID = ja.applicationID
+                GROUP BY ja.jobID
+                HAVING SUM(s.score_sum) / NULLIF(SUM(s.scored_count), 0) > 70 AND SUM(s.round_count) >= 5
+            )
+            AND jp.postedDate < DATE_SUB(CURDATE(), INTERVAL 1 MONTH);
+        """,
+        "requires_tables": ["summary_application_score"],
+        "fallback_sql": """
             SELECT jp.jobID, jp.description
             FROM Job_Position jp
             WHERE jp.jobID NOT IN (
@@ -458,7 +1096,10 @@ YOUR_PROJECT_QUERIES = {
     },
     "6": {
         "description": "Q6: Salesmen who sold all product types priced > $200.",
-        "sql": """
+        "tables": ["Employee", "Person", "Sales_History", "Product", "Sale_Product"],
+        "sql": relational_division.division_sql(SALESMEN_ALL_PREMIUM_TYPES_DIVISION),
+        "division": SALESMEN_ALL_PREMIUM_TYPES_DIVISION,
+        "original_sql": """
             SELECT DISTINCT e.employee_id, p.name AS salesman_name
             FROM Employee e
             JOIN Person p ON e.person_id = p.person_id
@@ -479,6 +1120,7 @@ YOUR_PROJECT_QUERIES = {
     },
     "7": {
         "description": "Q7: Departments with no job posts in Jan-Feb 2011.",
+        "tables": ["Department", "Job_Position"],
         "sql": """
             SELECT d.departmentID, d.name AS department_name
             FROM Department d
@@ -492,6 +1134,7 @@ YOUR_PROJECT_QUERIES = {
     },
     "8": {
         "description": "Q8: Existing employees who applied for job '12345'.",
+        "tables": ["Employee", "Person", "Job_Application", "Employee_Department"],
         "sql": """
             SELECT DISTINCT p.name AS applicant_name, e.employee_id, ed.departmentID AS current_department_id
             FROM Employee e
@@ -502,12 +1145,18 @@ YOUR_PROJECT_QUERIES = {
         """
     },
     "9": {
-        "description": "Q9: Best selling product type (most items sold - uses View3).",
-        "sql": "SELECT productType FROM View3 ORDER BY total_items_sold DESC LIMIT 1;"
+        "description": "Q9: Best selling product type (most items sold - summary of View3).",
+        "tables": ["summary_product_type_sales", "Sale_Product", "Product", "Product_Part", "Part"],
+        "sql": "SELECT productType FROM summary_product_type_sales ORDER BY total_items_sold DESC LIMIT 1;",
+        "requires_tables": ["summary_product_type_sales"],
+        "fallback_sql": "SELECT productType FROM View3 ORDER BY total_items_sold DESC LIMIT 1;"
     },
     "10": {
-        "description": "Q10: Product type with highest net profit (uses View4).",
-        "sql": """
+        "description": "Q10: Product type with highest net profit (summary of View4).",
+        "tables": ["summary_product_type_sales", "Sale_Product", "Product", "Product_Part", "Part"],
+        "sql": "SELECT productType, profit FROM summary_product_type_sales ORDER BY profit DESC LIMIT 1;",
+        "requires_tables": ["summary_product_type_sales"],
+        "fallback_sql": """
             SELECT 
                 p.productType,
                 (SUM(sp.quantity * sp.unitPrice) - IFNULL(SUM(sp.quantity * v.total_part_cost), 0)) AS profit
@@ -521,7 +1170,10 @@ YOUR_PROJECT_QUERIES = {
     },
     "11": {
         "description": "Q11: Employees who worked in all departments.",
-        "sql": """
+        "tables": ["Employee", "Person", "Employee_Department", "Department"],
+        "sql": relational_division.division_sql(EMPLOYEES_ALL_DEPARTMENTS_DIVISION),
+        "division": EMPLOYEES_ALL_DEPARTMENTS_DIVISION,
+        "original_sql": """
             SELECT e.employee_id, p.name AS employee_name
             FROM Employee e
             JOIN Person p ON e.person_id = p.person_id
@@ -536,7 +1188,17 @@ YOUR_PROJECT_QUERIES = {
     },
     "12": {
         "description": "Q12: Name and email of selected interviewees (avg grade > 70, >= 5 rounds).",
+        "tables": ["Interview", "Job_Application", "Person", "summary_application_score"],
         "sql": """
+            SELECT p.name AS interviewee_name, p.email AS interviewee_email, p.person_id
+            FROM summary_application_score s
+            JOIN Job_Application ja ON s.applicationID = ja.applicationID
+            JOIN Person p ON ja.person_id = p.person_id
+            GROUP BY p.person_id, p.name, p.email
+            HAVING SUM(s.score_sum) / NULLIF(SUM(s.scored_count), 0) > 70 AND SUM(s.round_count) >= 5;
+        """,
+        "requires_tables": ["summary_application_score"],
+        "fallback_sql": """
             SELECT p.name AS interviewee_name, p.email AS interviewee_email, p.person_id
             FROM Interview i
             JOIN Job_Application ja ON i.applicationID = ja.applicationID
@@ -554,7 +1216,22 @@ YOUR_PROJECT_QUERIES = {
     },
     "13": {
         "description": "Q13: Name, phone, email of interviewees selected for ALL jobs they applied for.",
+        "tables": ["Person", "Job_Application", "Phone", "Interview", "summary_application_score"],
         "sql": """
+            SELECT p.name, p.email, GROUP_CONCAT(DISTINCT ph.phone_number) AS phone_numbers
+            FROM (
+                SELECT ja.person_id
+                FROM Job_Application ja
+                LEFT JOIN summary_application_score s ON s.applicationID = ja.applicationID
+                GROUP BY ja.person_id
+                HAVING MIN(IFNULL(s.is_selected, 0)) = 1 AND COUNT(ja.jobID) > 0
+            ) selected_applicant
+            JOIN Person p ON p.person_id = selected_applicant.person_id
+            LEFT JOIN Phone ph ON p.person_id = ph.person_id
+            GROUP BY p.person_id, p.name, p.email;
+        """,
+        "requires_tables": ["summary_application_score"],
+        "fallback_sql": """
             SELECT p.name, p.email, GROUP_CONCAT(DISTINCT ph.phone_number) AS phone_numbers
             FROM Person p
             JOIN Job_Application ja ON p.person_id = ja.person_id
@@ -583,11 +1260,15 @@ YOUR_PROJECT_QUERIES = {
         """
     },
     "14": {
-        "description": "Q14: Employee with highest average monthly salary (uses View1).",
-        "sql": "SELECT e.employee_id, p.name AS employee_name, v1.avg_monthly_salary FROM View1 v1 JOIN Employee e ON v1.employee_id = e.employee_id JOIN Person p ON e.person_id = p.person_id ORDER BY v1.avg_monthly_salary DESC LIMIT 1;"
+        "description": "Q14: Employee with highest average monthly salary (summary of View1).",
+        "tables": ["summary_employee_salary", "Employee_Salary", "Employee", "Person"],
+        "sql": "SELECT e.employee_id, p.name AS employee_name, s.avg_monthly_salary FROM summary_employee_salary s JOIN Employee e ON s.employee_id = e.employee_id JOIN Person p ON e.person_id = p.person_id ORDER BY s.avg_monthly_salary DESC LIMIT 1;",
+        "requires_tables": ["summary_employee_salary"],
+        "fallback_sql": "SELECT e.employee_id, p.name AS employee_name, v1.avg_monthly_salary FROM View1 v1 JOIN Employee e ON v1.employee_id = e.employee_id JOIN Person p ON e.person_id = p.person_id ORDER BY v1.avg_monthly_salary DESC LIMIT 1;"
     },
     "15": {
         "description": "Q15: Vendor for 'Cup' < 4 lbs (part type) at lowest price.",
+        "tables": ["Vendor", "Vendor_Part", "Part"],
         "sql": """
             SELECT v.vendorID, v.name AS vendor_name, p.price
             FROM Vendor v
@@ -605,7 +1286,63 @@ YOUR_PROJECT_QUERIES = {
     }
 }
 
+def is_local_connection(connection):
+    # Same test as local_backend.is_local_connection, without importing it (and sqlite3) for MySQL runs.
+    return getattr(connection, 'backend_name', None) == 'sqlite'
+
+def connection_table_names(connection):
+    if is_local_connection(connection):
+        return connection.table_names()
+    return SCHEMA_CATALOG.table_names(connection)
+
+def report_connection(connection):
+    # The connection predefined reports read from: the local snapshot when enabled, else MySQL.
+    if not LOCAL_BACKEND_CONFIG['reports_on_snapshot']:
+        return connection
+    if LOCAL_BACKEND_SESSION['connection'] is None:
+        import local_backend
+        LOCAL_BACKEND_SESSION['connection'] = local_backend.LocalConnection(LOCAL_BACKEND_CONFIG['snapshot_path'])
+    return LOCAL_BACKEND_SESSION['connection']
+
+def resolve_project_query_sql(connection, query_info):
+    required_tables = query_info.get('requires_tables')
+    if required_tables and not set(required_tables).issubset(connection_table_names(connection)):
+        return query_info['fallback_sql']
+    return query_info['sql']
+
+def fetch_project_query_rows(connection, query_key, statement_profile):
+    query_info = YOUR_PROJECT_QUERIES[query_key]
+    resolved_sql = resolve_project_query_sql(connection, query_info)
+    statement_profile.statement = resolved_sql
+    # Snapshot reads are already in-process, and console writes never reach the snapshot, so
+    # the result cache (invalidated by those writes) only serves MySQL reads.
+    use_cache = not is_local_connection(connection)
+    if use_cache:
+        follow_change_log(connection)
+    cache_key = (query_key, resolved_sql)
+    cached_rows = QUERY_CACHE.get(cache_key) if use_cache else None
+    if cached_rows is not None:
+        statement_profile.cache_hit = True
+        return cached_rows, True
+    cache_generation = QUERY_CACHE.generation(query_info['tables'])
+    query_data = fetch_result_set_profiled(connection, resolved_sql, statement_profile)
+    if use_cache:
+        QUERY_CACHE.put(cache_key, query_data, query_info['tables'], cache_generation)
+    return query_data, False
+
+def describe_statement_profile(statement_profile):
+    timing_parts = [f"{phase_name[:-3]} {phase_ms:.3f} ms" for phase_name, phase_ms in statement_profile.timings.items()]
+    server_metrics = statement_profile.server or {}
+    if server_metrics.get('server_ms') is not None:
+        timing_parts.append(f"server {server_metrics['server_ms']:.3f} ms")
+    if server_metrics.get('rows_examined') is not None and server_metrics.get('rows_sent') is not None:
+        timing_parts.append(f"rows examined/sent {server_metrics['rows_examined']:.0f}/{server_metrics['rows_sent']:.0f}")
+    source_label = 'served from result cache' if statement_profile.cache_hit else 'executed'
+    return f"({source_label} in {statement_profile.wall_ms or 0.0:.3f} ms{': ' + ', '.join(timing_parts) if timing_parts else ''})"
+
 def execute_defined_project_queries(connection):
+    import local_backend
+
     print("\n--- Predefined Project SQL Queries ---")
     query_keys = list(YOUR_PROJECT_QUERIES.keys())
     for key_num_str in query_keys:
@@ -619,19 +1356,786 @@ def execute_defined_project_queries(connection):
         selected_query_info = YOUR_PROJECT_QUERIES[user_choice]
         print(f"\nExecuting: {selected_query_info['description']}")
         try:
-            with connection.cursor() as cursor:
-                cursor.execute(selected_query_info['sql'])
-                query_data = cursor.fetchall()
-                display_results_as_table(query_data)
+            query_connection = report_connection(connection)
+            if query_connection is not connection:
+                print(f"(reading the local snapshot '{LOCAL_BACKEND_CONFIG['snapshot_path']}')")
+            with QUERY_PROFILER.profile(query_connection, label=f"Q{user_choice}") as statement_profile:
+                query_data, _ = fetch_project_query_rows(query_connection, user_choice, statement_profile)
+                statement_profile.rows = len(query_data)
+                with statement_profile.phase('render_ms'):
+                    display_results_as_table(query_data)
+            print(describe_statement_profile(statement_profile))
         except pymysql.Error as e:
             handle_database_error(e, f"executing project query Q{user_choice}")
+        except local_backend.LocalBackendError as e:
+            print(f"Error: {e}")
         except Exception as general_e:
             print(f"An unexpected error occurred: {general_e}")
     else:
         print("Invalid query number selected.")
 
-def display_main_console_menu(connection):
+def export_data_to_file(connection):
+    from bulk_export import EXPORT_FILE_EXTENSIONS, EXPORT_WRITERS, export_query
+
+    print("\n--- Export Table or Project Query Results ---")
+    source_choice = input("Export a (t)able or a predefined query number (1-15)? ").strip()
+    if source_choice.lower() == 't':
+        target_table = get_table_choice(connection, "Enter table number/name to export")
+        if not target_table:
+            return
+        export_sql = f"SELECT * FROM `{target_table}`;"
+        default_file_stem = target_table
+    elif source_choice in YOUR_PROJECT_QUERIES:
+        export_sql = resolve_project_query_sql(connection, YOUR_PROJECT_QUERIES[source_choice])
+        default_file_stem = f"Q{source_choice}"
+    else:
+        print("Invalid choice. Export cancelled.")
+        return
+
+    file_format = input(f"  Format ({'/'.join(EXPORT_WRITERS)}, Enter for {EXPORT_CONFIG['default_format']}): ").strip().lower() or EXPORT_CONFIG['default_format']
+    if file_format not in EXPORT_WRITERS:
+        print(f"Unknown format '{file_format}'. Export cancelled.")
+        return
+    compress = input("  Compress with gzip? (y/N): ").strip().lower() == 'y'
+    default_path = default_file_stem + EXPORT_FILE_EXTENSIONS[file_format] + ('.gz' if compress else '')
+    output_path = input(f"  Output file (Enter for {default_path}): ").strip() or default_path
+
+    def report_progress(rows_exported, elapsed_seconds):
+        if rows_exported % (EXPORT_CONFIG['chunk_size'] * 20) == 0:
+            print(f"  ... {rows_exported} row(s) written ({rows_exported / elapsed_seconds:,.0f} rows/s)")
+
+    try:
+        export_summary = export_query(connection, export_sql, output_path, file_format=file_format,
+                                      chunk_size=EXPORT_CONFIG['chunk_size'], compress=compress,
+                                      progress_callback=report_progress)
+    except pymysql.Error as e:
+        handle_database_error(e, f"exporting to '{output_path}'")
+        return
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Export failed: {e}")
+        return
+
+    print(f"Exported {export_summary['rows']} row(s) to '{output_path}' in {export_summary['elapsed_seconds']:.2f}s "
+          f"({export_summary['rows_per_second']:,.0f} rows/s).")
+
+def print_plan_summaries(analysis, title):
+    print(f"\n--- {title} ---")
+    plan_rows = []
+    for query_key, plan_summary in analysis.items():
+        if 'error' in plan_summary:
+            plan_rows.append({'query': f"Q{query_key}", 'cost': 'ERROR', 'full_scans': plan_summary['error'][:60], 'filesort': '', 'temporary': ''})
+            continue
+        plan_rows.append({
+            'query': f"Q{query_key}",
+            'cost': plan_summary['query_cost'],
+            'full_scans': ", ".join(f"{scan['table']}({scan['rows']})" for scan in plan_summary['full_scans']) or '-',
+            'filesort': 'yes' if plan_summary['using_filesort'] else '',
+            'temporary': 'yes' if plan_summary['using_temporary'] else ''
+        })
+        if plan_summary.get('legacy_query_cost') is not None:
+            plan_rows[-1]['cost'] = f"{plan_summary['query_cost']} (was {plan_summary['legacy_query_cost']} before sargable rewrite)"
+    display_results_as_table(plan_rows)
+
+def run_index_advisor(connection):
+    print("\n--- Index Advisor ---")
+    print("Running EXPLAIN FORMAT=JSON on every predefined project query...")
+    resolved_queries = {query_key: {'sql': resolve_project_query_sql(connection, query_info)} for query_key, query_info in YOUR_PROJECT_QUERIES.items()}
+    before_analysis = index_advisor.analyze_queries(connection, resolved_queries)
+    print_plan_summaries(before_analysis, "Current plans")
+
+    try:
+        pending = migrations.pending_migrations(connection)
+        table_indexes = {}
+        for table_name in SCHEMA_CATALOG.table_names(connection):
+            table_entry = SCHEMA_CATALOG.get_table(connection, table_name)
+            if table_entry:
+                table_indexes[table_name] = table_entry['indexes']
+    except pymysql.Error as e:
+        handle_database_error(e, "checking existing indexes and migrations")
+        return
+
+    migration_path = None
+    if not pending:
+        missing = index_advisor.missing_recommendations(table_indexes)
+        if not missing:
+            print("All recommended indexes already exist. No migration needed.")
+        else:
+            migration_path = migrations.next_migration_path("project_query_indexes")
+            os.makedirs(os.path.dirname(migration_path), exist_ok=True)
+            with open(migration_path, 'w', encoding='utf-8') as migration_file:
+                migration_file.write(index_advisor.render_index_migration(missing, before_analysis))
+            print(f"Wrote migration with {len(missing)} index(es) from the curated recommendation list to '{migration_path}'.")
+            pending = migrations.pending_migrations(connection)
+
+    after_analysis = None
+    if pending:
+        print("Pending migrations:")
+        for version, name, _ in pending:
+            print(f"  V{version} {name}")
+        if input("Apply pending migrations now? (y/N): ").strip().lower() == 'y':
+            try:
+                migrations.apply_pending_migrations(
+                    connection, progress_callback=lambda version, name, count: print(f"  Applied V{version} {name} ({count} statement(s)).")
+                )
+            except pymysql.Error as e:
+                handle_database_error(e, "applying migrations")
+            finally:
+                SCHEMA_CATALOG.invalidate()
+                invalidate_cached_results()
+            resolved_queries = {query_key: {'sql': resolve_project_query_sql(connection, query_info)} for query_key, query_info in YOUR_PROJECT_QUERIES.items()}
+            after_analysis = index_advisor.analyze_queries(connection, resolved_queries)
+            print_plan_summaries(after_analysis, "Plans after migration")
+
+    advisor_report = index_advisor.build_report(before_analysis, after_analysis, migration_path or (pending[-1][2] if pending else None))
+    with open(INDEX_ADVISOR_REPORT_PATH, 'w', encoding='utf-8') as report_file:
+        json.dump(advisor_report, report_file, indent=2)
+    print(f"Before/after plan costs recorded in '{INDEX_ADVISOR_REPORT_PATH}'.")
+
+def refresh_summary_tables_menu(connection):
+    print("\n--- Refresh Summary Tables ---")
+    summary_names = installed_summaries(connection)
+    if not summary_names:
+        print("Summary tables are not installed. Apply migrations V002/V003 from the Index Advisor menu (11) first.")
+        return
+    print(f"Installed summaries: {', '.join(summary_names)}")
+    print("Console writes keep the summaries current. Use this after writes made outside the console.")
+    print("  d. Delta refresh (add rows inserted since the last refresh)")
+    print("  f. Full rebuild")
+    refresh_choice = input("Choose refresh type (d/f, Enter to cancel): ").strip().lower()
+    if refresh_choice not in ('d', 'f'):
+        print("Refresh cancelled.")
+        return
+    try:
+        refresh_report = summary_tables.refresh_all(connection, full=refresh_choice == 'f', summary_names=summary_names)
+    except pymysql.Error as e:
+        connection.rollback()
+        handle_database_error(e, "refreshing summary tables")
+        return
+    QUERY_CACHE.invalidate_tables(summary_tables.SUMMARY_TABLES.values())
+    for refreshed_name, refreshed_count in refresh_report.items():
+        print(f"  {refreshed_name}: {refreshed_count} {'row(s) rebuilt' if refresh_choice == 'f' else 'new source row(s) applied'}")
+    print("Summary tables refreshed.")
+
+def show_query_cache_stats():
+    print("\n--- Query Result Cache ---")
+    cache_stats = QUERY_CACHE.snapshot()
+    print(f"  Hits: {cache_stats['hits']}   Misses: {cache_stats['misses']}   Hit rate: {cache_stats['hit_rate']:.1%}")
+    print(f"  Entries: {cache_stats['entries']}/{QUERY_CACHE.max_entries}   "
+          f"Memory: {cache_stats['size_bytes'] / 1024:,.1f} KiB of {QUERY_CACHE.max_bytes / 1024:,.0f} KiB")
+    print(f"  Stores: {cache_stats['stores']}   Evictions: {cache_stats['evictions']}   "
+          f"Invalidated: {cache_stats['invalidations']}   Too large to cache: {cache_stats['oversized']}   "
+          f"Dropped (written during fetch): {cache_stats['stale']}")
+    show_statement_cache_stats()
+    if input("Clear the result cache now? (y/N): ").strip().lower() == 'y':
+        invalidate_cached_results()
+        print("Query result cache cleared.")
+
+def show_statement_cache_stats():
+    statement_stats = STATEMENT_CACHE.snapshot()
+    mode_label = "server-side PREPARE/EXECUTE" if statement_stats['server_prepare'] else "client-side parameters"
+    print(f"\n--- CRUD Statement Cache ({statement_stats['entries']}/{STATEMENT_CACHE.max_entries} statements, {mode_label}) ---")
+    print(f"  {'operation':<10} {'hits':>8} {'misses':>8} {'hit rate':>9} {'prepares':>9} {'avg exec ms':>12} {'saved ms':>10}")
+    for operation, stats in statement_stats['operations'].items():
+        print(f"  {operation:<10} {stats['hits']:>8} {stats['misses']:>8} {stats['hit_rate']:>9.1%} {stats['prepares']:>9} "
+              f"{stats['avg_execute_ms']:>12.3f} {stats['saved_ms']:>10.3f}")
+    print("  'saved ms' is the SQL-building time skipped on cache hits.")
+
+def project_query_job(query_key):
+    from async_engine import fetch_rows
+
+    def work(connection, job):
+        query_info = YOUR_PROJECT_QUERIES[query_key]
+        resolved_sql = resolve_project_query_sql(connection, query_info)
+        cache_key = (query_key, resolved_sql)
+        follow_change_log(connection)
+        cached_rows = QUERY_CACHE.get(cache_key)
+        if cached_rows is not None:
+            job.rows_fetched = len(cached_rows)
+            return cached_rows
+        cache_generation = QUERY_CACHE.generation(query_info['tables'])
+        query_data = fetch_rows(connection, job, resolved_sql, chunk_size=BACKGROUND_JOB_CONFIG['fetch_chunk_size'])
+        QUERY_CACHE.put(cache_key, query_data, query_info['tables'], cache_generation)
+        return query_data
+    return work
+
+def custom_sql_job(custom_query):
+    from async_engine import fetch_rows
+
+    def work(connection, job):
+        if is_data_returning_sql(custom_query):
+            with QUERY_GOVERNOR.govern(connection, custom_query) as governed_statement:
+                query_data = fetch_rows(connection, job, custom_query, chunk_size=BACKGROUND_JOB_CONFIG['fetch_chunk_size'],
+                                        max_rows=governed_statement.max_rows)
+            if query_data.truncated:
+                QUERY_GOVERNOR.note_truncated(custom_query, len(query_data))
+            return query_data
+        try:
+            with QUERY_GOVERNOR.govern(connection, custom_query):
+                affected_rows = execute_custom_write(connection, custom_query)
+        finally:
+            if is_ddl_statement(custom_query):
+                SCHEMA_CATALOG.invalidate()
+                invalidate_cached_results()
+        job.rows_fetched = affected_rows or 0
+        return [{'affected_rows': affected_rows}]
+    return work
+
+def print_finished_job_notices(job_engine):
+    for job in job_engine.drain_finished():
+        job_info = job.snapshot()
+        detail = job_info['error'] or f"{job_info['rows_fetched']} row(s)"
+        print(f"[Background job {job_info['job_id']} {job_info['state']}: {job_info['label']} - {detail} in {job_info['elapsed_seconds']:.2f}s]")
+
+def list_background_jobs(connection, job_engine):
+    job_rows = [job.snapshot() for job in job_engine.jobs()]
+    if not job_rows:
+        print("No background jobs.")
+        return
+    running_ids = [job_info['connection_id'] for job_info in job_rows if job_info['connection_id'] is not None]
+    server_states = {}
+    if running_ids:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT ID, STATE, TIME FROM information_schema.PROCESSLIST WHERE ID IN ({', '.join(['%s'] * len(running_ids))});",
+                tuple(running_ids)
+            )
+            server_states = {process_row['ID']: process_row for process_row in cursor.fetchall()}
+    display_results_as_table([{
+        'job': job_info['job_id'], 'label': job_info['label'][:40], 'state': job_info['state'],
+        'rows': job_info['rows_fetched'], 'elapsed_s': f"{job_info['elapsed_seconds']:.2f}",
+        'server_state': (server_states.get(job_info['connection_id']) or {}).get('STATE') or '',
+        'error': (job_info['error'] or '')[:50]
+    } for job_info in job_rows])
+
+def manage_background_jobs(connection, job_engine):
     while True:
+        print("\n--- Background Jobs ---")
+        try:
+            list_background_jobs(connection, job_engine)
+        except pymysql.Error as e:
+            handle_database_error(e, "reading background job progress")
+        print("  q. Start predefined queries (e.g. 6,13 runs both at once)")
+        print("  s. Start custom SQL")
+        print("  c. Cancel a job (KILL QUERY)")
+        print("  v. View and dismiss a finished job's results")
+        print("  Enter. Refresh / return to main menu")
+        job_choice = input("Choose an action: ").strip().lower()
+        if job_choice == 'q':
+            query_keys = [key.strip() for key in input("Query number(s), comma-separated: ").split(',') if key.strip()]
+            for query_key in query_keys:
+                if query_key not in YOUR_PROJECT_QUERIES:
+                    print(f"Skipping unknown query '{query_key}'.")
+                    continue
+                job = job_engine.submit(YOUR_PROJECT_QUERIES[query_key]['description'], project_query_job(query_key))
+                print(f"Started job {job.job_id}: Q{query_key}")
+        elif job_choice == 's':
+            custom_query = input("SQL> ").strip()
+            if custom_query:
+                job = job_engine.submit(custom_query[:60], custom_sql_job(custom_query))
+                print(f"Started job {job.job_id}.")
+        elif job_choice in ('c', 'v'):
+            job_id_input = input("Job number: ").strip()
+            if not job_id_input.isdigit():
+                print("Please enter a job number.")
+                continue
+            if job_choice == 'c':
+                try:
+                    cancelled = job_engine.cancel(int(job_id_input))
+                except pymysql.Error as e:
+                    handle_database_error(e, f"cancelling job {job_id_input}")
+                    continue
+                print(f"Cancellation requested for job {job_id_input}." if cancelled else "That job is not running.")
+            else:
+                job = job_engine.forget(int(job_id_input))
+                if job is None:
+                    print("That job does not exist or has not finished yet.")
+                elif job.state == 'done':
+                    print(f"\n--- Results of job {job.job_id}: {job.label} ---")
+                    display_results_as_table(job.result)
+                else:
+                    print(f"Job {job.job_id} {job.state}{': ' + str(job.error) if job.error else ''}")
+        else:
+            return
+
+def search_records(connection):
+    print("\n--- Search People / Sales ---")
+    entity_name = input("Search (p)eople or (s)ales? ").strip().lower()
+    entity_name = {'p': 'person', 's': 'sales'}.get(entity_name, entity_name)
+    entity = record_search.SEARCH_ENTITIES.get(entity_name)
+    if entity is None:
+        print("Invalid choice. Search cancelled.")
+        return
+
+    print("Leave a filter empty to skip it.")
+    filter_prompts = {
+        'name': "name starts with", 'email': "email starts with", 'city': "city equals",
+        'from': "sale date from (YYYY-MM-DD)", 'to': "sale date to, inclusive (YYYY-MM-DD)",
+        'employee': "salesman employee_id", 'customer': "customer_id"
+    }
+    raw_filters = {filter_name: input(f"  {filter_prompts[filter_name]}: ") for filter_name in entity['filters']}
+    sort_name = input(f"  Sort by ({'/'.join(entity['sorts'])}, Enter for {entity['default_sort']}): ").strip().lower() or None
+    descending = input("  Descending order? (y/N): ").strip().lower() == 'y'
+    try:
+        criteria = record_search.build_criteria(entity_name, raw_filters, sort_name, descending)
+    except record_search.SearchCriteriaError as e:
+        print(f"Search cancelled: {e}")
+        return
+
+    # Keyset pages cannot be walked backwards cheaply, so remember each page's starting cursor.
+    page_cursors = [None]
+    while True:
+        try:
+            search_result = record_search.search_page(connection, criteria, SEARCH_PAGE_SIZE, page_cursors[-1])
+        except pymysql.Error as e:
+            handle_database_error(e, f"searching `{entity['table']}`")
+            return
+        print(f"\n--- Page {len(page_cursors)} ---")
+        display_results_as_table(search_result['rows'])
+        navigation = "Enter for next page, " if search_result['has_more'] else ""
+        navigation += "'p' for previous page, " if len(page_cursors) > 1 else ""
+        page_choice = input(f"{navigation}'q' to stop: ").strip().lower()
+        if page_choice == 'p' and len(page_cursors) > 1:
+            page_cursors.pop()
+        elif page_choice == '' and search_result['has_more']:
+            page_cursors.append(search_result['next_cursor'])
+        elif page_choice == 'q' or not search_result['has_more']:
+            return
+
+def print_hierarchy_nodes(connection, hierarchy_name, tree_nodes, indent=True):
+    shown_nodes = tree_nodes[:HIERARCHY_DISPLAY_LIMIT]
+    node_names = hierarchy.fetch_node_names(connection, hierarchy_name, [node_id for node_id, _ in shown_nodes])
+    for node_id, depth in shown_nodes:
+        prefix = "  " * depth if indent else f"  [{depth}] "
+        print(f"  {prefix}{node_id} {node_names.get(node_id) or ''}")
+    if len(tree_nodes) > len(shown_nodes):
+        print(f"  ... {len(tree_nodes) - len(shown_nodes)} more not shown.")
+
+def explore_hierarchy(connection):
+    print("\n--- Reporting Chains / Referral Trees ---")
+    hierarchy_name = input("Hierarchy: (e)mployee supervision or (c)ustomer referrals? ").strip().lower()
+    hierarchy_name = {'e': 'employee', 'c': 'customer'}.get(hierarchy_name, hierarchy_name)
+    if hierarchy_name not in hierarchy.HIERARCHIES:
+        print("Invalid choice. Returning to menu.")
+        return
+    id_column = hierarchy.HIERARCHIES[hierarchy_name]['id_column']
+
+    while True:
+        try:
+            tree = HIERARCHY_CACHE.get(connection, hierarchy_name)
+        except pymysql.Error as e:
+            handle_database_error(e, f"loading the {hierarchy_name} hierarchy")
+            return
+        tree_summary = tree.summary()
+        print(f"\n{tree_summary['nodes']} {hierarchy_name}(s), {tree_summary['roots']} root(s), {tree_summary['parents']} with direct reports.")
+        print("  d. Everyone under a node (subtree)")
+        print("  a. Chain above a node (ancestors and depth)")
+        print("  s. Subtree totals (sales and sale count rolled up)")
+        print("  r. List root nodes")
+        print("  v. Verify a subtree against the server (recursive CTE, MySQL 8.0+)")
+        print("  0. Back to main menu")
+        action = input("Choose an action: ").strip().lower()
+        if action == '0' or not action:
+            return
+        if action == 'r':
+            print_hierarchy_nodes(connection, hierarchy_name, [(node_id, 0) for node_id in tree.roots()])
+            continue
+        if action not in ('d', 'a', 's', 'v'):
+            print("Invalid choice.")
+            continue
+
+        node_input = input(f"  {id_column}: ").strip()
+        if not node_input.lstrip('-').isdigit():
+            print(f"{id_column} must be a whole number.")
+            continue
+        node_id = int(node_input)
+        try:
+            if action == 'd':
+                depth_input = input("  Maximum depth (Enter for all levels): ").strip()
+                subtree_nodes = tree.descendants(node_id, max_depth=int(depth_input) if depth_input.isdigit() else None, include_root=True)
+                print(f"\n{len(subtree_nodes) - 1} node(s) under {node_id}:")
+                print_hierarchy_nodes(connection, hierarchy_name, subtree_nodes)
+            elif action == 'a':
+                chain = tree.ancestors(node_id)
+                print(f"\n{node_id} is at depth {len(chain)}" + (" (a root)." if not chain else "; chain to the root:"))
+                print_hierarchy_nodes(connection, hierarchy_name, chain, indent=False)
+            elif action == 'v':
+                verify_hierarchy_subtree(connection, hierarchy_name, tree, node_id)
+            else:
+                for aggregate_name in hierarchy.HIERARCHIES[hierarchy_name]['aggregates']:
+                    rollup = hierarchy.subtree_aggregate(connection, tree, hierarchy_name, aggregate_name, node_id)
+                    print(f"\n{aggregate_name}: {rollup['total']} over {rollup['nodes']} node(s) ({rollup['own']} directly by {node_id})")
+                    child_names = hierarchy.fetch_node_names(connection, hierarchy_name, rollup['by_child'])
+                    for child_id, child_total in sorted(rollup['by_child'].items(), key=lambda item: item[1], reverse=True)[:HIERARCHY_DISPLAY_LIMIT]:
+                        print(f"    under {child_id} {child_names.get(child_id) or ''}: {child_total}")
+        except hierarchy.HierarchyError as e:
+            print(e)
+        except pymysql.Error as e:
+            handle_database_error(e, f"querying the {hierarchy_name} hierarchy")
+
+def verify_hierarchy_subtree(connection, hierarchy_name, tree, node_id):
+    # Cross-checks the cached adjacency tree against a server-side walk of the live table, e.g.
+    # after writes by other clients that the cache has not seen yet.
+    started_at = time.perf_counter()
+    server_nodes = dict(hierarchy.fetch_descendants_recursive(connection, hierarchy_name, node_id, HIERARCHY_VERIFY_MAX_DEPTH))
+    server_ms = (time.perf_counter() - started_at) * 1000
+    started_at = time.perf_counter()
+    cached_nodes = dict(tree.descendants(node_id, max_depth=HIERARCHY_VERIFY_MAX_DEPTH)) if node_id in tree else {}
+    cache_ms = (time.perf_counter() - started_at) * 1000
+    print(f"\nRecursive CTE: {len(server_nodes)} node(s) under {node_id} in {server_ms:.1f} ms; "
+          f"cached tree: {len(cached_nodes)} in {cache_ms:.1f} ms.")
+    differing_ids = sorted(set(server_nodes) ^ set(cached_nodes) |
+                           {other_id for other_id in set(server_nodes) & set(cached_nodes) if server_nodes[other_id] != cached_nodes[other_id]})
+    if not differing_ids:
+        print("The cached tree matches the server.")
+        return
+    print(f"{len(differing_ids)} node(s) differ (depth on the server / in the cache, '-' when absent):")
+    for other_id in differing_ids[:HIERARCHY_DISPLAY_LIMIT]:
+        print(f"    {other_id}: {server_nodes.get(other_id, '-')} / {cached_nodes.get(other_id, '-')}")
+    HIERARCHY_CACHE.invalidate_tables([hierarchy.HIERARCHIES[hierarchy_name]['table']])
+    print("The cached tree is out of date and will be reloaded.")
+
+def run_relational_division(connection):
+    print("\n--- Relational Division ('related to all of' queries) ---")
+    division_queries = {query_key: query_info for query_key, query_info in YOUR_PROJECT_QUERIES.items() if query_info.get('division')}
+    for query_key, query_info in division_queries.items():
+        print(f"  {query_key}. {query_info['description']}")
+    print("  c. Custom: a (group, member) SELECT divided by a member SELECT")
+    division_choice = input("Choose a query: ").strip().lower()
+
+    if division_choice == 'c':
+        print("The dividend SELECT returns two columns: the group id, then the member.")
+        dividend_sql = input("  Dividend SQL> ").strip().rstrip(';')
+        divisor_sql = input("  Divisor SQL (one member column)> ").strip().rstrip(';')
+        if not is_data_returning_sql(dividend_sql) or not is_data_returning_sql(divisor_sql):
+            print("Both queries must be SELECT statements. Returning to menu.")
+            return
+        try:
+            started_at = time.perf_counter()
+            group_ids = relational_division.divide_by_bitset(
+                connection, dividend_sql, divisor_sql,
+                govern=lambda sql_text: QUERY_GOVERNOR.govern(connection, sql_text, report_governor_wait)
+            )
+            elapsed_seconds = time.perf_counter() - started_at
+        except GovernorError as e:
+            print(f"\nQUERY GOVERNOR {'stopped' if e.reason == 'timeout' else 'rejected'} the statement ({e.reason}): {e.args[1]}")
+            connection.rollback()
+            return
+        except relational_division.DivisionError as e:
+            print(e)
+            return
+        except pymysql.Error as e:
+            handle_database_error(e, "running the relational division")
+            return
+        display_results_as_table([{'group_id': group_id} for group_id in group_ids])
+        print(f"(bitset division: {len(group_ids)} group(s) related to every member, {elapsed_seconds * 1000:.1f} ms)")
+        return
+
+    query_info = division_queries.get(division_choice)
+    if query_info is None:
+        print("Invalid choice. Returning to menu.")
+        return
+    strategy_choice = input("Strategy: (s)QL GROUP BY/HAVING, (b)itset over streamed rows, or (c)ompare both? ").strip().lower()
+    strategies = {'s': ['sql'], 'b': ['bitset'], 'c': ['sql', 'bitset']}.get(strategy_choice)
+    if strategies is None:
+        print("Invalid choice. Returning to menu.")
+        return
+    group_sets = {}
+    for strategy in strategies:
+        try:
+            division_rows, elapsed_seconds = relational_division.run_division(connection, query_info['division'], strategy)
+        except pymysql.Error as e:
+            handle_database_error(e, f"running {query_info['description'][:3]} as a {strategy} division")
+            return
+        if len(strategies) == 1:
+            display_results_as_table(division_rows)
+        group_key = 'group_id' if strategy == 'bitset' else query_info['division']['group_key'].split('.')[-1]
+        group_sets[strategy] = {division_row[group_key] for division_row in division_rows}
+        print(f"({strategy} division: {len(division_rows)} row(s) in {elapsed_seconds * 1000:.1f} ms)")
+    if len(group_sets) == 2:
+        print("Both strategies agree." if group_sets['sql'] == group_sets['bitset'] else "The strategies returned different groups!")
+
+def load_analytics_dataset(connection):
+    import sales_analytics
+
+    sales_columns, _ = SCHEMA_CATALOG.get_columns(connection, 'Sales_History')
+    include_site = any(col_meta['name'] == 'siteID' for col_meta in sales_columns)
+
+    def report_progress(lines_loaded, bytes_used, elapsed_seconds):
+        print(f"  ... {lines_loaded:,} sale line(s), {bytes_used / (1024 * 1024):,.1f} MiB ({elapsed_seconds:.1f}s)")
+
+    ANALYTICS_SESSION['dataset'] = None
+    try:
+        dataset = sales_analytics.load_sales_dataset(
+            connection, memory_budget_bytes=ANALYTICS_CONFIG['memory_budget_mb'] * 1024 * 1024, include_site=include_site,
+            chunk_size=ANALYTICS_CONFIG['chunk_size'], progress_callback=report_progress
+        )
+    except sales_analytics.AnalyticsMemoryError as e:
+        print(f"Load aborted: {e} Raise ANALYTICS_CONFIG['memory_budget_mb'] or use the SQL reports.")
+        return None
+    except pymysql.Error as e:
+        handle_database_error(e, "loading sales data for analytics")
+        return None
+    ANALYTICS_SESSION['dataset'] = dataset
+    dataset_summary = dataset.summary()
+    print(f"Loaded {dataset_summary['lines']:,} sale line(s) into {dataset_summary['bytes'] / (1024 * 1024):,.1f} MiB "
+          f"in {dataset_summary['load_seconds']:.2f}s ({dataset_summary['backend']} backend).")
+    return dataset
+
+def run_sales_analytics(connection):
+    import sales_analytics
+
+    print("\n--- In-Memory Sales Analytics (revenue, part cost, profit, volume) ---")
+    dataset = ANALYTICS_SESSION['dataset'] or load_analytics_dataset(connection)
+    while dataset is not None:
+        stale_note = " - STALE: source tables changed since loading" if dataset.stale else ""
+        print(f"\n{len(dataset):,} sale line(s) loaded {time.strftime('%H:%M:%S', time.localtime(dataset.loaded_at))}{stale_note}")
+        print(f"Slice by: {', '.join(dataset.dimensions())}")
+        dimension = input("Dimension (or 'l' to reload, Enter to return): ").strip().lower()
+        if not dimension:
+            return
+        if dimension == 'l':
+            dataset = load_analytics_dataset(connection)
+            continue
+        order_by = input(f"  Order by ({'/'.join(sales_analytics.ANALYTICS_MEASURES)}, Enter for profit): ").strip().lower() or 'profit'
+        ascending = input("  Lowest first? (y/N): ").strip().lower() == 'y'
+        filter_text = input("  Filter, e.g. month=2011-03 (Enter for none): ").strip()
+        filters = {}
+        if filter_text:
+            filter_name, _, filter_value = filter_text.partition('=')
+            filter_name, filter_value = filter_name.strip().lower(), filter_value.strip()
+            # Month labels are text; every other dimension is keyed by its integer id.
+            filters[filter_name] = int(filter_value) if filter_value.lstrip('-').isdigit() and filter_name != 'month' else filter_value
+        try:
+            started_at = time.perf_counter()
+            result_rows = dataset.aggregate(dimension, order_by=order_by, descending=not ascending,
+                                            top_n=ANALYTICS_CONFIG['top_n'], filters=filters)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+        except sales_analytics.AnalyticsError as e:
+            print(e)
+            continue
+        display_results_as_table(result_rows)
+        print(f"(top {ANALYTICS_CONFIG['top_n']} by {order_by}, computed in memory in {elapsed_ms:.1f} ms)")
+
+def manage_local_snapshot(connection):
+    import local_backend
+
+    while True:
+        print("\n--- Local Snapshot (SQLite) ---")
+        try:
+            status = local_backend.snapshot_status(LOCAL_BACKEND_CONFIG['snapshot_path'])
+        except local_backend.LocalBackendError as e:
+            status = None
+            print(f"Error: {e}")
+        if status is None:
+            print(f"No snapshot at '{LOCAL_BACKEND_CONFIG['snapshot_path']}' yet.")
+        else:
+            print(f"'{status['path']}': {status['tables']} table(s), {status['synced_rows']:,} synced row(s), "
+                  f"{status['size_bytes'] / (1024 * 1024):,.1f} MiB, last synced {status['last_synced_at'] or 'never'}")
+        print(f"Predefined reports read: {'the snapshot' if LOCAL_BACKEND_CONFIG['reports_on_snapshot'] else 'MySQL'}")
+        print("  i. Incremental sync (re-copy changed key ranges only)")
+        print("  f. Full sync (re-copy every table)")
+        print("  r. Toggle running predefined reports on the snapshot")
+        print("  Enter. Return to main menu")
+        snapshot_choice = input("Choose an action: ").strip().lower()
+        if snapshot_choice in ('i', 'f'):
+            print("Syncing from MySQL...")
+            try:
+                sync_report = local_backend.sync_snapshot(
+                    connection, LOCAL_BACKEND_CONFIG['snapshot_path'], SCHEMA_CATALOG.load(connection),
+                    full=snapshot_choice == 'f', bucket_size=LOCAL_BACKEND_CONFIG['bucket_size']
+                )
+            except pymysql.Error as e:
+                handle_database_error(e, "syncing the local snapshot")
+                continue
+            display_results_as_table([
+                {'table': table_name, 'mode': table_report['mode'], 'changed_buckets': table_report['buckets_changed'],
+                 'rows_copied': table_report['rows_copied'], 'seconds': f"{table_report['seconds']:.2f}"}
+                for table_name, table_report in sync_report.items() if table_report['mode'] != 'unchanged'
+            ])
+            print(f"{sum(table_report['mode'] == 'unchanged' for table_report in sync_report.values())} table(s) unchanged.")
+        elif snapshot_choice == 'r':
+            LOCAL_BACKEND_CONFIG['reports_on_snapshot'] = not LOCAL_BACKEND_CONFIG['reports_on_snapshot']
+            if not LOCAL_BACKEND_CONFIG['reports_on_snapshot'] and LOCAL_BACKEND_SESSION['connection'] is not None:
+                LOCAL_BACKEND_SESSION['connection'].close()
+                LOCAL_BACKEND_SESSION['connection'] = None
+        elif not snapshot_choice:
+            return
+        else:
+            print("Invalid choice.")
+
+def show_change_feed(connection):
+    if not change_capture.is_installed(SCHEMA_CATALOG.table_names(connection)):
+        print("The change log is not installed; apply the change log migration (python migrations.py) first.")
+        return
+    while True:
+        print("\n--- Change Feed ---")
+        try:
+            print(f"Last change id: {change_capture.latest_change_id(connection)}; "
+                  f"capture {'on' if CHANGE_CAPTURE_CONFIG['enabled'] else 'off'} for console writes.")
+            consumer_rows = change_capture.consumer_status(connection)
+            connection.commit()
+        except pymysql.Error as e:
+            handle_database_error(e, "reading the change log")
+            return
+        if consumer_rows:
+            display_results_as_table(consumer_rows)
+        else:
+            print("No consumers have saved a checkpoint yet.")
+        print("  r. Show recent changes")
+        print("  p. Purge changes every consumer has read")
+        print("  c. Toggle capturing console writes")
+        print("  Enter. Return to main menu")
+        feed_choice = input("Choose an action: ").strip().lower()
+        try:
+            if feed_choice == 'r':
+                table_filter = input("  Table name (Enter for all): ").strip()
+                changes = change_capture.recent_changes(connection, 20, [table_filter] if table_filter else None)
+                connection.commit()
+                display_results_as_table([
+                    {'change_id': change['change_id'], 'changed_at': change['changed_at'], 'table': change['table_name'],
+                     'operation': change['operation'], 'key': json.dumps(change['primary_key']) if change['primary_key'] else '',
+                     'statement': (change['statement_text'] or '')[:60]}
+                    for change in changes
+                ])
+            elif feed_choice == 'p':
+                keep_days_input = input("  Keep changes newer than how many days (Enter for 7)? ").strip()
+                if keep_days_input and not keep_days_input.isdigit():
+                    print("Days must be a whole number.")
+                    continue
+                print(f"Purged {change_capture.purge_consumed(connection, int(keep_days_input or 7))} change(s).")
+            elif feed_choice == 'c':
+                CHANGE_CAPTURE_CONFIG['enabled'] = not CHANGE_CAPTURE_CONFIG['enabled']
+            elif not feed_choice:
+                return
+            else:
+                print("Invalid choice.")
+        except pymysql.Error as e:
+            connection.rollback()
+            handle_database_error(e, "working with the change log")
+
+def manage_query_governor():
+    while True:
+        print("\n--- Query Governor ---")
+        print(f"Custom SQL limits are {'on' if QUERY_GOVERNOR.enabled else 'off'}.")
+        display_results_as_table([{'limit': limit_name, 'value': limit_value} for limit_name, limit_value in QUERY_GOVERNOR.limits().items()])
+        print("  " + ", ".join(f"{stat_name} {stat_count}" for stat_name, stat_count in QUERY_GOVERNOR.stats.items()))
+        print("  r. Recent rejected, stopped and truncated statements")
+        print("  s. Set a limit (0 turns a row, time or budget limit off)")
+        print("  t. Toggle the governor on/off")
+        print("  Enter. Return to main menu")
+        governor_choice = input("Choose an action: ").strip().lower()
+        if governor_choice == 'r':
+            if not QUERY_GOVERNOR.events:
+                print("Nothing has been rejected, stopped or truncated yet.")
+                continue
+            display_results_as_table([
+                {'at': time.strftime('%H:%M:%S', time.localtime(event['at'])), 'outcome': event['outcome'], 'reason': event['reason'],
+                 'statement': ' '.join(event['statement'].split())[:60], 'detail': event['detail']}
+                for event in reversed(QUERY_GOVERNOR.events)
+            ])
+        elif governor_choice == 's':
+            limit_name = input(f"  Limit ({', '.join(QUERY_GOVERNOR.limits())}): ").strip()
+            if limit_name not in QUERY_GOVERNOR.limits():
+                print("Unknown limit.")
+                continue
+            limit_input = input(f"  New value for {limit_name}: ").strip()
+            try:
+                limit_value = float(limit_input) if limit_name == 'queue_timeout_seconds' else int(limit_input)
+            except ValueError:
+                print("The value must be a number.")
+                continue
+            if limit_value < 0 or (limit_name == 'max_concurrent_heavy' and limit_value < 1):
+                print("The value is out of range.")
+                continue
+            setattr(QUERY_GOVERNOR, limit_name, limit_value)
+            GOVERNOR_CONFIG[limit_name] = limit_value
+        elif governor_choice == 't':
+            QUERY_GOVERNOR.enabled = GOVERNOR_CONFIG['enabled'] = not QUERY_GOVERNOR.enabled
+        elif not governor_choice:
+            return
+        else:
+            print("Invalid choice.")
+
+def show_query_profiler(connection):
+    while True:
+        print("\n--- Query Profiler ---")
+        bucket_counts, wall_times = QUERY_PROFILER.histogram()
+        if not wall_times:
+            print("No statements recorded yet.")
+        else:
+            print(f"Last {len(wall_times)} statement(s): p50 {percentile(wall_times, 50):.3f} ms, "
+                  f"p95 {percentile(wall_times, 95):.3f} ms, p99 {percentile(wall_times, 99):.3f} ms, max {wall_times[-1]:.3f} ms")
+            largest_bucket = max(bucket_count for _, bucket_count in bucket_counts)
+            for bucket_label, bucket_count in bucket_counts:
+                if bucket_count:
+                    print(f"  {bucket_label:>12} | {'#' * max(1, round(bucket_count / largest_bucket * 40)):<40} {bucket_count}")
+        print(f"Trace file: {QUERY_PROFILER.trace_path or 'off'}   Server metrics: {'on' if QUERY_PROFILER.server_metrics else 'unavailable'}")
+        print("  s. Top slow statements (by max time)")
+        print("  t. Top statements by total time")
+        print("  a. EXPLAIN ANALYZE the slowest sample of a top statement")
+        print("  j. Start/stop the JSON-lines trace file")
+        print("  r. Reset recorded statistics")
+        print("  Enter. Return to main menu")
+        profiler_choice = input("Choose an action: ").strip().lower()
+        if profiler_choice in ('s', 't'):
+            top_rows = []
+            for rank, aggregate in enumerate(QUERY_PROFILER.top_statements(10, 'max_ms' if profiler_choice == 's' else 'total_ms'), 1):
+                server_metrics = aggregate['last_server'] or {}
+                top_rows.append({
+                    '#': rank, 'label': aggregate['label'] or '', 'count': aggregate['count'],
+                    'max_ms': f"{aggregate['max_ms']:.2f}", 'avg_ms': f"{aggregate['avg_ms']:.2f}", 'total_ms': f"{aggregate['total_ms']:.1f}",
+                    'server_ms': f"{server_metrics['server_ms']:.2f}" if server_metrics.get('server_ms') is not None else '',
+                    'examined/sent': f"{server_metrics.get('rows_examined') or 0:.0f}/{server_metrics.get('rows_sent') or 0:.0f}" if server_metrics else '',
+                    'statement': aggregate['fingerprint'][:70]
+                })
+            display_results_as_table(top_rows)
+        elif profiler_choice == 'a':
+            top_statements = QUERY_PROFILER.top_statements(10)
+            rank_input = input(f"Statement rank (1-{len(top_statements)}): ").strip()
+            if not rank_input.isdigit() or not 1 <= int(rank_input) <= len(top_statements):
+                print("Invalid rank.")
+                continue
+            sample_sql = top_statements[int(rank_input) - 1]['sample_sql'].strip().rstrip(';')
+            if not is_data_returning_sql(sample_sql) or '%s' in sample_sql:
+                print("Only literal SELECT statements can be analyzed; parameterized samples are recorded without their values.")
+                continue
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN ANALYZE {sample_sql}")
+                    for plan_row in cursor.fetchall():
+                        print(next(iter(plan_row.values())))
+            except pymysql.Error as e:
+                handle_database_error(e, "running EXPLAIN ANALYZE (MySQL 8.0.18+ required)")
+        elif profiler_choice == 'j':
+            if QUERY_PROFILER.trace_path:
+                print(f"Stopped tracing to '{QUERY_PROFILER.trace_path}'.")
+                QUERY_PROFILER.stop_trace()
+            else:
+                trace_path = input(f"  Trace file (Enter for {PROFILER_TRACE_DEFAULT_PATH}): ").strip() or PROFILER_TRACE_DEFAULT_PATH
+                try:
+                    QUERY_PROFILER.start_trace(trace_path)
+                except OSError as e:
+                    print(f"Could not open '{trace_path}': {e}")
+                    continue
+                print(f"Appending one JSON line per statement to '{trace_path}'.")
+        elif profiler_choice == 'r':
+            QUERY_PROFILER.reset()
+            print("Profiler statistics reset.")
+        else:
+            return
+
+def display_main_console_menu(pool):
+    from async_engine import AsyncQueryEngine
+
+    job_engine = AsyncQueryEngine(pool, max_workers=BACKGROUND_JOB_CONFIG['max_workers'])
+    try:
+        run_main_menu_loop(pool, job_engine)
+    finally:
+        job_engine.close(cancel_running=True)
+
+def run_main_menu_loop(pool, job_engine):
+    while True:
+        print_finished_job_notices(job_engine)
         print("\n M A I N   M E N U ")
         print("------------------------------------------")
         print("  1. View Table Contents")
@@ -642,61 +2146,117 @@ def display_main_console_menu(connection):
         print("  6. Run Predefined Project Queries")
         print("  7. List All Tables")
         print("  8. Describe a Table (Show Columns)")
+        print("  9. Bulk Import Rows from CSV/TSV File")
+        print(" 10. Export Table or Query Results to File")
+        print(" 11. Index Advisor (EXPLAIN Project Queries)")
+        print(" 12. Refresh Summary Tables")
+        print(" 13. Query Result / Statement Cache Statistics")
+        print(" 14. Background Jobs (run, monitor, cancel)")
+        print(" 15. Query Profiler (slow statements, histogram, trace)")
+        print(" 16. Search People / Sales (paged)")
+        print(" 17. Batch Update/Delete Records (by PK list)")
+        print(" 18. Reporting Chains / Referral Trees")
+        print(" 19. Relational Division ('sold all types', 'worked in all departments')")
+        print(" 20. In-Memory Sales Analytics (profit/volume by type, month, salesperson...)")
+        print(" 21. Local Snapshot (sync to SQLite, run reports locally)")
+        print(" 22. Change Feed (recent changes, consumer checkpoints)")
+        print(" 23. Query Governor (custom SQL limits, rejected statements)")
         print("  0. Exit Application")
         print("------------------------------------------")
         
         user_selection = input("Enter your choice: ").strip()
-
-        if user_selection == '1':
-            view_table_contents(connection)
-        elif user_selection == '2':
-            insert_new_record(connection)
-        elif user_selection == '3':
-            modify_existing_record(connection)
-        elif user_selection == '4':
-            remove_record(connection)
-        elif user_selection == '5':
-            run_user_custom_sql(connection)
-        elif user_selection == '6':
-            execute_defined_project_queries(connection)
-        elif user_selection == '7':
-            get_table_choice(connection, "Tables are listed. Press Enter to return to menu or select a table to see its name again.")
-        elif user_selection == '8':
-            target_table = get_table_choice(connection, "Enter table number/name to describe")
-            if target_table:
-                column_meta, _ = get_table_metadata(connection, target_table)
-                if column_meta:
-                    print(f"\n--- Schema for Table: `{target_table}` ---")
-                    headers = column_meta[0].keys()
-                    col_widths = {h: len(str(h)) for h in headers}
-                    for cm_row in column_meta:
-                        for h in headers:
-                            col_widths[h] = max(col_widths[h], len(str(cm_row.get(h, ''))))
-                    
-                    header_line = " | ".join(f"{str(h).upper():<{col_widths[h]}}" for h in headers)
-                    print(header_line)
-                    print("-|-".join(f"{'-'*col_widths[h]}" for h in headers))
-                    for cm_row in column_meta:
-                        print(" | ".join(f"{str(cm_row.get(h, '')):<{col_widths[h]}}" for h in headers))
-                    print("-" * len(header_line.replace(" | ","-|-")))
-        elif user_selection == '0':
+        if user_selection == '0':
             print("Exiting Database Console. Goodbye!")
             break
-        else:
-            print("Invalid choice. Please select a valid option from the menu.")
+
+        try:
+            with pool.connection() as connection:
+                run_menu_action(connection, user_selection, job_engine)
+        except pymysql.Error as e:
+            handle_database_error(e, "running the selected menu action")
+
+def run_menu_action(connection, user_selection, job_engine=None):
+    if user_selection == '1':
+        view_table_contents(connection)
+    elif user_selection == '2':
+        insert_new_record(connection)
+    elif user_selection == '3':
+        modify_existing_record(connection)
+    elif user_selection == '4':
+        remove_record(connection)
+    elif user_selection == '5':
+        run_user_custom_sql(connection)
+    elif user_selection == '6':
+        execute_defined_project_queries(connection)
+    elif user_selection == '7':
+        get_table_choice(connection, "Tables are listed. Press Enter to return to menu or select a table to see its name again.")
+    elif user_selection == '8':
+        target_table = get_table_choice(connection, "Enter table number/name to describe")
+        if target_table:
+            column_meta, _ = get_table_metadata(connection, target_table)
+            if column_meta:
+                print(f"\n--- Schema for Table: `{target_table}` ---")
+                headers = column_meta[0].keys()
+                col_widths = {h: len(str(h)) for h in headers}
+                for cm_row in column_meta:
+                    for h in headers:
+                        col_widths[h] = max(col_widths[h], len(str(cm_row.get(h, ''))))
+                
+                header_line = " | ".join(f"{str(h).upper():<{col_widths[h]}}" for h in headers)
+                print(header_line)
+                print("-|-".join(f"{'-'*col_widths[h]}" for h in headers))
+                for cm_row in column_meta:
+                    print(" | ".join(f"{str(cm_row.get(h, '')):<{col_widths[h]}}" for h in headers))
+                print("-" * len(header_line.replace(" | ","-|-")))
+    elif user_selection == '9':
+        bulk_import_from_file(connection)
+    elif user_selection == '10':
+        export_data_to_file(connection)
+    elif user_selection == '11':
+        run_index_advisor(connection)
+    elif user_selection == '12':
+        refresh_summary_tables_menu(connection)
+    elif user_selection == '13':
+        show_query_cache_stats()
+    elif user_selection == '14' and job_engine is not None:
+        manage_background_jobs(connection, job_engine)
+    elif user_selection == '15':
+        show_query_profiler(connection)
+    elif user_selection == '16':
+        search_records(connection)
+    elif user_selection == '17':
+        batch_edit_records(connection)
+    elif user_selection == '18':
+        explore_hierarchy(connection)
+    elif user_selection == '19':
+        run_relational_division(connection)
+    elif user_selection == '20':
+        run_sales_analytics(connection)
+    elif user_selection == '21':
+        manage_local_snapshot(connection)
+    elif user_selection == '22':
+        show_change_feed(connection)
+    elif user_selection == '23':
+        manage_query_governor()
+    else:
+        print("Invalid choice. Please select a valid option from the menu.")
 
 if __name__ == "__main__":
     print("--- Welcome to the XYZ Company Database Console ---")
-    active_connection = establish_db_connection()
+    connection_pool = create_connection_pool()
     
-    if active_connection:
+    if connection_pool:
         try:
-            display_main_console_menu(active_connection)
+            preload_schema_catalog(connection_pool)
+            display_main_console_menu(connection_pool)
         except Exception as e:
             print(f"An unexpected critical error occurred in the main application: {e}")
         finally:
-            active_connection.close()
-            print("Database connection has been closed.")
+            connection_pool.close()
+            if LOCAL_BACKEND_SESSION['connection'] is not None:
+                LOCAL_BACKEND_SESSION['connection'].close()
+            QUERY_PROFILER.stop_trace()
+            print("Database connections have been closed.")
     else:
         print("Application cannot start due to database connection failure.")
 
@@ -443,8 +443,8 @@ WHERE jp.jobID = 11111 AND p.name = 'Hellen Cole';
 
 SELECT jobID
 FROM Job_Position
-WHERE MONTH(postedDate) = 12
-  AND YEAR(postedDate) = 2024;
+WHERE postedDate >= '2024-12-01'
+  AND postedDate < '2025-01-01';
 
 
 SELECT e1.employee_id, p.name
@@ -460,7 +460,7 @@ FROM Marketing_Site ms
 WHERE ms.siteID NOT IN (
     SELECT DISTINCT siteID
     FROM Sales_History
-    WHERE MONTH(sale_date) = 3 AND YEAR(sale_date) = 2011
+    WHERE sale_date >= '2011-03-01' AND sale_date < '2011-04-01'
 );
  
 
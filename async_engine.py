@@ -0,0 +1,221 @@
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import threading
+import time
+
+import pymysql
+
+from result_set import fetch_result_set
+
+QUERY_INTERRUPTED_ERROR_CODE = 1317
+FINISHED_JOB_STATES = ('done', 'failed', 'cancelled', 'timed_out')
+
+class JobCancelledError(Exception):
+    pass
+
+class BackgroundJob:
+    def __init__(self, job_id, label):
+        self.job_id = job_id
+        self.label = label
+        self.state = 'queued'
+        self.connection_id = None
+        self.rows_fetched = 0
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+        self.timed_out = False
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self._lock = threading.Lock()
+
+    def check_cancelled(self):
+        if self.cancel_requested:
+            raise JobCancelledError(f"Job {self.job_id} was cancelled.")
+
+    def elapsed_seconds(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def snapshot(self):
+        return {
+            'job_id': self.job_id, 'label': self.label,
+            'state': 'cancelling' if self.cancel_requested and self.state not in FINISHED_JOB_STATES else self.state,
+            'connection_id': self.connection_id, 'rows_fetched': self.rows_fetched,
+            'elapsed_seconds': self.elapsed_seconds(), 'error': str(self.error) if self.error else None
+        }
+
+def fetch_rows(connection, job, sql_query, query_params=None, chunk_size=1000, max_rows=None):
+    # Unbuffered fetch so job.rows_fetched tracks progress while the server is still sending rows.
+    # Rows are stored column-wise (ResultSet) rather than as one dict per row.
+    def track_progress(rows_fetched):
+        job.rows_fetched = rows_fetched
+        job.check_cancelled()
+
+    job.check_cancelled()
+    return fetch_result_set(connection, sql_query, query_params, chunk_size=chunk_size, progress_callback=track_progress,
+                            max_rows=max_rows)
+
+# Bridges blocking PyMySQL work onto an asyncio loop running in its own thread. A work callable
+# receives (connection, job) on an executor thread and its return value becomes job.result.
+# Coroutines can await run()/gather(); the synchronous console uses submit() and polls.
+class AsyncQueryEngine:
+    def __init__(self, pool, max_workers=None):
+        self.pool = pool
+        # Leave one pooled connection for the foreground console.
+        self.max_workers = max_workers or max(1, pool.max_size - 1)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='query-job')
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name='query-engine-loop', daemon=True)
+        self._loop_thread.start()
+        self._jobs = collections.OrderedDict()
+        self._job_ids = itertools.count(1)
+        self._finished_jobs = collections.deque()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_job(self, label):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The query engine has been closed.")
+            job = BackgroundJob(next(self._job_ids), label)
+            self._jobs[job.job_id] = job
+        return job
+
+    def _execute_blocking(self, job, work):
+        job.check_cancelled()
+        with self.pool.connection() as connection:
+            with job._lock:
+                job.connection_id = connection.thread_id()
+                job.state = 'running'
+                job.started_at = time.monotonic()
+            try:
+                job.check_cancelled()
+                return work(connection, job)
+            finally:
+                with job._lock:
+                    job.connection_id = None
+
+    async def _run_job(self, job, work):
+        loop = asyncio.get_running_loop()
+        try:
+            job.result = await loop.run_in_executor(self._executor, self._execute_blocking, job, work)
+            job.state = 'done'
+        except (JobCancelledError, asyncio.CancelledError):
+            job.state = 'timed_out' if job.timed_out else 'cancelled'
+        except pymysql.err.OperationalError as e:
+            if e.args and e.args[0] == QUERY_INTERRUPTED_ERROR_CODE and job.cancel_requested:
+                job.state = 'timed_out' if job.timed_out else 'cancelled'
+            else:
+                job.error, job.state = e, 'failed'
+        except Exception as e:
+            job.error, job.state = e, 'failed'
+        finally:
+            job.finished_at = time.monotonic()
+            if job.started_at is None:
+                job.started_at = job.finished_at
+            self._finished_jobs.append(job)
+        return job
+
+    async def run(self, label, work, timeout=None):
+        job = self._new_job(label)
+        job_task = asyncio.ensure_future(self._run_job(job, work))
+        if timeout is None:
+            return await job_task
+        try:
+            return await asyncio.wait_for(asyncio.shield(job_task), timeout)
+        except asyncio.TimeoutError:
+            job.timed_out = True
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.cancel, job.job_id)
+            except pymysql.Error:
+                pass
+            return await job_task
+
+    def run_until_complete(self, coroutine):
+        # Lets synchronous callers drive run()/gather() on the engine's loop.
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def gather(self, labelled_work):
+        return await asyncio.gather(*(self.run(label, work) for label, work in labelled_work))
+
+    def submit(self, label, work):
+        job = self._new_job(label)
+        job.future = asyncio.run_coroutine_threadsafe(self._run_job(job, work), self._loop)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def forget(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.state in FINISHED_JOB_STATES:
+                del self._jobs[job_id]
+                return job
+        return None
+
+    def drain_finished(self):
+        drained_jobs = []
+        while self._finished_jobs:
+            drained_jobs.append(self._finished_jobs.popleft())
+        return drained_jobs
+
+    def wait(self, job_id, timeout=None):
+        job = self.get(job_id)
+        if job is not None and job.future is not None:
+            try:
+                job.future.result(timeout)
+            except concurrent.futures.CancelledError:
+                pass
+        return job
+
+    def _kill_query(self, connection_id):
+        # KILL QUERY must come from another session; a pooled one may not be free, so connect directly.
+        kill_connection = pymysql.connect(**self.pool.db_config)
+        try:
+            with kill_connection.cursor() as cursor:
+                cursor.execute(f"KILL QUERY {int(connection_id)};")
+        finally:
+            kill_connection.close()
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED_JOB_STATES:
+            return False
+        job.cancel_requested = True
+        with job._lock:
+            # Queued jobs notice cancel_requested when a worker picks them up.
+            if job.connection_id is not None:
+                self._kill_query(job.connection_id)
+        return True
+
+    def close(self, cancel_running=True):
+        with self._lock:
+            self._closed = True
+            active_jobs = [job for job in self._jobs.values() if job.state not in FINISHED_JOB_STATES]
+        if cancel_running:
+            for job in active_jobs:
+                try:
+                    self.cancel(job.job_id)
+                except pymysql.Error:
+                    pass
+        self._executor.shutdown(wait=True)
+        for job in active_jobs:
+            if job.future is not None:
+                try:
+                    job.future.result(timeout=5)
+                except (concurrent.futures.CancelledError, concurrent.futures.TimeoutError):
+                    pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
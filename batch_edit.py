@@ -0,0 +1,196 @@
+import csv
+import time
+
+import pymysql
+
+from bulk_loader import RejectWriter, is_row_level_error
+
+CHUNK_SAVEPOINT = 'batch_edit_chunk'
+
+class BatchEditError(Exception):
+    pass
+
+def dedupe_keys(keys):
+    seen_keys = set()
+    unique_keys = []
+    for key in keys:
+        if key not in seen_keys:
+            seen_keys.add(key)
+            unique_keys.append(key)
+    return unique_keys
+
+def read_key_file(file_path, pk_cols, delimiter=','):
+    # The header names the primary-key columns (in any order); every other line is one key.
+    with open(file_path, newline='', encoding='utf-8') as key_file:
+        csv_reader = csv.reader(key_file, delimiter=delimiter)
+        header_fields = [field.strip() for field in next(csv_reader, [])]
+        if sorted(header_fields) != sorted(pk_cols):
+            raise BatchEditError(f"Key file header must name exactly the primary key column(s): {', '.join(pk_cols)}")
+        field_positions = [header_fields.index(pk_col) for pk_col in pk_cols]
+        keys = []
+        for row_fields in csv_reader:
+            if not row_fields or not any(field.strip() for field in row_fields):
+                continue
+            if len(row_fields) != len(header_fields):
+                raise BatchEditError(f"Line {csv_reader.line_num}: expected {len(header_fields)} field(s), found {len(row_fields)}.")
+            keys.append(tuple(row_fields[position].strip() for position in field_positions))
+    return dedupe_keys(keys)
+
+def parse_key_list(key_text, pk_cols):
+    # Inline keys: tuples separated by ';', composite key parts by ',' (e.g. "5,7; 5,8").
+    keys = []
+    for key_text_part in key_text.split(';'):
+        if not key_text_part.strip():
+            continue
+        key = tuple(part.strip() for part in key_text_part.split(','))
+        if len(key) != len(pk_cols) or not all(key):
+            raise BatchEditError(f"Key '{key_text_part.strip()}' must have {len(pk_cols)} non-empty part(s): {', '.join(pk_cols)}")
+        keys.append(key)
+    return dedupe_keys(keys)
+
+def key_predicate_sql(pk_cols, key_count):
+    # One multi-row predicate per chunk; MySQL turns both forms into index range lookups.
+    if len(pk_cols) == 1:
+        return f"`{pk_cols[0]}` IN ({', '.join(['%s'] * key_count)})"
+    key_placeholders = f"({', '.join(['%s'] * len(pk_cols))})"
+    return f"({', '.join(f'`{pk}`' for pk in pk_cols)}) IN ({', '.join([key_placeholders] * key_count)})"
+
+def key_params(keys):
+    return tuple(key_part for key in keys for key_part in key)
+
+def build_edit_sql(table_name, pk_cols, key_count, set_columns=None):
+    key_predicate = key_predicate_sql(pk_cols, key_count)
+    if set_columns:
+        return f"UPDATE `{table_name}` SET {', '.join(f'`{col}` = %s' for col in set_columns)} WHERE {key_predicate};"
+    return f"DELETE FROM `{table_name}` WHERE {key_predicate};"
+
+def fetch_rows_by_keys(cursor, table_name, pk_cols, keys):
+    cursor.execute(f"SELECT * FROM `{table_name}` WHERE {key_predicate_sql(pk_cols, len(keys))};", key_params(keys))
+    return list(cursor.fetchall())
+
+def count_matching_keys(connection, table_name, pk_cols, keys, chunk_size):
+    matched_count = 0
+    with connection.cursor() as cursor:
+        for chunk_start in range(0, len(keys), chunk_size):
+            key_chunk = keys[chunk_start:chunk_start + chunk_size]
+            cursor.execute(f"SELECT COUNT(*) AS matched FROM `{table_name}` WHERE {key_predicate_sql(pk_cols, len(key_chunk))};", key_params(key_chunk))
+            count_row = cursor.fetchone()
+            matched_count += count_row['matched'] if isinstance(count_row, dict) else count_row[0]
+    return matched_count
+
+def edit_chunk(cursor, table_name, pk_cols, key_chunk, set_values, change_listener, transaction_changes):
+    # A chunk's statement and its summary maintenance succeed or roll back together; earlier
+    # chunks in the same transaction are kept. The row changes of a chunk that succeeds are added
+    # to transaction_changes (None when nobody collects them).
+    set_columns = list(set_values) if set_values else None
+    needs_row_images = change_listener is not None or transaction_changes is not None
+    row_changes = []
+    cursor.execute(f"SAVEPOINT {CHUNK_SAVEPOINT};")
+    try:
+        before_rows = fetch_rows_by_keys(cursor, table_name, pk_cols, key_chunk) if needs_row_images else None
+        affected_count = cursor.execute(build_edit_sql(table_name, pk_cols, len(key_chunk), set_columns),
+                                        tuple(set_values.values() if set_values else ()) + key_params(key_chunk))
+        if needs_row_images and before_rows:
+            after_rows = [None] * len(before_rows)
+            if set_values:
+                # Re-read so listeners see stored (typed) values rather than the text that was given.
+                after_by_key = {tuple(after_row[pk_col] for pk_col in pk_cols): after_row
+                                for after_row in fetch_rows_by_keys(cursor, table_name, pk_cols, key_chunk)}
+                after_rows = [after_by_key.get(tuple(before_row[pk_col] for pk_col in pk_cols)) or dict(before_row, **set_values)
+                              for before_row in before_rows]
+            row_changes = list(zip(before_rows, after_rows))
+            if change_listener:
+                change_listener(cursor.connection, table_name, row_changes)
+    except pymysql.Error as e:
+        # Other errors (deadlock, lost connection) end the whole transaction and the savepoint with it.
+        if is_row_level_error(e):
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {CHUNK_SAVEPOINT};")
+        raise
+    cursor.execute(f"RELEASE SAVEPOINT {CHUNK_SAVEPOINT};")
+    if transaction_changes is not None:
+        transaction_changes.extend(row_changes)
+    return affected_count
+
+def apply_chunk(cursor, table_name, pk_cols, key_chunk, set_values, change_listener, transaction_changes, reject_writer):
+    try:
+        return edit_chunk(cursor, table_name, pk_cols, key_chunk, set_values, change_listener, transaction_changes)
+    except pymysql.Error as e:
+        if not is_row_level_error(e):
+            raise
+        if len(key_chunk) == 1:
+            reject_writer.write('', key_chunk[0], e.args[1] if len(e.args) > 1 else str(e))
+            return 0
+
+    # Something in the chunk was refused (e.g. a foreign key still references a row), so retry
+    # key by key and report only the keys that fail.
+    affected_count = 0
+    for key in key_chunk:
+        affected_count += apply_chunk(cursor, table_name, pk_cols, [key], set_values, change_listener, transaction_changes, reject_writer)
+    return affected_count
+
+def batch_edit(connection, table_name, pk_cols, keys, set_values=None, delete=False, chunk_size=500, commit_interval=5000,
+               dry_run=False, change_listener=None, commit_listener=None, error_file_path=None, progress_callback=None):
+    # Updates (set_values: {column: value}) or deletes the rows with the given primary keys in
+    # chunk_size-key statements, committing every commit_interval keys so locks stay short-lived.
+    # Both listeners get (connection, table_name, row_changes) with (before, after) pairs (after is
+    # None for a delete): change_listener once per chunk, inside the chunk's savepoint, and
+    # commit_listener once per transaction with all of its changes, just before the commit (for
+    # work that holds locks until the commit, such as the change log's id sequence).
+    if bool(set_values) == bool(delete):
+        raise BatchEditError("Give either the column values to set or the delete flag, not both.")
+    if chunk_size < 1 or commit_interval < 1:
+        raise BatchEditError("Chunk size and commit interval must be positive.")
+    if set_values and set(set_values) & set(pk_cols):
+        raise BatchEditError("Primary key columns cannot be changed in batch edit mode.")
+    keys = dedupe_keys([tuple(key) for key in keys])
+    started_at = time.perf_counter()
+
+    if dry_run:
+        matched_count = count_matching_keys(connection, table_name, pk_cols, keys, chunk_size)
+        return {'dry_run': True, 'keys': len(keys), 'rows_matched': matched_count, 'rows_affected': 0,
+                'keys_failed': 0, 'transactions': 0, 'elapsed_seconds': time.perf_counter() - started_at, 'error_file': None}
+
+    reject_writer = RejectWriter(error_file_path, pk_cols)
+    affected_count = 0
+    keys_since_commit = 0
+    transaction_count = 0
+    transaction_changes = [] if commit_listener else None
+
+    def commit_transaction():
+        if transaction_changes:
+            commit_listener(connection, table_name, transaction_changes)
+            transaction_changes.clear()
+        connection.commit()
+
+    try:
+        with connection.cursor() as cursor:
+            for chunk_start in range(0, len(keys), chunk_size):
+                key_chunk = keys[chunk_start:chunk_start + chunk_size]
+                affected_count += apply_chunk(cursor, table_name, pk_cols, key_chunk, set_values, change_listener,
+                                              transaction_changes, reject_writer)
+                keys_since_commit += len(key_chunk)
+                if keys_since_commit >= commit_interval:
+                    commit_transaction()
+                    transaction_count += 1
+                    keys_since_commit = 0
+                    if progress_callback:
+                        progress_callback(chunk_start + len(key_chunk), affected_count, time.perf_counter() - started_at)
+        commit_transaction()
+        if keys_since_commit:
+            transaction_count += 1
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        reject_writer.close()
+
+    return {
+        'dry_run': False,
+        'keys': len(keys),
+        'rows_matched': None,
+        'rows_affected': affected_count,
+        'keys_failed': reject_writer.rejected_count,
+        'transactions': transaction_count,
+        'elapsed_seconds': time.perf_counter() - started_at,
+        'error_file': error_file_path if reject_writer.rejected_count and error_file_path else None
+    }
@@ -0,0 +1,400 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pymysql
+import pymysql.cursors
+
+import Console
+import datagen
+import relational_division
+import summary_tables
+import table_renderer
+from result_set import ResultSet
+
+BENCHMARK_RESULTS_DIR = "bench_results"
+CRUD_BENCHMARK_TABLE = 'Performance_Review'
+CRUD_BENCHMARK_ID_BASE = 2000000000
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered_samples = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered_samples)))
+    return ordered_samples[rank - 1]
+
+def summarize_samples(samples, row_counts):
+    median_seconds = percentile(samples, 50)
+    rows = row_counts[-1] if row_counts else 0
+    return {
+        'iterations': len(samples),
+        'rows': rows,
+        'p50_ms': median_seconds * 1000 if median_seconds is not None else None,
+        'p95_ms': percentile(samples, 95) * 1000 if samples else None,
+        'p99_ms': percentile(samples, 99) * 1000 if samples else None,
+        'mean_ms': sum(samples) / len(samples) * 1000 if samples else None,
+        'rows_per_second': rows / median_seconds if median_seconds else 0.0,
+        'samples_ms': [round(sample * 1000, 3) for sample in samples]
+    }
+
+def time_project_query(connection, sql_query, iterations, warmup=1):
+    samples, row_counts = [], []
+    for iteration in range(warmup + iterations):
+        started_at = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(sql_query)
+            result_rows = cursor.fetchall()
+        elapsed_seconds = time.perf_counter() - started_at
+        connection.rollback()
+        if iteration >= warmup:
+            samples.append(elapsed_seconds)
+            row_counts.append(len(result_rows))
+    return summarize_samples(samples, row_counts)
+
+def time_division_bitset(connection, division_spec, iterations, warmup=1):
+    samples, row_counts = [], []
+    for iteration in range(warmup + iterations):
+        division_rows, elapsed_seconds = relational_division.run_division(connection, division_spec, strategy='bitset')
+        connection.rollback()
+        if iteration >= warmup:
+            samples.append(elapsed_seconds)
+            row_counts.append(len(division_rows))
+    return summarize_samples(samples, row_counts)
+
+def fetch_dict_rows(connection, sql_query):
+    with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+        cursor.execute(sql_query)
+        return cursor.fetchall()
+
+def fetch_tuple_rows(connection, sql_query):
+    with connection.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute(sql_query)
+        return cursor.fetchall()
+
+def fetch_columnar_rows(connection, sql_query):
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(sql_query)
+        return ResultSet.from_cursor(cursor, Console.RESULT_FETCH_CHUNK_SIZE)
+
+ROW_FORMAT_FETCHERS = {'dict': fetch_dict_rows, 'tuple': fetch_tuple_rows, 'columnar': fetch_columnar_rows}
+
+def time_row_format(connection, sql_query, fetch_function, iterations, warmup=1):
+    # Timed runs first, then one run under tracemalloc (which slows allocation) for the peak
+    # memory while fetching and the memory still held by the returned rows.
+    samples, row_counts = [], []
+    for iteration in range(warmup + iterations):
+        started_at = time.perf_counter()
+        result_rows = fetch_function(connection, sql_query)
+        elapsed_seconds = time.perf_counter() - started_at
+        connection.rollback()
+        if iteration >= warmup:
+            samples.append(elapsed_seconds)
+            row_counts.append(len(result_rows))
+        del result_rows
+    tracemalloc.start()
+    try:
+        result_rows = fetch_function(connection, sql_query)
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    connection.rollback()
+    del result_rows
+    return dict(summarize_samples(samples, row_counts), peak_bytes=peak_bytes, retained_bytes=retained_bytes)
+
+def render_table_unbounded(query_results):
+    # The console renderer before table_renderer, kept as the baseline: every cell is converted
+    # twice (sizing, then printing), widths are unbounded and each row is its own print().
+    headers = query_results[0].keys()
+    col_widths = {header: len(str(header)) for header in headers}
+    for row_data in query_results:
+        for header_name in headers:
+            col_widths[header_name] = max(col_widths[header_name], len(str(row_data.get(header_name, ''))))
+    header_separator_line = " | ".join(f"{'-' * col_widths[header_name]}" for header_name in headers)
+    print("\n" + " | ".join(f"{str(header_name):<{col_widths[header_name]}}" for header_name in headers))
+    print(header_separator_line)
+    for row_data in query_results:
+        print(" | ".join(f"{str(row_data.get(header_name, '')):<{col_widths[header_name]}}" for header_name in headers))
+    print(header_separator_line)
+    print(f"{len(query_results)} row(s) returned.\n")
+
+def render_table_bounded(query_results):
+    headers = list(query_results[0].keys())
+    table_renderer.render_table(headers, table_renderer.row_tuples(query_results, headers), len(query_results),
+                                footer=f"{len(query_results)} row(s) returned.\n", pager_mode='never')
+
+TABLE_RENDERERS = {'unbounded': render_table_unbounded, 'bounded': render_table_bounded}
+
+def time_renderer(result_rows, render_function, iterations, warmup=1):
+    # Rendering only (rows are fetched once), written to the null device so the terminal's own
+    # speed is not measured.
+    samples = []
+    with open(os.devnull, 'w', encoding='utf-8') as null_output, contextlib.redirect_stdout(null_output):
+        for iteration in range(warmup + iterations):
+            started_at = time.perf_counter()
+            render_function(result_rows)
+            elapsed_seconds = time.perf_counter() - started_at
+            if iteration >= warmup:
+                samples.append(elapsed_seconds)
+    return summarize_samples(samples, [len(result_rows)])
+
+def time_cold_start(command_args, iterations, warmup=1):
+    # Wall time of a fresh interpreter per run, as every cron or shell invocation pays it.
+    samples = []
+    for iteration in range(warmup + iterations):
+        started_at = time.perf_counter()
+        completed = subprocess.run([sys.executable] + command_args, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        elapsed_seconds = time.perf_counter() - started_at
+        if completed.returncode:
+            raise RuntimeError(completed.stderr.decode('utf-8', 'replace').strip() or f"exit status {completed.returncode}")
+        if iteration >= warmup:
+            samples.append(elapsed_seconds)
+    return summarize_samples(samples, [])
+
+def cold_start_commands(query_key):
+    # cli.query connects with Console.DB_CONFIG, not the --host/--user options of this run.
+    return {
+        'cli.help': ['console_cli.py', '--help'],
+        'cli.import_console': ['-c', 'import Console'],
+        f'cli.query{query_key}': ['console_cli.py', '--format', 'jsonl', 'query', query_key]
+    }
+
+@contextlib.contextmanager
+def scripted_console(answers):
+    # Drives the interactive Console functions with canned answers and swallows their output.
+    answer_iter = iter(answers)
+    Console.input = lambda prompt='': next(answer_iter)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        del Console.input
+
+def time_console_call(console_function, connection, answers):
+    with scripted_console(answers):
+        started_at = time.perf_counter()
+        console_function(connection)
+        return time.perf_counter() - started_at
+
+def benchmark_crud_paths(connection, iterations):
+    column_metadata, pk_cols = Console.get_table_metadata(connection, CRUD_BENCHMARK_TABLE)
+    if not column_metadata:
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(employee_id) AS employee_id FROM Employee;")
+        employee_row = cursor.fetchone()
+    if not employee_row or employee_row['employee_id'] is None:
+        print("Skipping CRUD benchmarks: Employee table is empty.")
+        return {}
+
+    def column_values(review_id, score):
+        return {'reviewID': str(review_id), 'employee_id': str(employee_row['employee_id']),
+                'reviewDate': datetime.date.today().isoformat(), 'score': str(score)}
+
+    crud_samples = {'crud.insert': [], 'crud.update': [], 'crud.delete': [], 'crud.view_first_page': []}
+    for i in range(iterations):
+        review_id = CRUD_BENCHMARK_ID_BASE + i
+        insert_values = column_values(review_id, 50)
+        insert_answers = [CRUD_BENCHMARK_TABLE] + [insert_values.get(col_meta['name'], '') for col_meta in column_metadata
+                                                   if 'auto_increment' not in (col_meta['extra_info'] or '').lower()]
+        crud_samples['crud.insert'].append(time_console_call(Console.insert_new_record, connection, insert_answers))
+
+        update_answers = [CRUD_BENCHMARK_TABLE] + [str(review_id) for _ in pk_cols]
+        for col_meta in column_metadata:
+            if col_meta['name'] in pk_cols:
+                continue
+            update_answers += ['y', '99'] if col_meta['name'] == 'score' else ['n']
+        crud_samples['crud.update'].append(time_console_call(Console.modify_existing_record, connection, update_answers))
+
+        crud_samples['crud.view_first_page'].append(
+            time_console_call(Console.view_table_contents, connection, [CRUD_BENCHMARK_TABLE, 'q'])
+        )
+
+        delete_answers = [CRUD_BENCHMARK_TABLE] + [str(review_id) for _ in pk_cols] + ['yes']
+        crud_samples['crud.delete'].append(time_console_call(Console.remove_record, connection, delete_answers))
+
+    return {operation: summarize_samples(samples, [1] * len(samples)) for operation, samples in crud_samples.items()}
+
+def compare_results(previous_results, current_results):
+    print(f"\n{'benchmark':<24} {'prev p50 ms':>12} {'curr p50 ms':>12} {'change':>8}")
+    for benchmark_name, current in current_results['results'].items():
+        previous = previous_results.get('results', {}).get(benchmark_name)
+        if not previous or not previous.get('p50_ms') or current.get('p50_ms') is None:
+            print(f"{benchmark_name:<24} {'-':>12} {current.get('p50_ms') or 0:>12.2f} {'new':>8}")
+            continue
+        change_pct = (current['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100
+        print(f"{benchmark_name:<24} {previous['p50_ms']:>12.2f} {current['p50_ms']:>12.2f} {change_pct:>+7.1f}%")
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the project queries and console CRUD paths against synthetic data.")
+    parser.add_argument('--scale', type=int, default=10000, help="approximate total synthetic rows to generate (10K to 100M)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--iterations', type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument('--queries', default=','.join(Console.YOUR_PROJECT_QUERIES), help="comma-separated project query numbers")
+    parser.add_argument('--skip-load', action='store_true', help="reuse synthetic data already in the database")
+    parser.add_argument('--skip-crud', action='store_true')
+    parser.add_argument('--compare-fallback', action='store_true',
+                        help="also time the original SQL of rewritten queries (Q<n>.fallback for summary-backed ones, "
+                             "Q<n>.original for relational divisions) and client-side bitset division (Q<n>.bitset)")
+    parser.add_argument('--compare-row-formats', action='store_true',
+                        help="also fetch each query as DictCursor dicts, plain tuples and a columnar ResultSet, "
+                             "recording time and tracemalloc peak/retained memory (Q<n>.rows.<format>)")
+    parser.add_argument('--compare-renderers', action='store_true',
+                        help="also time rendering each query's rows as a console table, old unbounded renderer vs "
+                             "table_renderer (Q<n>.render.<renderer>, rows/s)")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="also time fresh-process runs of console_cli.py (--help, importing Console, one scripted query)")
+    parser.add_argument('--reset', action='store_true', help="delete previously generated synthetic rows before loading")
+    parser.add_argument('--output', help="results file (default: bench_results/benchmark-<scale>-<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare p50 latencies against")
+    parser.add_argument('--host', default=Console.DB_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=Console.DB_CONFIG['port'])
+    parser.add_argument('--user', default=Console.DB_CONFIG['user'])
+    parser.add_argument('--password', default=Console.DB_CONFIG['password'])
+    parser.add_argument('--database', default=Console.DB_CONFIG['database'])
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    db_config = dict(Console.DB_CONFIG, host=args.host, port=args.port, user=args.user, password=args.password, database=args.database)
+    try:
+        connection = pymysql.connect(**db_config)
+    except pymysql.Error as e:
+        print(f"FATAL: Error connecting to the MySQL database: {e}")
+        return 1
+
+    try:
+        table_columns = {
+            table_name: [col_meta['name'] for col_meta in table_entry['columns']]
+            for table_name, table_entry in Console.SCHEMA_CATALOG.load(connection).items()
+            if table_entry['table_type'] == 'BASE TABLE'
+        }
+        benchmark_results = {
+            'run_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'scale': args.scale, 'seed': args.seed, 'iterations': args.iterations,
+            'python': platform.python_version(), 'server_version': connection.get_server_info(),
+            'load': None, 'results': {}
+        }
+
+        if args.reset:
+            print("Deleting previously generated synthetic rows...")
+            datagen.delete_synthetic_data(connection, table_columns)
+        if not args.skip_load:
+            print(f"Generating ~{args.scale:,} synthetic rows (seed {args.seed})...")
+            load_summary = datagen.load_synthetic_data(
+                connection, args.scale, table_columns, seed=args.seed, batch_size=args.batch_size,
+                progress_callback=lambda table_name, rows, seconds: print(f"  {table_name:<24} {rows:>12,} rows {seconds:8.2f}s")
+            )
+            benchmark_results['load'] = load_summary
+            print(f"Loaded {load_summary['rows']:,} rows in {load_summary['seconds']:.1f}s ({load_summary['rows_per_second']:,.0f} rows/s).")
+
+        summary_names = summary_tables.installed_summaries(Console.SCHEMA_CATALOG.table_names(connection))
+        if summary_names and (not args.skip_load or args.reset):
+            print(f"Rebuilding summary tables ({', '.join(summary_names)})...")
+            refresh_started_at = time.perf_counter()
+            summary_tables.refresh_all(connection, full=True, summary_names=summary_names)
+            benchmark_results['summary_refresh_seconds'] = time.perf_counter() - refresh_started_at
+
+        for query_key in [key.strip() for key in args.queries.split(',') if key.strip()]:
+            query_info = Console.YOUR_PROJECT_QUERIES.get(query_key)
+            if not query_info:
+                print(f"Skipping unknown query '{query_key}'.")
+                continue
+            query_variants = [(f"Q{query_key}", Console.resolve_project_query_sql(connection, query_info))]
+            if args.compare_fallback and query_info.get('fallback_sql') and query_variants[0][1] != query_info['fallback_sql']:
+                query_variants.append((f"Q{query_key}.fallback", query_info['fallback_sql']))
+            if args.compare_fallback and query_info.get('original_sql'):
+                query_variants.append((f"Q{query_key}.original", query_info['original_sql']))
+            if args.compare_fallback and query_info.get('division'):
+                query_variants.append((f"Q{query_key}.bitset", None))
+            for benchmark_name, sql_query in query_variants:
+                try:
+                    if sql_query is None:
+                        query_result = time_division_bitset(connection, query_info['division'], args.iterations)
+                    else:
+                        query_result = time_project_query(connection, sql_query, args.iterations)
+                except pymysql.Error as e:
+                    connection.rollback()
+                    query_result = {'error': str(e)}
+                    print(f"  {benchmark_name:<12} ERROR {e}")
+                else:
+                    print(f"  {benchmark_name:<12} p50 {query_result['p50_ms']:9.2f} ms  p95 {query_result['p95_ms']:9.2f} ms  "
+                          f"p99 {query_result['p99_ms']:9.2f} ms  {query_result['rows']:>8} rows")
+                benchmark_results['results'][benchmark_name] = query_result
+            fallback_result = (benchmark_results['results'].get(f"Q{query_key}.fallback")
+                               or benchmark_results['results'].get(f"Q{query_key}.original") or {})
+            primary_result = benchmark_results['results'][f"Q{query_key}"]
+            if fallback_result.get('p50_ms') and primary_result.get('p50_ms'):
+                print(f"  {'':<12} p50 speedup over the original SQL: {fallback_result['p50_ms'] / primary_result['p50_ms']:.1f}x")
+            if args.compare_row_formats and query_variants[0][1]:
+                for row_format, fetch_function in ROW_FORMAT_FETCHERS.items():
+                    benchmark_name = f"Q{query_key}.rows.{row_format}"
+                    try:
+                        format_result = time_row_format(connection, query_variants[0][1], fetch_function, args.iterations)
+                    except pymysql.Error as e:
+                        connection.rollback()
+                        format_result = {'error': str(e)}
+                        print(f"  {benchmark_name:<18} ERROR {e}")
+                    else:
+                        print(f"  {benchmark_name:<18} p50 {format_result['p50_ms']:9.2f} ms  "
+                              f"peak {format_result['peak_bytes'] / 1024:>10,.1f} KiB  "
+                              f"retained {format_result['retained_bytes'] / 1024:>10,.1f} KiB  {format_result['rows']:>8} rows")
+                    benchmark_results['results'][benchmark_name] = format_result
+            if args.compare_renderers and query_variants[0][1]:
+                try:
+                    result_rows = fetch_dict_rows(connection, query_variants[0][1])
+                    connection.rollback()
+                except pymysql.Error as e:
+                    connection.rollback()
+                    print(f"  Q{query_key}.render    ERROR {e}")
+                    result_rows = None
+                for renderer_name, render_function in TABLE_RENDERERS.items() if result_rows else ():
+                    benchmark_name = f"Q{query_key}.render.{renderer_name}"
+                    render_result = time_renderer(result_rows, render_function, args.iterations)
+                    print(f"  {benchmark_name:<22} p50 {render_result['p50_ms']:9.2f} ms  {render_result['rows_per_second']:>12,.0f} rows/s")
+                    benchmark_results['results'][benchmark_name] = render_result
+
+        if not args.skip_crud:
+            for operation, operation_result in benchmark_crud_paths(connection, args.iterations).items():
+                benchmark_results['results'][operation] = operation_result
+                print(f"  {operation:<22} p50 {operation_result['p50_ms']:9.2f} ms  p95 {operation_result['p95_ms']:9.2f} ms")
+
+        if args.cold_start:
+            first_query_key = next((key.strip() for key in args.queries.split(',') if key.strip()), '1')
+            for benchmark_name, command_args in cold_start_commands(first_query_key).items():
+                try:
+                    cold_start_result = time_cold_start(command_args, args.iterations)
+                except RuntimeError as e:
+                    cold_start_result = {'error': str(e)}
+                    print(f"  {benchmark_name:<22} ERROR {e}")
+                else:
+                    print(f"  {benchmark_name:<22} p50 {cold_start_result['p50_ms']:9.2f} ms  p95 {cold_start_result['p95_ms']:9.2f} ms")
+                benchmark_results['results'][benchmark_name] = cold_start_result
+    finally:
+        connection.close()
+
+    output_path = args.output or os.path.join(
+        BENCHMARK_RESULTS_DIR, f"benchmark-{args.scale}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as results_file:
+        json.dump(benchmark_results, results_file, indent=2, default=str)
+    print(f"Results written to '{output_path}'.")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous_file:
+            compare_results(json.load(previous_file), benchmark_results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
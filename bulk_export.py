@@ -0,0 +1,228 @@
+import csv
+import datetime
+import decimal
+import gzip
+import json
+import struct
+import sys
+import time
+from array import array
+
+import pymysql.cursors
+
+EXPORT_FILE_EXTENSIONS = {'csv': '.csv', 'jsonl': '.jsonl', 'columnar': '.dbcol'}
+COLUMNAR_MAGIC = b"DBCOL1\n"
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+def json_default(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+def open_export_file(output_path, binary, compress):
+    if compress:
+        return gzip.open(output_path, 'wb' if binary else 'wt', encoding=None if binary else 'utf-8', newline=None if binary else '')
+    if binary:
+        return open(output_path, 'wb')
+    return open(output_path, 'w', encoding='utf-8', newline='')
+
+class CsvExportWriter:
+    binary = False
+
+    def __init__(self, output_file, column_names):
+        self._writer = csv.writer(output_file)
+        self._writer.writerow(column_names)
+
+    def write_chunk(self, rows):
+        self._writer.writerows(tuple('' if value is None else value for value in row) for row in rows)
+
+    def close(self):
+        pass
+
+class JsonLinesExportWriter:
+    binary = False
+
+    def __init__(self, output_file, column_names):
+        self._output_file = output_file
+        self._column_names = column_names
+
+    def write_chunk(self, rows):
+        self._output_file.write(''.join(
+            json.dumps(dict(zip(self._column_names, row)), default=json_default) + '\n' for row in rows
+        ))
+
+    def close(self):
+        pass
+
+def encode_column(values):
+    row_count = len(values)
+    null_bitmap = bytearray((row_count + 7) // 8)
+    non_null_values = []
+    for i, value in enumerate(values):
+        if value is None:
+            null_bitmap[i >> 3] |= 1 << (i & 7)
+        else:
+            non_null_values.append(value)
+    logical_type = type(non_null_values[0]).__name__ if non_null_values else 'null'
+
+    if non_null_values and all(type(value) is int and INT64_MIN <= value <= INT64_MAX for value in non_null_values):
+        column_kind, column_data = 'int64', array('q', (0 if value is None else value for value in values))
+    elif non_null_values and all(type(value) is float for value in non_null_values):
+        column_kind, column_data = 'float64', array('d', (0.0 if value is None else value for value in values))
+    else:
+        encoded_values = [b'' if value is None else str(value).encode('utf-8') for value in values]
+        offsets = array('Q', [0])
+        for encoded in encoded_values:
+            offsets.append(offsets[-1] + len(encoded))
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        return 'utf8', logical_type, bytes(null_bitmap), offsets.tobytes() + b''.join(encoded_values)
+
+    if sys.byteorder != 'little':
+        column_data.byteswap()
+    return column_kind, logical_type, bytes(null_bitmap), column_data.tobytes()
+
+class ColumnarExportWriter:
+    binary = True
+
+    def __init__(self, output_file, column_names):
+        self._output_file = output_file
+        self._column_names = column_names
+        self._row_groups = 0
+        self._row_count = 0
+        self._output_file.write(COLUMNAR_MAGIC)
+
+    def write_chunk(self, rows):
+        if not rows:
+            return
+        column_meta = []
+        column_buffers = []
+        for col_index, column_name in enumerate(self._column_names):
+            column_kind, logical_type, null_bitmap, column_data = encode_column([row[col_index] for row in rows])
+            column_meta.append({'name': column_name, 'kind': column_kind, 'logical_type': logical_type,
+                                'null_bytes': len(null_bitmap), 'data_bytes': len(column_data)})
+            column_buffers.append(null_bitmap)
+            column_buffers.append(column_data)
+
+        group_header = json.dumps({'rows': len(rows), 'columns': column_meta}).encode('utf-8')
+        self._output_file.write(struct.pack('<I', len(group_header)))
+        self._output_file.write(group_header)
+        for column_buffer in column_buffers:
+            self._output_file.write(column_buffer)
+        self._row_groups += 1
+        self._row_count += len(rows)
+
+    def close(self):
+        footer = json.dumps({'columns': self._column_names, 'row_groups': self._row_groups, 'rows': self._row_count}).encode('utf-8')
+        self._output_file.write(struct.pack('<I', 0))
+        self._output_file.write(struct.pack('<I', len(footer)))
+        self._output_file.write(footer)
+
+EXPORT_WRITERS = {
+    'csv': CsvExportWriter,
+    'jsonl': JsonLinesExportWriter,
+    'columnar': ColumnarExportWriter
+}
+
+def decode_column(column_meta, null_bitmap, column_data, row_count):
+    if column_meta['kind'] in ('int64', 'float64'):
+        values = array('q' if column_meta['kind'] == 'int64' else 'd')
+        values.frombytes(column_data)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values, null_bitmap
+
+    offsets = array('Q')
+    offsets_size = (row_count + 1) * offsets.itemsize
+    offsets.frombytes(column_data[:offsets_size])
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    text_blob = column_data[offsets_size:]
+    values = [
+        None if null_bitmap[i >> 3] & (1 << (i & 7)) else text_blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+        for i in range(row_count)
+    ]
+    return values, null_bitmap
+
+def iter_columnar_row_groups(input_path):
+    with open(input_path, 'rb') as probe_file:
+        is_gzipped = probe_file.read(2) == b'\x1f\x8b'
+    with (gzip.open(input_path, 'rb') if is_gzipped else open(input_path, 'rb')) as input_file:
+        if input_file.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"'{input_path}' is not a columnar export file.")
+        while True:
+            (header_length,) = struct.unpack('<I', input_file.read(4))
+            if header_length == 0:
+                return
+            group_header = json.loads(input_file.read(header_length))
+            row_count = group_header['rows']
+            decoded_columns = []
+            for column_meta in group_header['columns']:
+                null_bitmap = input_file.read(column_meta['null_bytes'])
+                column_data = input_file.read(column_meta['data_bytes'])
+                values, null_bitmap = decode_column(column_meta, null_bitmap, column_data, row_count)
+                decoded_columns.append({
+                    'name': column_meta['name'], 'kind': column_meta['kind'], 'logical_type': column_meta['logical_type'],
+                    'values': values, 'null_bitmap': null_bitmap
+                })
+            yield row_count, decoded_columns
+
+def iter_columnar_rows(input_path):
+    for row_count, decoded_columns in iter_columnar_row_groups(input_path):
+        column_values = []
+        for column in decoded_columns:
+            null_bitmap = column['null_bitmap']
+            column_values.append([
+                None if null_bitmap[i >> 3] & (1 << (i & 7)) else value
+                for i, value in enumerate(column['values'])
+            ])
+        yield from zip(*column_values)
+
+def export_query(connection, sql_query, output_path, file_format='csv', chunk_size=5000, compress=False, query_params=None, progress_callback=None,
+                 max_rows=None):
+    # max_rows: stop after that many rows and report 'truncated' (the query governor's row cap).
+    if file_format not in EXPORT_WRITERS:
+        raise ValueError(f"Unknown export format '{file_format}'. Choose one of: {', '.join(EXPORT_WRITERS)}")
+    writer_class = EXPORT_WRITERS[file_format]
+    started_at = time.perf_counter()
+    rows_exported = 0
+    truncated = False
+
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(sql_query, query_params)
+        column_names = [column_desc[0] for column_desc in cursor.description or ()]
+        if not column_names:
+            raise ValueError("The statement did not return a result set to export.")
+
+        with open_export_file(output_path, writer_class.binary, compress) as output_file:
+            export_writer = writer_class(output_file, column_names)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if max_rows is not None and rows_exported + len(rows) > max_rows:
+                    rows = rows[:max_rows - rows_exported]
+                    truncated = True
+                if rows:
+                    export_writer.write_chunk(rows)
+                rows_exported += len(rows)
+                if progress_callback:
+                    progress_callback(rows_exported, time.perf_counter() - started_at)
+                if truncated:
+                    break
+            export_writer.close()
+
+    elapsed_seconds = time.perf_counter() - started_at
+    return {
+        'path': output_path,
+        'format': file_format,
+        'rows': rows_exported,
+        'truncated': truncated,
+        'columns': column_names,
+        'elapsed_seconds': elapsed_seconds,
+        'rows_per_second': rows_exported / elapsed_seconds if elapsed_seconds > 0 else 0.0
+    }
@@ -0,0 +1,239 @@
+import csv
+import os
+import tempfile
+import time
+
+import pymysql
+
+LOAD_DATA_DISABLED_ERROR_CODES = (1148, 2068, 3948, 3950)
+# Escapes for LOAD DATA's default ESCAPED BY '\\'; \N is NULL.
+LOAD_DATA_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+ROW_VALUE_ERROR_CODES = (1264, 1265, 1292, 1364, 1366, 1406)
+
+class BulkLoadError(Exception):
+    pass
+
+def guess_delimiter(file_path):
+    return '\t' if os.path.splitext(file_path)[1].lower() in ('.tsv', '.tab') else ','
+
+def check_file_columns(header_fields, column_metadata):
+    known_columns = {col_meta['name']: col_meta for col_meta in column_metadata}
+    unknown_columns = [field for field in header_fields if field not in known_columns]
+    if unknown_columns:
+        raise BulkLoadError(f"File columns not found in table: {', '.join(unknown_columns)}")
+    if len(set(header_fields)) != len(header_fields):
+        raise BulkLoadError("File header lists the same column more than once.")
+
+    missing_required = [
+        col_meta['name'] for col_meta in column_metadata
+        if col_meta['name'] not in header_fields
+        and not col_meta['nullable']
+        and col_meta['default_value'] is None
+        and 'auto_increment' not in (col_meta.get('extra_info') or '').lower()
+    ]
+    if missing_required:
+        raise BulkLoadError(f"File is missing required column(s): {', '.join(missing_required)}")
+    return [known_columns[field] for field in header_fields]
+
+def convert_file_row(row_fields, file_columns):
+    if len(row_fields) != len(file_columns):
+        return None, f"expected {len(file_columns)} field(s), found {len(row_fields)}"
+    converted_values = []
+    for raw_value, col_meta in zip(row_fields, file_columns):
+        if raw_value == '' or raw_value.upper() == 'NULL':
+            if not col_meta['nullable']:
+                return None, f"column '{col_meta['name']}' is required"
+            converted_values.append(None)
+        else:
+            converted_values.append(raw_value)
+    return tuple(converted_values), None
+
+def local_infile_allowed(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW VARIABLES LIKE 'local_infile';")
+            variable_row = cursor.fetchone()
+    except pymysql.Error:
+        return False
+    if not variable_row:
+        return False
+    variable_value = variable_row['Value'] if isinstance(variable_row, dict) else variable_row[1]
+    return str(variable_value).upper() in ('ON', '1')
+
+class RejectWriter:
+    def __init__(self, error_file_path, header_fields):
+        self.error_file_path = error_file_path
+        self.header_fields = header_fields
+        self.rejected_count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, line_number, row_fields, reason):
+        self.rejected_count += 1
+        if not self.error_file_path:
+            return
+        if self._writer is None:
+            self._file = open(self.error_file_path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['line_number', 'reject_reason'] + list(self.header_fields))
+        self._writer.writerow([line_number, reason] + list(row_fields))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+def write_load_file(load_file, csv_reader, file_columns, reject_writer):
+    # Lines go through convert_file_row, like the executemany path: malformed lines and empty
+    # required fields are rejected here with their line numbers, and the rest are written
+    # tab-separated with LOAD DATA escapes so NULLs, quotes and delimiters load the same way.
+    row_count = 0
+    for row_fields in csv_reader:
+        if not row_fields:
+            continue
+        values, reject_reason = convert_file_row(row_fields, file_columns)
+        if reject_reason:
+            reject_writer.write(csv_reader.line_num, row_fields, reject_reason)
+            continue
+        load_file.write("\t".join('\\N' if value is None else value.translate(LOAD_DATA_ESCAPES) for value in values) + "\n")
+        row_count += 1
+    return row_count
+
+def load_with_load_data(connection, table_name, csv_reader, file_columns, reject_writer):
+    # Returns None, with nothing loaded, when the server skipped or altered any row: LOCAL turns
+    # duplicate-key and conversion errors into warnings, so the rejected rows can't be told apart.
+    # The caller then reloads with executemany, which reports every rejected line.
+    column_list_sql = ", ".join(f"`{col_meta['name']}`" for col_meta in file_columns)
+    load_file = tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='', delete=False)
+    try:
+        with load_file:
+            expected_rows = write_load_file(load_file, csv_reader, file_columns, reject_writer)
+        sql_load_data = (
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table_name}` CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({column_list_sql});"
+        )
+        with connection.cursor() as cursor:
+            rows_loaded = cursor.execute(sql_load_data, (load_file.name,))
+            cursor.execute("SHOW COUNT(*) WARNINGS;")
+            warning_row = cursor.fetchone()
+            warning_count = list(warning_row.values())[0] if isinstance(warning_row, dict) else warning_row[0]
+        if rows_loaded != expected_rows or warning_count:
+            connection.rollback()
+            return None
+        connection.commit()
+        return rows_loaded
+    finally:
+        os.remove(load_file.name)
+
+def is_row_level_error(db_error):
+    if isinstance(db_error, (pymysql.err.IntegrityError, pymysql.err.DataError)):
+        return True
+    return isinstance(db_error, pymysql.err.OperationalError) and bool(db_error.args) and db_error.args[0] in ROW_VALUE_ERROR_CODES
+
+def insert_batch(cursor, sql_insert_query, batch_rows, reject_writer):
+    try:
+        cursor.executemany(sql_insert_query, [values for _, _, values in batch_rows])
+        return len(batch_rows)
+    except pymysql.Error as e:
+        if not is_row_level_error(e):
+            raise
+
+    # A failed multi-row INSERT is rolled back as a single statement, so retry the batch row by row.
+    inserted_count = 0
+    for line_number, row_fields, values in batch_rows:
+        try:
+            cursor.execute(sql_insert_query, values)
+            inserted_count += 1
+        except pymysql.Error as e:
+            if not is_row_level_error(e):
+                raise
+            reject_writer.write(line_number, row_fields, e.args[1] if len(e.args) > 1 else str(e))
+    return inserted_count
+
+def load_with_executemany(connection, table_name, csv_reader, file_columns, reject_writer, batch_size, commit_interval, progress_callback, started_at):
+    column_list_sql = ", ".join(f"`{col_meta['name']}`" for col_meta in file_columns)
+    placeholders = ", ".join(['%s'] * len(file_columns))
+    sql_insert_query = f"INSERT INTO `{table_name}` ({column_list_sql}) VALUES ({placeholders})"
+
+    rows_loaded = 0
+    rows_since_commit = 0
+    batch_rows = []
+    try:
+        with connection.cursor() as cursor:
+            for row_fields in csv_reader:
+                if not row_fields:
+                    continue
+                values, reject_reason = convert_file_row(row_fields, file_columns)
+                if reject_reason:
+                    reject_writer.write(csv_reader.line_num, row_fields, reject_reason)
+                    continue
+                batch_rows.append((csv_reader.line_num, row_fields, values))
+                if len(batch_rows) < batch_size:
+                    continue
+
+                inserted_count = insert_batch(cursor, sql_insert_query, batch_rows, reject_writer)
+                rows_loaded += inserted_count
+                rows_since_commit += len(batch_rows)
+                batch_rows = []
+                if rows_since_commit >= commit_interval:
+                    connection.commit()
+                    rows_since_commit = 0
+                    if progress_callback:
+                        progress_callback(rows_loaded, reject_writer.rejected_count, time.perf_counter() - started_at)
+
+            if batch_rows:
+                rows_loaded += insert_batch(cursor, sql_insert_query, batch_rows, reject_writer)
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    return rows_loaded
+
+def bulk_load_file(connection, table_name, file_path, column_metadata, delimiter=None, batch_size=1000,
+                   commit_interval=10000, error_file_path=None, use_load_data=True, progress_callback=None):
+    if batch_size < 1 or commit_interval < 1:
+        raise BulkLoadError("Batch size and commit interval must be positive.")
+    delimiter = delimiter or guess_delimiter(file_path)
+    started_at = time.perf_counter()
+
+    with open(file_path, newline='', encoding='utf-8') as data_file:
+        csv_reader = csv.reader(data_file, delimiter=delimiter)
+        header_fields = [field.strip() for field in next(csv_reader, [])]
+        if not header_fields:
+            raise BulkLoadError(f"'{file_path}' is empty; the first line must name the columns.")
+        file_columns = check_file_columns(header_fields, column_metadata)
+
+        reject_writer = RejectWriter(error_file_path, header_fields)
+        load_method = 'executemany'
+        rows_loaded = None
+        try:
+            if use_load_data and local_infile_allowed(connection):
+                try:
+                    rows_loaded = load_with_load_data(connection, table_name, csv_reader, file_columns, reject_writer)
+                    load_method = 'load_data'
+                except pymysql.Error as e:
+                    connection.rollback()
+                    if e.args and e.args[0] not in LOAD_DATA_DISABLED_ERROR_CODES:
+                        raise
+                if rows_loaded is None:
+                    # Start over from the first data line; the reject file is rewritten from scratch.
+                    load_method = 'executemany'
+                    reject_writer.close()
+                    reject_writer = RejectWriter(error_file_path, header_fields)
+                    data_file.seek(0)
+                    csv_reader = csv.reader(data_file, delimiter=delimiter)
+                    next(csv_reader, None)
+            if rows_loaded is None:
+                rows_loaded = load_with_executemany(connection, table_name, csv_reader, file_columns, reject_writer,
+                                                    batch_size, commit_interval, progress_callback, started_at)
+        finally:
+            reject_writer.close()
+
+    elapsed_seconds = time.perf_counter() - started_at
+    return {
+        'method': load_method,
+        'rows_loaded': rows_loaded,
+        'rows_rejected': reject_writer.rejected_count,
+        'elapsed_seconds': elapsed_seconds,
+        'rows_per_second': rows_loaded / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+        'error_file': error_file_path if reject_writer.rejected_count and error_file_path else None
+    }
@@ -0,0 +1,242 @@
+import argparse
+import datetime
+import decimal
+import json
+import sys
+import time
+
+CHANGE_LOG_TABLE = 'change_log'
+CHANGE_LOG_TABLES = ('change_log', 'change_log_sequence', 'change_log_checkpoint')
+# Table-level events (custom DML, bulk loads) carry the statement instead of row images;
+# ALL_TABLES marks a statement whose target table could not be determined.
+STATEMENT_OPERATION = 'statement'
+ALL_TABLES = '*'
+CHANGE_COLUMNS = "change_id, changed_at, table_name, operation, primary_key, before_values, after_values, statement_text"
+
+def is_installed(table_names):
+    return all(table_name in table_names for table_name in CHANGE_LOG_TABLES)
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, (decimal.Decimal, datetime.timedelta)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def encode_values(row_values):
+    return None if row_values is None else json.dumps(row_values, default=_json_default)
+
+def decode_values(column_value):
+    return json.loads(column_value) if isinstance(column_value, (str, bytes)) else column_value
+
+def row_operation(before_row, after_row):
+    if before_row is None:
+        return 'insert'
+    return 'delete' if after_row is None else 'update'
+
+def allocate_change_ids(cursor, id_count):
+    # The sequence row stays locked until the caller commits, so ids commit in order and without gaps.
+    cursor.execute("UPDATE change_log_sequence SET last_change_id = LAST_INSERT_ID(last_change_id + %s) WHERE sequence_id = 1;", (id_count,))
+    cursor.execute("SELECT LAST_INSERT_ID() AS last_change_id, NOW(6) AS changed_at;")
+    sequence_row = cursor.fetchone()
+    if not isinstance(sequence_row, dict):
+        sequence_row = {'last_change_id': sequence_row[0], 'changed_at': sequence_row[1]}
+    return sequence_row['last_change_id'] - id_count + 1, sequence_row['changed_at']
+
+def write_log_rows(cursor, log_rows):
+    if not log_rows:
+        return 0
+    first_change_id, changed_at = allocate_change_ids(cursor, len(log_rows))
+    cursor.executemany(
+        "INSERT INTO change_log (change_id, changed_at, table_name, operation, primary_key, before_values, after_values, statement_text) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s);",
+        [(first_change_id + row_offset, changed_at) + log_row for row_offset, log_row in enumerate(log_rows)]
+    )
+    return len(log_rows)
+
+def record_row_changes(cursor, table_name, pk_cols, row_changes):
+    # row_changes: (before_row, after_row) pairs, None for the missing side of an insert or delete.
+    # Call it last before commit: changed_at is read when the ids are allocated.
+    log_rows = []
+    for before_row, after_row in row_changes:
+        if before_row is None and after_row is None:
+            continue
+        key_row = after_row if after_row is not None else before_row
+        primary_key = {pk_col: key_row.get(pk_col) for pk_col in pk_cols} if pk_cols else None
+        log_rows.append((table_name, row_operation(before_row, after_row), encode_values(primary_key),
+                         encode_values(before_row), encode_values(after_row), None))
+    return write_log_rows(cursor, log_rows)
+
+def record_statement(cursor, table_name, statement_text, affected_rows=None):
+    details = None if affected_rows is None else {'affected_rows': affected_rows}
+    return write_log_rows(cursor, [(table_name or ALL_TABLES, STATEMENT_OPERATION, None, None, encode_values(details), statement_text)])
+
+def decode_change(change_row):
+    change = dict(change_row)
+    for column_name in ('primary_key', 'before_values', 'after_values'):
+        change[column_name] = decode_values(change[column_name])
+    return change
+
+def table_filter_sql(table_names):
+    # Statement events with an unknown target may touch any table, so a filtered feed keeps them.
+    if not table_names:
+        return "", []
+    return f" AND table_name IN ({', '.join(['%s'] * (len(table_names) + 1))})", list(table_names) + [ALL_TABLES]
+
+def read_changes(connection, after_change_id=0, limit=1000, table_names=None):
+    filter_sql, filter_params = table_filter_sql(table_names)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {CHANGE_COLUMNS} FROM change_log WHERE change_id > %s{filter_sql} ORDER BY change_id LIMIT %s;",
+                       (after_change_id, *filter_params, limit))
+        return [decode_change(change_row) for change_row in cursor.fetchall()]
+
+def recent_changes(connection, limit=20, table_names=None):
+    filter_sql, filter_params = table_filter_sql(table_names)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {CHANGE_COLUMNS} FROM change_log WHERE 1 = 1{filter_sql} ORDER BY change_id DESC LIMIT %s;",
+                       (*filter_params, limit))
+        return [decode_change(change_row) for change_row in reversed(cursor.fetchall())]
+
+def latest_change_id(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT last_change_id FROM change_log_sequence WHERE sequence_id = 1;")
+        sequence_row = cursor.fetchone()
+    return sequence_row['last_change_id'] if sequence_row else 0
+
+def changed_tables_since(connection, after_change_id):
+    # Cheap poll for cache invalidation: which tables changed, not how.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT table_name, MAX(change_id) AS last_change_id FROM change_log WHERE change_id > %s GROUP BY table_name;",
+                       (after_change_id,))
+        table_rows = cursor.fetchall()
+    return ({table_row['table_name'] for table_row in table_rows},
+            max((table_row['last_change_id'] for table_row in table_rows), default=after_change_id))
+
+def load_checkpoint(connection, consumer):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT last_change_id FROM change_log_checkpoint WHERE consumer = %s;", (consumer,))
+        checkpoint_row = cursor.fetchone()
+    return checkpoint_row['last_change_id'] if checkpoint_row else 0
+
+def save_checkpoint(connection, consumer, change_id):
+    with connection.cursor() as cursor:
+        updated_count = cursor.execute(
+            "UPDATE change_log_checkpoint SET last_change_id = %s, updated_at = NOW(6) WHERE consumer = %s;", (change_id, consumer)
+        )
+        if not updated_count:
+            cursor.execute("INSERT INTO change_log_checkpoint (consumer, last_change_id, updated_at) VALUES (%s, %s, NOW(6));",
+                           (consumer, change_id))
+    connection.commit()
+
+def consume(connection, consumer, handler, batch_size=1000, table_names=None, max_batches=None):
+    # handler(changes) gets each batch in change_id order; the checkpoint moves only after it
+    # returns, so a consumer that crashes sees the unfinished batch again (at-least-once).
+    last_change_id = load_checkpoint(connection, consumer)
+    delivered_count = batch_count = 0
+    while max_batches is None or batch_count < max_batches:
+        changes = read_changes(connection, last_change_id, batch_size, table_names)
+        # End the read snapshot so the next batch (and the next poll) sees newer commits.
+        connection.commit()
+        if not changes:
+            break
+        handler(changes)
+        last_change_id = changes[-1]['change_id']
+        save_checkpoint(connection, consumer, last_change_id)
+        delivered_count += len(changes)
+        batch_count += 1
+        if len(changes) < batch_size:
+            break
+    return {'consumer': consumer, 'delivered': delivered_count, 'last_change_id': last_change_id}
+
+def consumer_status(connection):
+    last_change_id = latest_change_id(connection)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT consumer, last_change_id, updated_at FROM change_log_checkpoint ORDER BY consumer;")
+        checkpoint_rows = cursor.fetchall()
+    return [dict(checkpoint_row, lag=last_change_id - checkpoint_row['last_change_id']) for checkpoint_row in checkpoint_rows]
+
+def purge_consumed(connection, keep_days=7, chunk_size=10000):
+    # Deletes changes every consumer has checkpointed past and that are older than keep_days.
+    # Without consumers nothing is purged, so a consumer added later can still start from 0.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(last_change_id) AS consumed_id FROM change_log_checkpoint;")
+        consumed_row = cursor.fetchone()
+        consumed_id = consumed_row['consumed_id'] if consumed_row else None
+        if consumed_id is None:
+            return 0
+        purged_count = 0
+        while True:
+            deleted_count = cursor.execute(
+                "DELETE FROM change_log WHERE change_id <= %s AND changed_at < NOW(6) - INTERVAL %s DAY ORDER BY change_id LIMIT %s;",
+                (consumed_id, keep_days, chunk_size)
+            )
+            connection.commit()
+            purged_count += deleted_count
+            if deleted_count < chunk_size:
+                return purged_count
+
+def print_changes(changes):
+    for change in changes:
+        print(json.dumps(change, default=_json_default), flush=True)
+
+def main(argv=None):
+    import pymysql
+    import Console
+
+    parser = argparse.ArgumentParser(description="Read the console change log as JSON lines, resuming from a named checkpoint.")
+    parser.add_argument('--consumer', help="checkpoint name; without it the feed is read from --after and nothing is saved")
+    parser.add_argument('--after', type=int, default=0, help="start after this change_id (no --consumer)")
+    parser.add_argument('--tables', help="comma-separated table names to follow")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--follow', action='store_true', help="keep polling for new changes")
+    parser.add_argument('--poll-seconds', type=float, default=2.0)
+    parser.add_argument('--status', action='store_true', help="list consumers and how far behind they are")
+    parser.add_argument('--purge', action='store_true', help="delete changes every consumer has read")
+    parser.add_argument('--keep-days', type=int, default=7, help="with --purge, keep changes newer than this")
+    args = parser.parse_args(argv)
+    table_names = [table_name.strip() for table_name in args.tables.split(',') if table_name.strip()] if args.tables else None
+
+    try:
+        connection = pymysql.connect(**Console.DB_CONFIG)
+    except pymysql.Error as e:
+        print(f"FATAL: Error connecting to the MySQL database: {e}")
+        return 1
+    try:
+        if not is_installed(Console.SCHEMA_CATALOG.table_names(connection)):
+            print("The change log is not installed; apply the change log migration first.")
+            return 1
+        if args.status:
+            for status_row in consumer_status(connection):
+                print(f"{status_row['consumer']}: at {status_row['last_change_id']}, {status_row['lag']} behind, updated {status_row['updated_at']}")
+            return 0
+        if args.purge:
+            print(f"Purged {purge_consumed(connection, args.keep_days)} change(s).")
+            return 0
+        last_change_id = args.after
+        while True:
+            if args.consumer:
+                last_change_id = consume(connection, args.consumer, print_changes, args.batch_size, table_names)['last_change_id']
+            else:
+                changes = read_changes(connection, last_change_id, args.batch_size, table_names)
+                connection.commit()
+                print_changes(changes)
+                if changes:
+                    last_change_id = changes[-1]['change_id']
+                    if len(changes) == args.batch_size:
+                        continue
+            if not args.follow:
+                return 0
+            time.sleep(args.poll_seconds)
+    except pymysql.Error as e:
+        connection.rollback()
+        Console.handle_database_error(e, "reading the change log")
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
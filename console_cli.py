@@ -0,0 +1,344 @@
+import argparse
+import contextlib
+import os
+import shlex
+import sys
+import time
+
+# Start-up only loads argparse: pymysql, Console and the output formatters are imported by the
+# commands that use them, and the database connection opens on the first command that needs it.
+STARTED_AT = time.perf_counter()
+OUTPUT_FORMATS = ('table', 'jsonl', 'csv')
+VIEW_PAGE_SIZE = 1000
+
+class CliError(Exception):
+    pass
+
+class CliSession:
+    # Shared by every command of one run, so piped `batch` input reuses a single connection.
+    def __init__(self, output_format='table', output_stream=None):
+        self.output_format = output_format
+        self.output_stream = output_stream or sys.stdout
+        self.connect_seconds = None
+        self._connection = None
+
+    @property
+    def console(self):
+        import Console
+        return Console
+
+    def connection(self):
+        if self._connection is None:
+            import pymysql
+            connect_started_at = time.perf_counter()
+            self._connection = pymysql.connect(**self.console.DB_CONFIG)
+            self.connect_seconds = time.perf_counter() - connect_started_at
+        return self._connection
+
+    def rollback(self):
+        # After a failed command, so nothing it left open is committed by the next one.
+        if self._connection is not None:
+            import pymysql
+            try:
+                self._connection.rollback()
+            except pymysql.Error:
+                pass
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+def emit_rows(session, row_batches, output_format=None):
+    # jsonl and csv stream batch by batch; the table format needs every row for its column widths.
+    output_format = output_format or session.output_format
+    output_stream = session.output_stream
+    if output_format == 'table':
+        session.console.display_results_as_table([row for row_batch in row_batches for row in row_batch])
+        return
+    if output_format == 'jsonl':
+        import json
+        for row_batch in row_batches:
+            for row in row_batch:
+                output_stream.write(json.dumps(dict(row), default=str) + "\n")
+        return
+    import csv
+    csv_writer = None
+    for row_batch in row_batches:
+        for row in row_batch:
+            if csv_writer is None:
+                csv_writer = csv.writer(output_stream)
+                csv_writer.writerow(list(row.keys()))
+            csv_writer.writerow(['' if value is None else value for value in row.values()])
+
+def parse_assignments(assignments, option_name="column=value"):
+    # 'NULL' (any case) is SQL NULL, as at the interactive prompts.
+    column_values = {}
+    for assignment in assignments:
+        column_name, separator, value = assignment.partition('=')
+        if not separator or not column_name:
+            raise CliError(f"Expected {option_name}, got '{assignment}'.")
+        column_values[column_name.strip()] = None if value.upper() == 'NULL' else value
+    return column_values
+
+def table_metadata(session, table_name):
+    column_metadata, pk_cols = session.console.SCHEMA_CATALOG.get_columns(session.connection(), table_name)
+    if not column_metadata:
+        raise CliError(f"Table `{table_name}` does not exist.")
+    return column_metadata, pk_cols
+
+def check_columns(table_name, column_metadata, column_names):
+    known_columns = {col_meta['name'] for col_meta in column_metadata}
+    unknown_columns = [column_name for column_name in column_names if column_name not in known_columns]
+    if unknown_columns:
+        raise CliError(f"Unknown column(s) in `{table_name}`: {', '.join(unknown_columns)}.")
+
+def key_values(table_name, pk_cols, key_assignments):
+    key_columns = parse_assignments(key_assignments or (), "--key column=value")
+    if not pk_cols:
+        raise CliError(f"Table `{table_name}` has no primary key; use the sql command instead.")
+    if set(key_columns) != set(pk_cols):
+        raise CliError(f"Give --key for exactly the primary key column(s) of `{table_name}`: {', '.join(pk_cols)}.")
+    return [key_columns[pk_col] for pk_col in pk_cols]
+
+def command_tables(session, args):
+    emit_rows(session, [[{'table': table_name} for table_name in session.console.SCHEMA_CATALOG.table_names(session.connection())]])
+
+def command_view(session, args):
+    _, pk_cols = table_metadata(session, args.table)
+
+    def limited_pages():
+        rows_left = args.limit
+        for page_rows in session.console.iter_table_pages(session.connection(), args.table, pk_cols, VIEW_PAGE_SIZE):
+            if rows_left is not None:
+                page_rows = page_rows[:rows_left]
+                rows_left -= len(page_rows)
+            yield page_rows
+            if rows_left is not None and rows_left <= 0:
+                return
+
+    emit_rows(session, limited_pages())
+
+def command_insert(session, args):
+    column_metadata, _ = table_metadata(session, args.table)
+    column_values = parse_assignments(args.values)
+    if not column_values:
+        raise CliError("Give at least one column=value to insert.")
+    check_columns(args.table, column_metadata, column_values)
+    inserted_row = session.console.insert_row(session.connection(), args.table, column_metadata, column_values)
+    print(f"Inserted 1 row into `{args.table}`: {inserted_row}")
+
+def command_update(session, args):
+    column_metadata, pk_cols = table_metadata(session, args.table)
+    pk_values = key_values(args.table, pk_cols, args.key)
+    new_column_values = parse_assignments(args.values, "--set column=value")
+    check_columns(args.table, column_metadata, new_column_values)
+    rows_affected = session.console.update_row_by_pk(session.connection(), args.table, pk_cols, pk_values, new_column_values)
+    print(f"{rows_affected} row(s) in `{args.table}` updated.")
+
+def command_delete(session, args):
+    _, pk_cols = table_metadata(session, args.table)
+    pk_values = key_values(args.table, pk_cols, args.key)
+    rows_affected = session.console.delete_row_by_pk(session.connection(), args.table, pk_cols, pk_values)
+    print(f"{rows_affected} row(s) deleted from `{args.table}`.")
+
+def command_sql(session, args):
+    Console = session.console
+    connection = session.connection()
+    try:
+        with Console.QUERY_PROFILER.profile(connection, args.statement, label='cli SQL') as statement_profile:
+            if Console.is_data_returning_sql(args.statement):
+                with Console.QUERY_GOVERNOR.govern(connection, args.statement) as governed_statement:
+                    query_data = Console.fetch_result_set_profiled(connection, args.statement, statement_profile, governed_statement.max_rows)
+                statement_profile.rows = len(query_data)
+                emit_rows(session, [query_data])
+                if query_data.truncated:
+                    Console.QUERY_GOVERNOR.note_truncated(args.statement, len(query_data))
+                    print(f"Result cut at the governor's row cap of {len(query_data)} row(s).", file=sys.stderr)
+            else:
+                with Console.QUERY_GOVERNOR.govern(connection, args.statement):
+                    affected_rows = Console.execute_custom_write(connection, args.statement, statement_profile)
+                statement_profile.rows = affected_rows
+                print(f"{affected_rows if affected_rows is not None else 'Unknown'} row(s) affected. Commit successful.")
+    except Console.GovernorError as e:
+        connection.rollback()
+        raise CliError(f"Query governor {'stopped' if e.reason == 'timeout' else 'rejected'} the statement ({e.reason}): {e.args[1]}") from e
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        if Console.is_ddl_statement(args.statement):
+            Console.SCHEMA_CATALOG.invalidate()
+            Console.STATEMENT_CACHE.clear()
+            Console.invalidate_cached_results()
+
+def command_query(session, args):
+    Console = session.console
+    unknown_keys = [query_key for query_key in args.numbers if query_key not in Console.YOUR_PROJECT_QUERIES]
+    if unknown_keys:
+        raise CliError(f"Unknown query number(s): {', '.join(unknown_keys)}. Choose from {', '.join(Console.YOUR_PROJECT_QUERIES)}.")
+    for query_key in args.numbers:
+        with Console.QUERY_PROFILER.profile(session.connection(), label=f"Q{query_key}") as statement_profile:
+            query_data, _ = Console.fetch_project_query_rows(session.connection(), query_key, statement_profile)
+            statement_profile.rows = len(query_data)
+        if session.output_format == 'table':
+            print(f"\n-- Q{query_key}: {Console.YOUR_PROJECT_QUERIES[query_key]['description']}")
+        emit_rows(session, [query_data])
+
+def command_export(session, args):
+    from bulk_export import EXPORT_FILE_EXTENSIONS, export_query
+    Console = session.console
+    connection = session.connection()
+    if args.table:
+        table_metadata(session, args.table)
+        export_sql, default_file_stem = f"SELECT * FROM `{args.table}`;", args.table
+    elif args.query:
+        if args.query not in Console.YOUR_PROJECT_QUERIES:
+            raise CliError(f"Unknown query number '{args.query}'.")
+        export_sql, default_file_stem = Console.resolve_project_query_sql(connection, Console.YOUR_PROJECT_QUERIES[args.query]), f"Q{args.query}"
+    else:
+        export_sql, default_file_stem = args.sql, "query"
+    file_format = args.file_format or Console.EXPORT_CONFIG['default_format']
+    output_path = args.output or default_file_stem + EXPORT_FILE_EXTENSIONS.get(file_format, '') + ('.gz' if args.gzip else '')
+    # Only ad-hoc SQL is governed; tables and project queries are the console's own statements.
+    governed = contextlib.nullcontext() if not args.sql else Console.QUERY_GOVERNOR.govern(connection, export_sql)
+    try:
+        with governed as governed_statement:
+            export_summary = export_query(connection, export_sql, output_path, file_format=file_format,
+                                          chunk_size=Console.EXPORT_CONFIG['chunk_size'], compress=args.gzip,
+                                          max_rows=governed_statement.max_rows if governed_statement else None)
+    except Console.GovernorError as e:
+        raise CliError(f"Query governor {'stopped' if e.reason == 'timeout' else 'rejected'} the statement ({e.reason}): {e.args[1]}") from e
+    except (OSError, ValueError, TypeError) as e:
+        raise CliError(f"Export failed: {e}") from None
+    print(f"Exported {export_summary['rows']} row(s) to '{output_path}' in {export_summary['elapsed_seconds']:.2f}s.")
+    if export_summary['truncated']:
+        Console.QUERY_GOVERNOR.note_truncated(export_sql, export_summary['rows'])
+        print(f"Export cut at the governor's row cap of {export_summary['rows']} row(s).", file=sys.stderr)
+
+def command_batch(session, args):
+    # One command per line ('#' starts a comment line), all on this run's connection.
+    parser = build_parser()
+    input_file = sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')
+    failed_count = 0
+    try:
+        for line_number, command_line in enumerate(input_file, 1):
+            if not command_line.strip() or command_line.lstrip().startswith('#'):
+                continue
+            try:
+                line_args = parser.parse_args(shlex.split(command_line))
+            except SystemExit:
+                # argparse has already printed the usage error.
+                print(f"line {line_number}: not run.", file=sys.stderr)
+                line_args = None
+            except ValueError as e:
+                print(f"line {line_number}: {e}", file=sys.stderr)
+                line_args = None
+            if line_args is None or line_args.handler is command_batch:
+                if line_args is not None:
+                    print(f"line {line_number}: batch cannot be nested.", file=sys.stderr)
+                failed_count += 1
+            elif run_command(session, line_args, context=f"line {line_number}"):
+                failed_count += 1
+            if failed_count and args.stop_on_error:
+                break
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+    if failed_count:
+        raise CliError(f"{failed_count} command(s) failed.")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='console_cli.py', description="Scriptable commands for the XYZ Company database.")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="output for rows (default: table)")
+    parser.add_argument('--timing', action='store_true', help="report start-up, connect and command time on stderr")
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    tables_parser = subparsers.add_parser('tables', help="list tables")
+    tables_parser.set_defaults(handler=command_tables)
+
+    view_parser = subparsers.add_parser('view', help="print a table's rows (keyset-paged by primary key)")
+    view_parser.add_argument('table')
+    view_parser.add_argument('--limit', type=int)
+    view_parser.set_defaults(handler=command_view)
+
+    insert_parser = subparsers.add_parser('insert', help="insert one row: insert TABLE col=value ...")
+    insert_parser.add_argument('table')
+    insert_parser.add_argument('values', nargs='*', metavar='column=value')
+    insert_parser.set_defaults(handler=command_insert)
+
+    update_parser = subparsers.add_parser('update', help="update one row by primary key: update TABLE --key pk=value --set col=value ...")
+    update_parser.add_argument('table')
+    update_parser.add_argument('--key', action='append', metavar='pk_column=value', required=True)
+    update_parser.add_argument('--set', action='append', dest='values', metavar='column=value', required=True)
+    update_parser.set_defaults(handler=command_update)
+
+    delete_parser = subparsers.add_parser('delete', help="delete one row by primary key: delete TABLE --key pk=value")
+    delete_parser.add_argument('table')
+    delete_parser.add_argument('--key', action='append', metavar='pk_column=value', required=True)
+    delete_parser.set_defaults(handler=command_delete)
+
+    sql_parser = subparsers.add_parser('sql', help="run one SQL statement (writes are committed)")
+    sql_parser.add_argument('statement')
+    sql_parser.set_defaults(handler=command_sql)
+
+    query_parser = subparsers.add_parser('query', help="run predefined project queries by number")
+    query_parser.add_argument('numbers', nargs='+', metavar='N')
+    query_parser.set_defaults(handler=command_query)
+
+    export_parser = subparsers.add_parser('export', help="stream a table, predefined query or SELECT to a file")
+    export_source = export_parser.add_mutually_exclusive_group(required=True)
+    export_source.add_argument('--table')
+    export_source.add_argument('--query', metavar='N')
+    export_source.add_argument('--sql', metavar='SELECT')
+    export_parser.add_argument('--output', '-o', help="file path (default: <source><extension>)")
+    export_parser.add_argument('--file-format', help="csv, jsonl, ... (default: EXPORT_CONFIG['default_format'])")
+    export_parser.add_argument('--gzip', action='store_true')
+    export_parser.set_defaults(handler=command_export)
+
+    batch_parser = subparsers.add_parser('batch', help="run one command per line from FILE or stdin on one connection")
+    batch_parser.add_argument('file', nargs='?', default='-')
+    batch_parser.add_argument('--stop-on-error', action='store_true')
+    batch_parser.set_defaults(handler=command_batch)
+    return parser
+
+def run_command(session, args, context=None):
+    # Returns 0 on success, 1 when the command failed (the error is reported on stderr).
+    import pymysql
+    error_prefix = f"{context}: " if context else ""
+    previous_format = session.output_format
+    session.output_format = args.format or previous_format
+    try:
+        args.handler(session, args)
+        return 0
+    except CliError as e:
+        session.rollback()
+        print(f"{error_prefix}{e}", file=sys.stderr)
+    except pymysql.Error as e:
+        session.rollback()
+        error_code = e.args[0] if e.args else None
+        print(f"{error_prefix}MySQL error {error_code}: {e.args[1] if len(e.args) > 1 else e}", file=sys.stderr)
+    finally:
+        session.output_format = previous_format
+    return 1
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    parsed_at = time.perf_counter()
+    session = CliSession(output_format=args.format or 'table')
+    try:
+        exit_code = run_command(session, args)
+    except BrokenPipeError:
+        # `... | head` closed the pipe: stop quietly, and keep the interpreter's final flush off it.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        exit_code = 0
+    finally:
+        session.close()
+    if args.timing:
+        connect_note = f", connect {session.connect_seconds * 1000:.1f} ms" if session.connect_seconds is not None else ", no connection"
+        print(f"start-up {(parsed_at - STARTED_AT) * 1000:.1f} ms{connect_note}, "
+              f"total {(time.perf_counter() - STARTED_AT) * 1000:.1f} ms", file=sys.stderr)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
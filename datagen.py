@@ -0,0 +1,221 @@
+import datetime
+import itertools
+import random
+import time
+
+# Tables in foreign-key order; every table only references tables listed before it.
+TABLE_LOAD_ORDER = [
+    'Person', 'Phone', 'Employee', 'Customer', 'Potential_Employee', 'Department', 'Job_Position',
+    'Job_Application', 'Interview', 'Interviewer', 'Interview_Interviewer', 'Employee_Department',
+    'Performance_Review', 'Employee_Salary', 'Marketing_Site', 'Employee_Marketing_Site', 'Product',
+    'Part', 'Product_Part', 'Vendor', 'Vendor_Part', 'Sales_History', 'Sale_Product'
+]
+
+# Share of the requested total row count given to each table.
+TABLE_ROW_SHARES = {
+    'Person': 0.08, 'Phone': 0.08, 'Employee': 0.01, 'Customer': 0.05, 'Potential_Employee': 0.01,
+    'Department': 0.00002, 'Job_Position': 0.002, 'Job_Application': 0.04, 'Interview': 0.11,
+    'Interviewer': 0.002, 'Interview_Interviewer': 0.11, 'Employee_Department': 0.015,
+    'Performance_Review': 0.02, 'Employee_Salary': 0.12, 'Marketing_Site': 0.0001,
+    'Employee_Marketing_Site': 0.005, 'Product': 0.001, 'Part': 0.0005, 'Product_Part': 0.003,
+    'Vendor': 0.0002, 'Vendor_Part': 0.001, 'Sales_History': 0.12, 'Sale_Product': 0.29
+}
+SELF_REFERENCING_COLUMNS = {'Employee': 'supervised_by', 'Customer': 'referred_by'}
+MINIMUM_TABLE_ROWS = {'Department': 5, 'Marketing_Site': 3, 'Product': 8, 'Part': 6, 'Vendor': 3}
+
+ID_BASE = 1000000
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'Dan', 'Ethan', 'Fatima', 'Grace', 'Hellen', 'Ivan', 'Jia', 'Kofi', 'Lena', 'Mateo', 'Nina', 'Omar', 'Priya']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Davis', 'Brown', 'Cole', 'Nguyen', 'Garcia', 'Khan', 'Okafor', 'Rossi', 'Silva', 'Tanaka', 'Weber']
+CITIES = [('New York', 'NY', '10001'), ('Chicago', 'IL', '60616'), ('Dallas', 'TX', '75201'), ('Miami', 'FL', '33101'), ('Seattle', 'WA', '98101'), ('Los Angeles', 'CA', '90001')]
+DEPARTMENT_NAMES = ['IT', 'Sales', 'Marketing', 'Finance', 'HR', 'Operations', 'Support', 'Research', 'Legal', 'Design']
+GRADES = ['A+', 'A', 'A', 'B+', 'B', 'B', 'C+', 'C', 'D', '85', '72', '64']
+PRODUCT_TYPES = ['Shirt', 'Pants', 'Jacket', 'Hat', 'Shoes', 'Scarf', 'Gloves', 'Socks', 'Dress', 'Coat']
+PART_TYPES = ['Button', 'Zipper', 'Cloth Panel', 'Cup', 'Lace', 'Sole', 'Thread', 'Lining']
+START_DATE = datetime.date(2010, 1, 1)
+DATE_SPAN_DAYS = 15 * 365
+
+def plan_row_counts(total_rows):
+    row_counts = {}
+    for table_name in TABLE_LOAD_ORDER:
+        row_counts[table_name] = max(int(total_rows * TABLE_ROW_SHARES[table_name]), MINIMUM_TABLE_ROWS.get(table_name, 1))
+    # Link tables are capped by the number of distinct key pairs available.
+    row_counts['Employee_Department'] = min(row_counts['Employee_Department'], row_counts['Employee'] * row_counts['Department'])
+    row_counts['Employee_Marketing_Site'] = min(row_counts['Employee_Marketing_Site'], row_counts['Employee'] * row_counts['Marketing_Site'])
+    row_counts['Product_Part'] = min(row_counts['Product_Part'], row_counts['Product'] * row_counts['Part'])
+    row_counts['Vendor_Part'] = min(row_counts['Vendor_Part'], row_counts['Vendor'] * row_counts['Part'])
+    row_counts['Sale_Product'] = min(row_counts['Sale_Product'], row_counts['Sales_History'] * row_counts['Product'])
+    row_counts['Interviewer'] = min(row_counts['Interviewer'], row_counts['Employee'])
+    row_counts['Interview_Interviewer'] = min(row_counts['Interview_Interviewer'], row_counts['Interview'])
+    row_counts['Phone'] = max(row_counts['Phone'], 1)
+    return row_counts
+
+def random_date(rng):
+    return START_DATE + datetime.timedelta(days=rng.randrange(DATE_SPAN_DAYS))
+
+def generate_table_rows(table_name, row_counts, rng):
+    n = row_counts
+    if table_name == 'Person':
+        for i in range(n['Person']):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            city, state, zipcode = rng.choice(CITIES)
+            yield {'person_id': ID_BASE + i, 'name': f"{first_name} {last_name}", 'firstname': first_name, 'lastname': last_name,
+                   'age': rng.randint(18, 70), 'gender': rng.choice(('Female', 'Male')), 'address1': f"{rng.randint(1, 9999)} Main St",
+                   'address2': '', 'city': city, 'state': state, 'zipcode': zipcode,
+                   'email': f"{first_name.lower()}.{last_name.lower()}.{i}@example.com"}
+    elif table_name == 'Phone':
+        for i in range(n['Phone']):
+            yield {'person_id': ID_BASE + i % n['Person'], 'phone_number': f"555-{i:08d}"}
+    elif table_name == 'Employee':
+        top_level_count = max(1, n['Employee'] // 20)
+        for i in range(n['Employee']):
+            start_date = random_date(rng)
+            yield {'employee_id': ID_BASE + i, 'person_id': ID_BASE + rng.randrange(n['Person']), 'start_date': start_date,
+                   'end_date': start_date + datetime.timedelta(days=rng.randint(30, 2000)) if rng.random() < 0.1 else None,
+                   'supervised_by': None if i < top_level_count else ID_BASE + rng.randrange(i)}
+    elif table_name == 'Customer':
+        for i in range(n['Customer']):
+            yield {'customer_id': ID_BASE + i, 'person_id': ID_BASE + rng.randrange(n['Person']),
+                   'referred_by': ID_BASE + rng.randrange(i) if i and rng.random() < 0.7 else None}
+    elif table_name == 'Potential_Employee':
+        for i in range(n['Potential_Employee']):
+            yield {'potential_employee_id': ID_BASE + i, 'person_id': ID_BASE + rng.randrange(n['Person'])}
+    elif table_name == 'Department':
+        for i in range(n['Department']):
+            yield {'departmentID': ID_BASE + i, 'name': DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)] + ('' if i < len(DEPARTMENT_NAMES) else f" {i}")}
+    elif table_name == 'Job_Position':
+        for i in range(n['Job_Position']):
+            yield {'jobID': ID_BASE + i, 'description': f"Synthetic position {i}", 'postedDate': random_date(rng),
+                   'departmentID': ID_BASE + rng.randrange(n['Department'])}
+    elif table_name == 'Job_Application':
+        for i in range(n['Job_Application']):
+            yield {'applicationID': ID_BASE + i, 'jobID': ID_BASE + rng.randrange(n['Job_Position']),
+                   'person_id': ID_BASE + rng.randrange(n['Person']), 'description': 'Applied via portal'}
+    elif table_name == 'Interview':
+        for i in range(n['Interview']):
+            yield {'interviewID': ID_BASE + i, 'applicationID': ID_BASE + rng.randrange(n['Job_Application']),
+                   'grade': rng.choice(GRADES),
+                   'date_time': datetime.datetime.combine(random_date(rng), datetime.time(rng.randint(8, 17)))}
+    elif table_name == 'Interviewer':
+        for i in range(n['Interviewer']):
+            yield {'interviewer_id': ID_BASE + i, 'employee_id': ID_BASE + i}
+    elif table_name == 'Interview_Interviewer':
+        for i in range(n['Interview_Interviewer']):
+            yield {'interview_id': ID_BASE + i, 'interviewer_id': ID_BASE + rng.randrange(n['Interviewer'])}
+    elif table_name == 'Employee_Department':
+        for i in range(n['Employee_Department']):
+            start_date = random_date(rng)
+            yield {'employee_id': ID_BASE + i % n['Employee'], 'departmentID': ID_BASE + (i // n['Employee']) % n['Department'],
+                   'start_date': start_date, 'end_date': None}
+    elif table_name == 'Performance_Review':
+        for i in range(n['Performance_Review']):
+            yield {'reviewID': ID_BASE + i, 'employee_id': ID_BASE + rng.randrange(n['Employee']),
+                   'reviewDate': random_date(rng), 'score': rng.randint(40, 100)}
+    elif table_name == 'Employee_Salary':
+        for i in range(n['Employee_Salary']):
+            yield {'transaction_number': ID_BASE + i, 'employee_id': ID_BASE + i % n['Employee'],
+                   'payDate': random_date(rng), 'amount': round(rng.uniform(2500, 12000), 2)}
+    elif table_name == 'Marketing_Site':
+        for i in range(n['Marketing_Site']):
+            yield {'siteID': ID_BASE + i, 'name': f"Site {i}", 'location': rng.choice(CITIES)[0]}
+    elif table_name == 'Employee_Marketing_Site':
+        for i in range(n['Employee_Marketing_Site']):
+            yield {'employee_id': ID_BASE + i % n['Employee'], 'siteID': ID_BASE + (i // n['Employee']) % n['Marketing_Site']}
+    elif table_name == 'Product':
+        for i in range(n['Product']):
+            yield {'product_id': ID_BASE + i, 'productType': PRODUCT_TYPES[i % len(PRODUCT_TYPES)],
+                   'size': rng.choice(('S', 'M', 'L', 'XL')), 'weight': round(rng.uniform(0.1, 5.0), 2),
+                   'style': rng.choice(('Casual', 'Formal', 'Winter', 'Sport')), 'listPrice': round(rng.uniform(10, 400), 2)}
+    elif table_name == 'Part':
+        for i in range(n['Part']):
+            yield {'part_id': ID_BASE + i, 'partType': PART_TYPES[i % len(PART_TYPES)],
+                   'price': round(rng.uniform(0.05, 20.0), 2), 'weight': round(rng.uniform(0.1, 8.0), 2)}
+    elif table_name == 'Product_Part':
+        for i in range(n['Product_Part']):
+            yield {'product_id': ID_BASE + i % n['Product'], 'part_id': ID_BASE + (i // n['Product']) % n['Part'],
+                   'quantity': rng.randint(1, 10)}
+    elif table_name == 'Vendor':
+        for i in range(n['Vendor']):
+            yield {'vendorID': ID_BASE + i, 'name': f"Vendor {i}", 'address': f"{rng.randint(1, 999)} Supply Rd",
+                   'accountNumber': f"ACC{i:07d}", 'creditRating': rng.randint(1, 5), 'webURL': f"http://vendor{i}.example.com"}
+    elif table_name == 'Vendor_Part':
+        for i in range(n['Vendor_Part']):
+            yield {'vendorID': ID_BASE + i % n['Vendor'], 'part_id': ID_BASE + (i // n['Vendor']) % n['Part']}
+    elif table_name == 'Sales_History':
+        for i in range(n['Sales_History']):
+            yield {'sale_id': ID_BASE + i, 'customer_id': ID_BASE + rng.randrange(n['Customer']),
+                   'employee_id': ID_BASE + rng.randrange(n['Employee']), 'sale_date': random_date(rng),
+                   'total_amount': round(rng.uniform(10, 2000), 2), 'siteID': ID_BASE + rng.randrange(n['Marketing_Site'])}
+    elif table_name == 'Sale_Product':
+        for i in range(n['Sale_Product']):
+            sale_index = i % n['Sales_History']
+            # Distinct products per sale: the j-th item of a sale is offset by j from a per-sale start.
+            product_index = (i // n['Sales_History'] + sale_index * 7) % n['Product']
+            yield {'sale_id': ID_BASE + sale_index, 'product_id': ID_BASE + product_index,
+                   'quantity': rng.randint(1, 5), 'unitPrice': round(rng.uniform(5, 450), 2)}
+    else:
+        raise ValueError(f"No synthetic data generator for table '{table_name}'")
+
+def insert_rows_in_batches(connection, table_name, column_names, row_iter, batch_size):
+    column_list_sql = ", ".join(f"`{column_name}`" for column_name in column_names)
+    placeholders = ", ".join(['%s'] * len(column_names))
+    sql_insert_query = f"INSERT INTO `{table_name}` ({column_list_sql}) VALUES ({placeholders})"
+    inserted_count = 0
+    batch_values = []
+    with connection.cursor() as cursor:
+        for row_values in row_iter:
+            batch_values.append(tuple(row_values.get(column_name) for column_name in column_names))
+            if len(batch_values) >= batch_size:
+                cursor.executemany(sql_insert_query, batch_values)
+                connection.commit()
+                inserted_count += len(batch_values)
+                batch_values = []
+        if batch_values:
+            cursor.executemany(sql_insert_query, batch_values)
+            connection.commit()
+            inserted_count += len(batch_values)
+    return inserted_count
+
+def load_synthetic_data(connection, total_rows, table_columns, seed=42, batch_size=2000, progress_callback=None):
+    rng = random.Random(seed)
+    row_counts = plan_row_counts(total_rows)
+    load_summary = {'row_counts': row_counts, 'tables': {}}
+    started_at = time.perf_counter()
+    for table_name in TABLE_LOAD_ORDER:
+        if table_name not in table_columns:
+            continue
+        table_started_at = time.perf_counter()
+        row_iter = generate_table_rows(table_name, row_counts, rng)
+        first_row = next(row_iter, None)
+        if first_row is None:
+            continue
+        # Only fill columns the live table has; the project queries assume a few optional ones.
+        column_names = [column_name for column_name in table_columns[table_name] if column_name in first_row]
+        inserted_count = insert_rows_in_batches(connection, table_name, column_names,
+                                                itertools.chain([first_row], row_iter), batch_size)
+        table_seconds = time.perf_counter() - table_started_at
+        load_summary['tables'][table_name] = {'rows': inserted_count, 'seconds': table_seconds}
+        if progress_callback:
+            progress_callback(table_name, inserted_count, table_seconds)
+    load_summary['rows'] = sum(table_summary['rows'] for table_summary in load_summary['tables'].values())
+    load_summary['seconds'] = time.perf_counter() - started_at
+    load_summary['rows_per_second'] = load_summary['rows'] / load_summary['seconds'] if load_summary['seconds'] > 0 else 0.0
+    return load_summary
+
+def delete_synthetic_data(connection, table_columns, chunk_size=50000):
+    deleted_count = 0
+    with connection.cursor() as cursor:
+        for table_name in reversed(TABLE_LOAD_ORDER):
+            if table_name not in table_columns:
+                continue
+            # Synthetic rows are recognised by ids at or above ID_BASE in the table's first column.
+            first_key_column = table_columns[table_name][0]
+            if table_name in SELF_REFERENCING_COLUMNS:
+                cursor.execute(f"UPDATE `{table_name}` SET `{SELF_REFERENCING_COLUMNS[table_name]}` = NULL WHERE `{first_key_column}` >= %s;", (ID_BASE,))
+                connection.commit()
+            while True:
+                chunk_deleted = cursor.execute(f"DELETE FROM `{table_name}` WHERE `{first_key_column}` >= %s LIMIT {int(chunk_size)};", (ID_BASE,))
+                connection.commit()
+                deleted_count += chunk_deleted
+                if chunk_deleted < chunk_size:
+                    break
+    return deleted_count
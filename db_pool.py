@@ -0,0 +1,177 @@
+import contextlib
+import re
+import threading
+import time
+
+import pymysql
+
+SESSION_VARIABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    pass
+
+class ConnectionPool:
+    def __init__(self, db_config, min_size=1, max_size=5, session_settings=None, checkout_timeout=30.0,
+                 connect_retries=5, backoff_base=0.5, backoff_max=8.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        for setting_name in (session_settings or {}):
+            if not SESSION_VARIABLE_NAME.match(setting_name):
+                raise ValueError(f"Invalid session variable name: {setting_name!r}")
+
+        self.db_config = dict(db_config)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.session_settings = dict(session_settings or {})
+        self.checkout_timeout = checkout_timeout
+        self.connect_retries = connect_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._idle_connections = []
+        self._open_count = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.stats = {'checkouts': 0, 'connects': 0, 'reconnects': 0, 'failed_pings': 0, 'discarded': 0, 'waits': 0}
+
+    def open(self):
+        for _ in range(self.min_size):
+            with self._condition:
+                self._open_count += 1
+            try:
+                new_conn = self._connect()
+            except pymysql.Error:
+                with self._condition:
+                    self._open_count -= 1
+                raise
+            with self._condition:
+                self._idle_connections.append(new_conn)
+        return self
+
+    def _connect(self):
+        last_error = None
+        for attempt in range(self.connect_retries + 1):
+            if attempt:
+                time.sleep(min(self.backoff_base * (2 ** (attempt - 1)), self.backoff_max))
+            try:
+                new_conn = pymysql.connect(**self.db_config)
+            except pymysql.err.OperationalError as e:
+                last_error = e
+                continue
+            try:
+                self._apply_session_settings(new_conn)
+            except pymysql.Error:
+                new_conn.close()
+                raise
+            with self._condition:
+                self.stats['connects'] += 1
+            return new_conn
+        raise last_error
+
+    def _apply_session_settings(self, conn):
+        if not self.session_settings:
+            return
+        with conn.cursor() as cursor:
+            for setting_name, setting_value in self.session_settings.items():
+                cursor.execute(f"SET SESSION {setting_name} = %s;", (setting_value,))
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except pymysql.Error:
+            with self._condition:
+                self.stats['failed_pings'] += 1
+            return False
+
+    def acquire(self, timeout=None):
+        wait_timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + wait_timeout
+        pooled_conn = None
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("POOL", "Connection pool has been closed.")
+                if self._idle_connections:
+                    pooled_conn = self._idle_connections.pop()
+                    break
+                if self._open_count < self.max_size:
+                    self._open_count += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError("POOL", f"No database connection became available within {wait_timeout:.1f}s (pool size {self.max_size}).")
+                self.stats['waits'] += 1
+                self._condition.wait(remaining)
+            self.stats['checkouts'] += 1
+
+        if pooled_conn is not None and self._is_healthy(pooled_conn):
+            return pooled_conn
+
+        if pooled_conn is not None:
+            self._close_quietly(pooled_conn)
+            with self._condition:
+                self.stats['reconnects'] += 1
+        try:
+            return self._connect()
+        except Exception:
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        if not discard:
+            try:
+                # End any open read snapshot so the next borrower sees fresh data.
+                conn.rollback()
+            except pymysql.Error:
+                discard = True
+
+        with self._condition:
+            if discard or self._closed:
+                self._open_count -= 1
+                self.stats['discarded'] += 1 if discard else 0
+            else:
+                self._idle_connections.append(conn)
+            self._condition.notify()
+
+        if discard or self._closed:
+            self._close_quietly(conn)
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle_connections = self._idle_connections
+            self._idle_connections = []
+            self._open_count -= len(idle_connections)
+            self._condition.notify_all()
+        for conn in idle_connections:
+            self._close_quietly(conn)
+
+    def size(self):
+        with self._condition:
+            return {'open': self._open_count, 'idle': len(self._idle_connections),
+                    'in_use': self._open_count - len(self._idle_connections), 'max': self.max_size}
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
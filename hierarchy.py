@@ -0,0 +1,206 @@
+import collections
+import threading
+import time
+
+# Self-referencing trees in the schema. Aggregates roll a per-node figure up over a subtree.
+HIERARCHIES = {
+    'employee': {
+        'table': 'Employee',
+        'id_column': 'employee_id',
+        'parent_column': 'supervised_by',
+        'person_column': 'person_id',
+        'aggregates': {
+            'sales_total': ('Sales_History', 'employee_id', 'SUM(total_amount)'),
+            'sale_count': ('Sales_History', 'employee_id', 'COUNT(*)')
+        }
+    },
+    'customer': {
+        'table': 'Customer',
+        'id_column': 'customer_id',
+        'parent_column': 'referred_by',
+        'person_column': 'person_id',
+        'aggregates': {
+            'sales_total': ('Sales_History', 'customer_id', 'SUM(total_amount)'),
+            'sale_count': ('Sales_History', 'customer_id', 'COUNT(*)')
+        }
+    }
+}
+
+AGGREGATE_CHUNK_SIZE = 1000
+
+# Server-side walk of the live table (MySQL 8.0+), used to cross-check the adjacency cache. The
+# depth bound also stops a supervision cycle from recursing until cte_max_recursion_depth.
+DESCENDANTS_CTE_SQL = """
+    WITH RECURSIVE subtree (node_id, depth) AS (
+        SELECT `{id_column}`, 0 FROM `{table}` WHERE `{id_column}` = %s
+        UNION ALL
+        SELECT child.`{id_column}`, subtree.depth + 1
+        FROM `{table}` child
+        JOIN subtree ON child.`{parent_column}` = subtree.node_id
+        WHERE subtree.depth < %s
+    )
+    SELECT node_id, MIN(depth) AS depth FROM subtree GROUP BY node_id ORDER BY depth, node_id;
+"""
+
+class HierarchyError(ValueError):
+    pass
+
+def hierarchy_info(hierarchy_name):
+    info = HIERARCHIES.get(hierarchy_name)
+    if info is None:
+        raise HierarchyError(f"Unknown hierarchy '{hierarchy_name}'. Choose one of: {', '.join(HIERARCHIES)}")
+    return info
+
+class Hierarchy:
+    def __init__(self, parent_by_id):
+        self.parent_by_id = parent_by_id
+        self.children_by_id = collections.defaultdict(list)
+        for node_id, parent_id in parent_by_id.items():
+            if parent_id is not None:
+                self.children_by_id[parent_id].append(node_id)
+        for child_ids in self.children_by_id.values():
+            child_ids.sort()
+        self.loaded_at = time.monotonic()
+
+    def __contains__(self, node_id):
+        return node_id in self.parent_by_id
+
+    def roots(self):
+        # Nodes without a parent, or whose parent row no longer exists.
+        return sorted(node_id for node_id, parent_id in self.parent_by_id.items() if parent_id is None or parent_id not in self.parent_by_id)
+
+    def children(self, node_id):
+        return self.children_by_id.get(node_id, [])
+
+    def descendants(self, root_id, max_depth=None, include_root=False):
+        # Depth-first in tree order, so the (node_id, depth) list prints as an indented tree.
+        # Visits only the subtree; the visited set keeps a cycle from looping forever.
+        if root_id not in self.parent_by_id:
+            raise HierarchyError(f"No node with id {root_id}.")
+        subtree_nodes = [(root_id, 0)] if include_root else []
+        visited = {root_id}
+        pending = [(child_id, 1) for child_id in reversed(self.children(root_id))]
+        while pending:
+            node_id, depth = pending.pop()
+            if node_id in visited:
+                continue
+            visited.add(node_id)
+            subtree_nodes.append((node_id, depth))
+            if max_depth is None or depth < max_depth:
+                pending.extend((child_id, depth + 1) for child_id in reversed(self.children(node_id)))
+        return subtree_nodes
+
+    def ancestors(self, node_id):
+        # Chain from the direct parent up to the root as (node_id, distance) pairs.
+        if node_id not in self.parent_by_id:
+            raise HierarchyError(f"No node with id {node_id}.")
+        chain = []
+        visited = {node_id}
+        parent_id = self.parent_by_id[node_id]
+        while parent_id is not None and parent_id in self.parent_by_id:
+            if parent_id in visited:
+                raise HierarchyError(f"Node {node_id} is part of a cycle through {parent_id}.")
+            visited.add(parent_id)
+            chain.append((parent_id, len(chain) + 1))
+            parent_id = self.parent_by_id[parent_id]
+        return chain
+
+    def depth(self, node_id):
+        return len(self.ancestors(node_id))
+
+    def summary(self):
+        return {'nodes': len(self.parent_by_id), 'roots': len(self.roots()), 'parents': len(self.children_by_id)}
+
+def load_hierarchy(connection, hierarchy_name):
+    # One query for the whole tree; every later question is answered from memory.
+    info = hierarchy_info(hierarchy_name)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT `{info['id_column']}` AS node_id, `{info['parent_column']}` AS parent_id FROM `{info['table']}`;")
+        return Hierarchy({tree_row['node_id']: tree_row['parent_id'] for tree_row in cursor.fetchall()})
+
+def fetch_descendants_recursive(connection, hierarchy_name, root_id, max_depth=100):
+    info = hierarchy_info(hierarchy_name)
+    with connection.cursor() as cursor:
+        cursor.execute(DESCENDANTS_CTE_SQL.format(**info), (root_id, max_depth))
+        return [(tree_row['node_id'], tree_row['depth']) for tree_row in cursor.fetchall() if tree_row['node_id'] != root_id]
+
+def fetch_node_aggregates(connection, hierarchy_name, aggregate_name, node_ids):
+    # Per-node figures for just the given nodes, grouped on the server in IN-list chunks.
+    info = hierarchy_info(hierarchy_name)
+    if aggregate_name not in info['aggregates']:
+        raise HierarchyError(f"Unknown aggregate '{aggregate_name}'. Choose one of: {', '.join(info['aggregates'])}")
+    source_table, key_column, aggregate_sql = info['aggregates'][aggregate_name]
+    node_ids = sorted(set(node_ids))
+    node_values = {}
+    with connection.cursor() as cursor:
+        for chunk_start in range(0, len(node_ids), AGGREGATE_CHUNK_SIZE):
+            id_chunk = node_ids[chunk_start:chunk_start + AGGREGATE_CHUNK_SIZE]
+            cursor.execute(
+                f"SELECT `{key_column}` AS node_id, {aggregate_sql} AS node_value FROM `{source_table}` "
+                f"WHERE `{key_column}` IN ({', '.join(['%s'] * len(id_chunk))}) GROUP BY `{key_column}`;",
+                tuple(id_chunk)
+            )
+            node_values.update((aggregate_row['node_id'], aggregate_row['node_value']) for aggregate_row in cursor.fetchall())
+    return node_values
+
+def fetch_node_names(connection, hierarchy_name, node_ids):
+    info = hierarchy_info(hierarchy_name)
+    node_ids = sorted(set(node_ids))
+    if not node_ids:
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT t.`{info['id_column']}` AS node_id, p.name AS node_name FROM `{info['table']}` t "
+            f"JOIN Person p ON p.person_id = t.`{info['person_column']}` "
+            f"WHERE t.`{info['id_column']}` IN ({', '.join(['%s'] * len(node_ids))});",
+            tuple(node_ids)
+        )
+        return {name_row['node_id']: name_row['node_name'] for name_row in cursor.fetchall()}
+
+def subtree_aggregate(connection, hierarchy, hierarchy_name, aggregate_name, root_id):
+    # Rolls the aggregate up the subtree: every node's total includes everything beneath it.
+    subtree_nodes = hierarchy.descendants(root_id, include_root=True)
+    node_values = fetch_node_aggregates(connection, hierarchy_name, aggregate_name, [node_id for node_id, _ in subtree_nodes])
+    rolled_up = {}
+    for node_id, _ in reversed(subtree_nodes):
+        rolled_up[node_id] = (node_values.get(node_id) or 0) + sum(rolled_up.get(child_id, 0) for child_id in hierarchy.children(node_id))
+    return {'root': root_id, 'nodes': len(subtree_nodes), 'own': node_values.get(root_id) or 0,
+            'total': rolled_up[root_id], 'by_child': {child_id: rolled_up.get(child_id, 0) for child_id in hierarchy.children(root_id)}}
+
+class HierarchyCache:
+    def __init__(self, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        self._hierarchies = {}
+        # Bumped on invalidation; a load that overlapped a write is returned but not kept.
+        self._generations = collections.Counter()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loads': 0, 'invalidations': 0}
+
+    def get(self, connection, hierarchy_name):
+        with self._lock:
+            hierarchy = self._hierarchies.get(hierarchy_name)
+            if hierarchy is not None and (time.monotonic() - hierarchy.loaded_at) < self.ttl_seconds:
+                self.stats['hits'] += 1
+                return hierarchy
+            load_generation = self._generations[hierarchy_name]
+        hierarchy = load_hierarchy(connection, hierarchy_name)
+        with self._lock:
+            if self._generations[hierarchy_name] == load_generation:
+                self._hierarchies[hierarchy_name] = hierarchy
+            self.stats['loads'] += 1
+        return hierarchy
+
+    def invalidate_tables(self, table_names):
+        with self._lock:
+            for hierarchy_name, info in HIERARCHIES.items():
+                if info['table'] not in table_names:
+                    continue
+                self._generations[hierarchy_name] += 1
+                if self._hierarchies.pop(hierarchy_name, None) is not None:
+                    self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self.stats['invalidations'] += len(self._hierarchies)
+            self._generations.update(HIERARCHIES.keys())
+            self._hierarchies.clear()
@@ -0,0 +1,218 @@
+import datetime
+import json
+import re
+
+# A curated list, written from reading YOUR_PROJECT_QUERIES; EXPLAIN does not produce it. The
+# advisor emits the entries no existing index covers yet and notes which of their queries still
+# scan the index's table, so the plan output shows whether an entry is still earning its keep.
+PROJECT_INDEX_RECOMMENDATIONS = [
+    {'name': 'idx_interview_application_grade', 'table': 'Interview', 'columns': ['applicationID', 'grade'],
+     'queries': ['1', '5', '12', '13'], 'reason': 'join from Job_Application and grade aggregation without touching rows'},
+    {'name': 'idx_job_application_job_person', 'table': 'Job_Application', 'columns': ['jobID', 'person_id'],
+     'queries': ['5', '8'], 'reason': 'jobID filter/grouping with the applicant available from the index'},
+    {'name': 'idx_job_application_person_job', 'table': 'Job_Application', 'columns': ['person_id', 'jobID'],
+     'queries': ['8', '12', '13'], 'reason': 'applicant lookups by person_id'},
+    {'name': 'idx_job_position_posted_date', 'table': 'Job_Position', 'columns': ['postedDate'],
+     'queries': ['2', '5', '7'], 'reason': 'postedDate range predicates'},
+    {'name': 'idx_sales_history_sale_date', 'table': 'Sales_History', 'columns': ['sale_date'],
+     'queries': ['4'], 'reason': 'sale_date range predicates'},
+    {'name': 'idx_sales_history_employee_sale', 'table': 'Sales_History', 'columns': ['employee_id', 'sale_id'],
+     'queries': ['6'], 'reason': 'per-salesman sale lookups joined to Sale_Product'},
+    {'name': 'idx_sale_product_product_sale', 'table': 'Sale_Product', 'columns': ['product_id', 'sale_id'],
+     'queries': ['6', '9', '10'], 'reason': 'joins from Product to its sales'},
+    {'name': 'idx_product_list_price_type', 'table': 'Product', 'columns': ['listPrice', 'productType'],
+     'queries': ['6'], 'reason': 'listPrice > 200 filter returning productType from the index'},
+    {'name': 'idx_person_name', 'table': 'Person', 'columns': ['name'],
+     'queries': ['1'], 'reason': 'applicant lookup by name'},
+]
+
+# The pre-rewrite text of queries whose date predicates were made sargable, kept so the
+# advisor can record the plan cost of the old form next to the current one.
+LEGACY_DATE_PREDICATE_QUERIES = {
+    '2': """
+        SELECT jp.jobID, jp.description
+        FROM Job_Position jp
+        JOIN Department d ON jp.departmentID = d.departmentID
+        WHERE d.name = 'Marketing'
+          AND MONTH(jp.postedDate) = 1
+          AND YEAR(jp.postedDate) = 2011;
+    """,
+    '4': """
+        SELECT ms.siteID, ms.name AS site_name, ms.location
+        FROM Marketing_Site ms
+        WHERE ms.siteID NOT IN (
+            SELECT DISTINCT sh.siteID
+            FROM Sales_History sh
+            WHERE MONTH(sh.sale_date) = 3 AND YEAR(sh.sale_date) = 2011 AND sh.siteID IS NOT NULL
+        );
+    """
+}
+
+def explain_query(connection, sql_query):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN FORMAT=JSON " + sql_query.strip().rstrip(';'))
+        explain_row = cursor.fetchone()
+    plan_text = list(explain_row.values())[0] if isinstance(explain_row, dict) else explain_row[0]
+    return json.loads(plan_text)
+
+def summarize_plan(plan):
+    plan_summary = {'query_cost': None, 'full_scans': [], 'using_filesort': False, 'using_temporary': False}
+    cost_info = plan.get('query_block', {}).get('cost_info', {})
+    if 'query_cost' in cost_info:
+        plan_summary['query_cost'] = float(cost_info['query_cost'])
+
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get('using_filesort'):
+                plan_summary['using_filesort'] = True
+            if node.get('using_temporary_table'):
+                plan_summary['using_temporary'] = True
+            table_node = node.get('table')
+            if isinstance(table_node, dict) and table_node.get('access_type') == 'ALL':
+                plan_summary['full_scans'].append({
+                    'table': table_node.get('table_name'),
+                    'rows': table_node.get('rows_examined_per_scan'),
+                    'possible_keys': table_node.get('possible_keys')
+                })
+            for child_node in node.values():
+                walk(child_node)
+        elif isinstance(node, list):
+            for child_node in node:
+                walk(child_node)
+
+    walk(plan)
+    return plan_summary
+
+# Operations that read their whole input before the first row comes out, so a LIMIT does not
+# shorten the scan beneath them.
+BLOCKING_OPERATIONS = ('grouping_operation', 'duplicates_removal', 'windowing', 'union_result')
+
+def limit_stops_scan(query_block):
+    # True when the top query block can stop once the LIMIT's rows are out; an ORDER BY
+    # satisfied by an index streams, one needing a filesort or temporary table does not.
+    for key, child_node in query_block.items():
+        if key in BLOCKING_OPERATIONS:
+            return False
+        if key == 'ordering_operation' and isinstance(child_node, dict):
+            if child_node.get('using_filesort') or child_node.get('using_temporary_table'):
+                return False
+            return limit_stops_scan(child_node)
+    return True
+
+def rows_produced(query_block):
+    # Rows the top query block's join produces: the last table's rows_produced_per_join.
+    node = query_block
+    while isinstance(node.get('ordering_operation'), dict):
+        node = node['ordering_operation']
+    if isinstance(node.get('nested_loop'), list) and node['nested_loop']:
+        node = node['nested_loop'][-1]
+    table_node = node.get('table')
+    return float(table_node.get('rows_produced_per_join') or 0) if isinstance(table_node, dict) else None
+
+def estimate_rows_examined(plan, row_limit=None):
+    # Optimizer estimate of rows read. In a nested loop each table is scanned once per row the
+    # join has produced so far, so a Cartesian join multiplies instead of adding. Subqueries and
+    # derived tables count once each (a dependent subquery is under-counted).
+    # row_limit is the statement's top-level LIMIT (offset + count): when nothing above the join
+    # has to see every row, reading stops after that share of the rows the join would produce.
+    def walk(node, loops=1.0):
+        if isinstance(node, list):
+            return sum(walk(child_node) for child_node in node)
+        if not isinstance(node, dict):
+            return 0.0
+        rows_examined = 0.0
+        for key, child_node in node.items():
+            if key == 'nested_loop' and isinstance(child_node, list):
+                join_loops = 1.0
+                for join_node in child_node:
+                    rows_examined += walk(join_node, join_loops)
+                    table_node = join_node.get('table', {}) if isinstance(join_node, dict) else {}
+                    join_loops = max(float(table_node.get('rows_produced_per_join') or 0), 1.0)
+            elif key == 'table' and isinstance(child_node, dict):
+                rows_examined += loops * float(child_node.get('rows_examined_per_scan') or 0) + walk(child_node)
+            elif isinstance(child_node, (dict, list)):
+                rows_examined += walk(child_node)
+        return rows_examined
+
+    rows_examined = walk(plan)
+    query_block = plan.get('query_block') if isinstance(plan, dict) else None
+    if row_limit is not None and isinstance(query_block, dict) and limit_stops_scan(query_block):
+        produced_rows = rows_produced(query_block)
+        if produced_rows and produced_rows > row_limit:
+            rows_examined *= max(row_limit, 1) / produced_rows
+    return rows_examined
+
+# FROM/JOIN table references with an optional alias; EXPLAIN names tables by their alias.
+TABLE_REFERENCE_PATTERN = re.compile(
+    r"\b(?:FROM|JOIN)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(?!(?:ON|USING|WHERE|JOIN|INNER|LEFT|RIGHT|CROSS|GROUP|ORDER|LIMIT|HAVING|UNION)\b)(\w+)`?)?",
+    re.IGNORECASE
+)
+
+def table_aliases(sql_query):
+    aliases = {}
+    for table_name, alias in TABLE_REFERENCE_PATTERN.findall(sql_query):
+        aliases[alias or table_name] = table_name
+    return aliases
+
+def analyze_queries(connection, project_queries, error_callback=None):
+    analysis = {}
+    for query_key, query_info in project_queries.items():
+        try:
+            analysis[query_key] = summarize_plan(explain_query(connection, query_info['sql']))
+            aliases = table_aliases(query_info['sql'])
+            for scan in analysis[query_key]['full_scans']:
+                scan['base_table'] = aliases.get(scan['table'], scan['table'])
+        except Exception as e:
+            analysis[query_key] = {'error': str(e)}
+            if error_callback:
+                error_callback(query_key, e)
+        if query_key in LEGACY_DATE_PREDICATE_QUERIES and 'error' not in analysis[query_key]:
+            try:
+                legacy_summary = summarize_plan(explain_query(connection, LEGACY_DATE_PREDICATE_QUERIES[query_key]))
+                analysis[query_key]['legacy_query_cost'] = legacy_summary['query_cost']
+            except Exception:
+                analysis[query_key]['legacy_query_cost'] = None
+    return analysis
+
+def index_already_covered(existing_indexes, recommended_columns):
+    for index_info in existing_indexes.values():
+        if index_info['columns'][:len(recommended_columns)] == recommended_columns:
+            return True
+    return False
+
+def missing_recommendations(table_indexes):
+    return [
+        recommendation for recommendation in PROJECT_INDEX_RECOMMENDATIONS
+        if recommendation['table'] in table_indexes
+        and not index_already_covered(table_indexes[recommendation['table']], recommendation['columns'])
+    ]
+
+def render_index_migration(recommendations, analysis=None):
+    migration_lines = [
+        f"-- Written by the index advisor on {datetime.date.today().isoformat()} from its curated list",
+        "-- (index_advisor.PROJECT_INDEX_RECOMMENDATIONS): the entries no existing index covers yet.",
+        ""
+    ]
+    for recommendation in recommendations:
+        # Only queries whose plan scans this index's own table are flagged.
+        flagged_queries = [
+            f"Q{query_key}" for query_key in recommendation['queries']
+            if analysis and any((scan.get('base_table') or '').lower() == recommendation['table'].lower()
+                                for scan in analysis.get(query_key, {}).get('full_scans', ()))
+        ]
+        migration_lines.append(f"-- {recommendation['reason']} (Q{', Q'.join(recommendation['queries'])})")
+        if flagged_queries:
+            migration_lines.append(f"-- Full scans of `{recommendation['table']}` observed in: {', '.join(flagged_queries)}")
+        column_list_sql = ", ".join(f"`{column_name}`" for column_name in recommendation['columns'])
+        migration_lines.append(f"CREATE INDEX `{recommendation['name']}` ON `{recommendation['table']}` ({column_list_sql});")
+        migration_lines.append("")
+    return "\n".join(migration_lines)
+
+def build_report(before_analysis, after_analysis=None, migration_path=None):
+    report = {'generated_at': datetime.datetime.now().isoformat(timespec='seconds'), 'migration': migration_path, 'queries': {}}
+    for query_key, before_summary in before_analysis.items():
+        query_report = {'before': before_summary}
+        if after_analysis is not None:
+            query_report['after'] = after_analysis.get(query_key)
+        report['queries'][query_key] = query_report
+    return report
@@ -0,0 +1,545 @@
+import argparse
+import calendar
+import datetime
+import decimal
+import json
+import os
+import pathlib
+import re
+import sqlite3
+import sys
+import time
+
+import pymysql
+import pymysql.cursors
+
+SNAPSHOT_DEFAULT_PATH = "project_snapshot.sqlite3"
+SNAPSHOT_TABLES_STATE = '_snapshot_tables'
+SNAPSHOT_BUCKETS_STATE = '_snapshot_buckets'
+SNAPSHOT_STATE_SQL = (
+    f'CREATE TABLE IF NOT EXISTS "{SNAPSHOT_TABLES_STATE}" (table_name TEXT PRIMARY KEY, table_type TEXT, '
+    f'signature TEXT, row_count INTEGER, synced_at TEXT)',
+    f'CREATE TABLE IF NOT EXISTS "{SNAPSHOT_BUCKETS_STATE}" (table_name TEXT, bucket INTEGER, row_count INTEGER, '
+    f'checksum INTEGER, PRIMARY KEY (table_name, bucket))'
+)
+INTEGER_TYPE_PREFIXES = ('tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'year', 'bit')
+COPY_CHUNK_SIZE = 5000
+
+# MySQL errors the console already knows how to report.
+READ_ONLY_ERROR_CODE = 1290
+NO_SUCH_TABLE_ERROR_CODE = 1146
+SYNTAX_ERROR_CODE = 1064
+DUPLICATE_ENTRY_ERROR_CODE = 1062
+
+class LocalBackendError(Exception):
+    pass
+
+# The declared type picks the converter, so snapshot DATE/DATETIME/DECIMAL columns come back as
+# the same Python types PyMySQL returns. Values that don't parse are returned as text.
+def _converter(parse_value):
+    def convert(raw_value):
+        text_value = raw_value.decode()
+        try:
+            return parse_value(text_value)
+        except (ValueError, decimal.InvalidOperation):
+            return text_value
+    return convert
+
+sqlite3.register_converter('DATE', _converter(lambda text_value: datetime.date.fromisoformat(text_value[:10])))
+sqlite3.register_converter('DATETIME', _converter(datetime.datetime.fromisoformat))
+sqlite3.register_converter('DECIMAL', _converter(decimal.Decimal))
+
+def sqlite_column_type(mysql_type):
+    type_text = (mysql_type or '').lower()
+    if type_text.startswith(INTEGER_TYPE_PREFIXES):
+        return 'INTEGER'
+    if type_text.startswith(('decimal', 'numeric')):
+        return 'DECIMAL'
+    if type_text.startswith(('float', 'double', 'real')):
+        return 'REAL'
+    if type_text.startswith(('datetime', 'timestamp')):
+        return 'DATETIME'
+    if type_text.startswith('date'):
+        return 'DATE'
+    if 'blob' in type_text or 'binary' in type_text:
+        return 'BLOB'
+    return 'TEXT'
+
+def sqlite_value(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    return value
+
+# --- MySQL dialect -------------------------------------------------------------------------
+
+# Quoted text and comments are copied through untouched; the rewrites below apply to the rest.
+SQL_PROTECTED_PATTERN = re.compile(r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|--[^\n]*|/\*.*?\*/)", re.S)
+INTERVAL_PATTERN = re.compile(r"\bINTERVAL\s+([+-]?\d+)\s+(DAY|WEEK|MONTH|YEAR)\b", re.I)
+CAST_INTEGER_PATTERN = re.compile(r"\bAS\s+(?:UNSIGNED|SIGNED)(?:\s+INTEGER)?\b", re.I)
+CAST_DECIMAL_PATTERN = re.compile(r"\bAS\s+DECIMAL\s*\([^)]*\)", re.I)
+NAMED_PARAM_PATTERN = re.compile(r"%\((\w+)\)s")
+
+def translate_sql(sql_text, has_params=False):
+    # Covers the dialect the reports and console use: INTERVAL arithmetic (DATE_SUB/DATE_ADD are
+    # registered functions), CAST(... AS SIGNED/DECIMAL), '/' that never truncates, and PyMySQL
+    # %s / %(name)s placeholders. Backtick identifiers are accepted by SQLite as they are.
+    translated_parts = []
+    for part_index, sql_part in enumerate(SQL_PROTECTED_PATTERN.split(sql_text)):
+        if part_index % 2:
+            translated_parts.append(sql_part.replace('%%', '%') if has_params and sql_part[0] in "'\"" else sql_part)
+            continue
+        sql_part = INTERVAL_PATTERN.sub(lambda interval_match: f"'{interval_match.group(1)} {interval_match.group(2).lower()}'", sql_part)
+        sql_part = CAST_INTEGER_PATTERN.sub("AS INTEGER", sql_part)
+        sql_part = CAST_DECIMAL_PATTERN.sub("AS REAL", sql_part)
+        sql_part = sql_part.replace('/', '* 1.0 /')
+        if has_params:
+            sql_part = NAMED_PARAM_PATTERN.sub(r":\1", sql_part).replace('%s', '?').replace('%%', '%')
+        translated_parts.append(sql_part)
+    return ''.join(translated_parts).strip().rstrip(';')
+
+def _shift_date(date_value, interval_text, direction):
+    if date_value is None or interval_text is None:
+        return None
+    amount_text, unit = str(interval_text).split()
+    amount = int(amount_text) * direction
+    date_text = str(date_value)
+    has_time = len(date_text) > 10
+    shifted = datetime.datetime.fromisoformat(date_text) if has_time else datetime.date.fromisoformat(date_text)
+    if unit in ('day', 'week'):
+        shifted += datetime.timedelta(days=amount * (7 if unit == 'week' else 1))
+    else:
+        # Month arithmetic clamps to the last day of the month, as MySQL does.
+        month_index = shifted.year * 12 + shifted.month - 1 + amount * (12 if unit == 'year' else 1)
+        year, month = divmod(month_index, 12)
+        shifted = shifted.replace(year=year, month=month + 1, day=min(shifted.day, calendar.monthrange(year, month + 1)[1]))
+    return shifted.isoformat(sep=' ') if has_time else shifted.isoformat()
+
+def _regexp(pattern, value):
+    return None if pattern is None or value is None else int(re.search(pattern, str(value), re.I) is not None)
+
+def _truncate(value, places):
+    if value is None or places is None:
+        return None
+    scale = decimal.Decimal(1).scaleb(-int(places))
+    return float(decimal.Decimal(str(value)).quantize(scale, rounding=decimal.ROUND_DOWN))
+
+MYSQL_FUNCTIONS = (
+    ('LCASE', 1, lambda value: None if value is None else str(value).lower(), True),
+    ('UCASE', 1, lambda value: None if value is None else str(value).upper(), True),
+    ('CURDATE', 0, lambda: datetime.date.today().isoformat(), False),
+    ('NOW', 0, lambda: datetime.datetime.now().replace(microsecond=0).isoformat(sep=' '), False),
+    ('DATE_SUB', 2, lambda date_value, interval_text: _shift_date(date_value, interval_text, -1), True),
+    ('DATE_ADD', 2, lambda date_value, interval_text: _shift_date(date_value, interval_text, 1), True),
+    ('YEAR', 1, lambda date_value: None if date_value is None else int(str(date_value)[:4]), True),
+    ('MONTH', 1, lambda date_value: None if date_value is None else int(str(date_value)[5:7]), True),
+    ('CONCAT', -1, lambda *values: None if None in values else ''.join(str(value) for value in values), True),
+    ('TRUNCATE', 2, _truncate, True),
+    ('REGEXP', 2, _regexp, True)
+)
+
+def register_mysql_functions(sqlite_connection):
+    for function_name, arg_count, function, deterministic in MYSQL_FUNCTIONS:
+        sqlite_connection.create_function(function_name, arg_count, function, deterministic=deterministic)
+
+def _mysql_error(sqlite_error):
+    message = str(sqlite_error)
+    if isinstance(sqlite_error, sqlite3.IntegrityError):
+        return pymysql.err.IntegrityError(DUPLICATE_ENTRY_ERROR_CODE, message)
+    if 'readonly' in message:
+        return pymysql.err.OperationalError(READ_ONLY_ERROR_CODE, "The local snapshot is read-only; writes go to MySQL.")
+    if message.startswith('no such table'):
+        return pymysql.err.ProgrammingError(NO_SUCH_TABLE_ERROR_CODE, message)
+    return pymysql.err.ProgrammingError(SYNTAX_ERROR_CODE, message)
+
+def _bind_params(query_args):
+    if query_args is None:
+        return ()
+    if isinstance(query_args, dict):
+        return {param_name: sqlite_value(value) for param_name, value in query_args.items()}
+    if not isinstance(query_args, (list, tuple)):
+        query_args = (query_args,)
+    return tuple(sqlite_value(value) for value in query_args)
+
+def connect_snapshot(snapshot_path, mode='ro'):
+    # mode: 'ro' for readers, 'rw' to sync an existing file, 'rwc' to create one.
+    if mode != 'rwc' and not os.path.exists(snapshot_path):
+        raise LocalBackendError(f"No snapshot at '{snapshot_path}'. Sync one from MySQL (or build it from Project.sql) first.")
+    sqlite_connection = sqlite3.connect(f"{pathlib.Path(snapshot_path).resolve().as_uri()}?mode={mode}", uri=True,
+                                        detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+    register_mysql_functions(sqlite_connection)
+    return sqlite_connection
+
+# --- PyMySQL-shaped read-only connection ---------------------------------------------------
+
+class LocalCursor:
+    def __init__(self, connection, as_dicts):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self._as_dicts = as_dicts
+        self._column_names = None
+        self._sqlite_cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._sqlite_cursor is not None:
+            self._sqlite_cursor.close()
+            self._sqlite_cursor = None
+
+    def execute(self, query, args=None):
+        self.close()
+        try:
+            self._sqlite_cursor = self.connection.db.execute(translate_sql(query, args is not None), _bind_params(args))
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        self.description = self._sqlite_cursor.description
+        self._column_names = [column_info[0] for column_info in self.description] if self.description else None
+        # Rows are read lazily, like SSCursor: the count of a SELECT isn't known up front.
+        self.rowcount = -1 if self.description else self._sqlite_cursor.rowcount
+        return self.rowcount
+
+    def executemany(self, query, args_seq):
+        return sum(self.execute(query, query_args) or 0 for query_args in args_seq)
+
+    def _wrap(self, sqlite_rows):
+        if self._as_dicts:
+            return [dict(zip(self._column_names, sqlite_row)) for sqlite_row in sqlite_rows]
+        return [tuple(sqlite_row) for sqlite_row in sqlite_rows]
+
+    def fetchone(self):
+        sqlite_row = self._sqlite_cursor.fetchone() if self._sqlite_cursor is not None and self.description else None
+        return None if sqlite_row is None else self._wrap([sqlite_row])[0]
+
+    def fetchmany(self, size=1000):
+        if self._sqlite_cursor is None or not self.description:
+            return []
+        return self._wrap(self._sqlite_cursor.fetchmany(size))
+
+    def fetchall(self):
+        if self._sqlite_cursor is None or not self.description:
+            return []
+        return self._wrap(self._sqlite_cursor.fetchall())
+
+    def fetchall_unbuffered(self):
+        while True:
+            row_chunk = self.fetchmany(COPY_CHUNK_SIZE)
+            if not row_chunk:
+                return
+            yield from row_chunk
+
+    def __iter__(self):
+        return self.fetchall_unbuffered()
+
+class LocalConnection:
+    # Read-only stand-in for a PyMySQL connection over a snapshot file: enough of the API for the
+    # report paths. Dict rows unless a non-dict cursor class is asked for, as with DB_CONFIG.
+    backend_name = 'sqlite'
+
+    def __init__(self, snapshot_path=SNAPSHOT_DEFAULT_PATH):
+        self.snapshot_path = snapshot_path
+        self.db = connect_snapshot(snapshot_path, 'ro')
+
+    def cursor(self, cursor_class=None):
+        return LocalCursor(self, cursor_class is None or issubclass(cursor_class, pymysql.cursors.DictCursorMixin))
+
+    def table_names(self):
+        return sorted(table_row[0] for table_row in self.db.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE '\\_%' ESCAPE '\\'"
+        ))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.db.rollback()
+
+    def ping(self, reconnect=False):
+        pass
+
+    def thread_id(self):
+        return 0
+
+    def get_server_info(self):
+        return f"SQLite {sqlite3.sqlite_version}"
+
+    def close(self):
+        self.db.close()
+
+def is_local_connection(connection):
+    # By attribute rather than isinstance, so it also holds when this module runs as __main__.
+    return getattr(connection, 'backend_name', None) == LocalConnection.backend_name
+
+# --- Snapshot sync from MySQL --------------------------------------------------------------
+
+def quote_name(object_name):
+    return '"' + object_name.replace('"', '""') + '"'
+
+def table_signature(table_entry):
+    return json.dumps([table_entry['table_type'], [[col['name'], col['type']] for col in table_entry['columns']],
+                       table_entry['primary_key']])
+
+def create_table_sql(table_name, table_entry):
+    column_defs = [f"{quote_name(col['name'])} {sqlite_column_type(col['type'])}" for col in table_entry['columns']]
+    if table_entry['primary_key'] and table_entry['table_type'] == 'BASE TABLE':
+        column_defs.append(f"PRIMARY KEY ({', '.join(quote_name(col) for col in table_entry['primary_key'])})")
+    return f"CREATE TABLE {quote_name(table_name)} ({', '.join(column_defs)})"
+
+def bucket_column(table_entry):
+    # Checksum buckets are ranges of an integer leading primary-key column. Tables without one,
+    # and views (copied as tables), are a single bucket.
+    if table_entry['table_type'] != 'BASE TABLE' or not table_entry['primary_key']:
+        return None
+    leading_column = next(col for col in table_entry['columns'] if col['name'] == table_entry['primary_key'][0])
+    return leading_column['name'] if (leading_column['type'] or '').lower().startswith(INTEGER_TYPE_PREFIXES) else None
+
+def remote_bucket_checksums(connection, table_name, column_names, range_column, bucket_size):
+    # Row checksum over every column (ISNULL keeps NULL apart from ''), XORed per bucket.
+    bucket_sql = f"FLOOR(`{range_column}` / {int(bucket_size)})" if range_column else "0"
+    row_text_sql = ", ".join(f"`{column_name}`, ISNULL(`{column_name}`)" for column_name in column_names)
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(f"SELECT {bucket_sql} AS bucket, COUNT(*), BIT_XOR(CRC32(CONCAT_WS('#', {row_text_sql}))) "
+                       f"FROM `{table_name}` GROUP BY bucket;")
+        return {int(bucket): (int(row_count), int(checksum)) for bucket, row_count, checksum in cursor.fetchall_unbuffered()}
+
+def bucket_ranges(buckets):
+    # Contiguous bucket numbers merged into (first, last) runs, one copy query per run.
+    bucket_runs = []
+    for bucket in sorted(buckets):
+        if bucket_runs and bucket == bucket_runs[-1][1] + 1:
+            bucket_runs[-1][1] = bucket
+        else:
+            bucket_runs.append([bucket, bucket])
+    return bucket_runs
+
+def copy_rows(connection, snapshot_db, table_name, column_names, where_sql='', where_params=None, chunk_size=COPY_CHUNK_SIZE):
+    insert_sql = (f"INSERT INTO {quote_name(table_name)} ({', '.join(quote_name(name) for name in column_names)}) "
+                  f"VALUES ({', '.join(['?'] * len(column_names))})")
+    copied_rows = 0
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(f"SELECT {', '.join(f'`{name}`' for name in column_names)} FROM `{table_name}`{where_sql};", where_params)
+        while True:
+            row_chunk = cursor.fetchmany(chunk_size)
+            if not row_chunk:
+                break
+            snapshot_db.executemany(insert_sql, [tuple(sqlite_value(value) for value in source_row) for source_row in row_chunk])
+            copied_rows += len(row_chunk)
+    return copied_rows
+
+def _drop_local_object(snapshot_db, object_name):
+    for (object_type,) in snapshot_db.execute("SELECT type FROM sqlite_master WHERE name = ? AND type IN ('table', 'view')", (object_name,)).fetchall():
+        snapshot_db.execute(f'DROP {object_type.upper()} "{object_name}"')
+
+def sync_table(connection, snapshot_db, table_name, table_entry, full=False, bucket_size=1000):
+    started_at = time.perf_counter()
+    column_names = [col['name'] for col in table_entry['columns']]
+    range_column = bucket_column(table_entry)
+    signature = table_signature(table_entry)
+    state_row = snapshot_db.execute(f'SELECT signature FROM "{SNAPSHOT_TABLES_STATE}" WHERE table_name = ?', (table_name,)).fetchone()
+    rebuild = full or state_row is None or state_row[0] != signature
+
+    # Checksums are read before the rows, inside the same consistent read, so a later change
+    # always shows up as a changed bucket on the next sync.
+    remote_buckets = remote_bucket_checksums(connection, table_name, column_names, range_column, bucket_size)
+    copied_rows = 0
+    if rebuild:
+        _drop_local_object(snapshot_db, table_name)
+        snapshot_db.execute(create_table_sql(table_name, table_entry))
+        snapshot_db.execute(f'DELETE FROM "{SNAPSHOT_BUCKETS_STATE}" WHERE table_name = ?', (table_name,))
+        copied_rows = copy_rows(connection, snapshot_db, table_name, column_names)
+        if table_entry['table_type'] == 'BASE TABLE':
+            for index_name, index_entry in table_entry['indexes'].items():
+                if index_name != 'PRIMARY':
+                    snapshot_db.execute(f"CREATE INDEX {quote_name(f'{table_name}__{index_name}')} ON {quote_name(table_name)} "
+                                        f"({', '.join(quote_name(col) for col in index_entry['columns'])})")
+        changed_buckets = set(remote_buckets)
+    else:
+        local_buckets = {bucket: (row_count, checksum) for bucket, row_count, checksum in snapshot_db.execute(
+            f'SELECT bucket, row_count, checksum FROM "{SNAPSHOT_BUCKETS_STATE}" WHERE table_name = ?', (table_name,)
+        )}
+        changed_buckets = {bucket for bucket in set(remote_buckets) | set(local_buckets) if remote_buckets.get(bucket) != local_buckets.get(bucket)}
+        if range_column is None and changed_buckets:
+            snapshot_db.execute(f'DELETE FROM "{table_name}"')
+            copied_rows = copy_rows(connection, snapshot_db, table_name, column_names)
+        else:
+            for first_bucket, last_bucket in bucket_ranges(changed_buckets):
+                range_params = (first_bucket * bucket_size, (last_bucket + 1) * bucket_size)
+                snapshot_db.execute(f'DELETE FROM "{table_name}" WHERE "{range_column}" >= ? AND "{range_column}" < ?', range_params)
+                copied_rows += copy_rows(connection, snapshot_db, table_name, column_names,
+                                         f" WHERE `{range_column}` >= %s AND `{range_column}` < %s", range_params)
+
+    snapshot_db.executemany(f'DELETE FROM "{SNAPSHOT_BUCKETS_STATE}" WHERE table_name = ? AND bucket = ?',
+                            [(table_name, bucket) for bucket in changed_buckets if bucket not in remote_buckets])
+    snapshot_db.executemany(f'INSERT OR REPLACE INTO "{SNAPSHOT_BUCKETS_STATE}" VALUES (?, ?, ?, ?)',
+                            [(table_name, bucket, *remote_buckets[bucket]) for bucket in changed_buckets if bucket in remote_buckets])
+    snapshot_db.execute(f'INSERT OR REPLACE INTO "{SNAPSHOT_TABLES_STATE}" VALUES (?, ?, ?, ?, ?)',
+                        (table_name, table_entry['table_type'], signature, sum(row_count for row_count, _ in remote_buckets.values()),
+                         datetime.datetime.now().isoformat(sep=' ', timespec='seconds')))
+    snapshot_db.commit()
+    return {'mode': 'full' if rebuild else ('incremental' if changed_buckets else 'unchanged'),
+            'buckets_changed': len(changed_buckets), 'rows_copied': copied_rows, 'seconds': time.perf_counter() - started_at}
+
+def sync_snapshot(connection, snapshot_path, table_entries, full=False, bucket_size=1000, progress_callback=None):
+    # Copies every table and view in table_entries (a SchemaCatalog.load() result) into the
+    # snapshot. Incremental runs re-copy only the key ranges whose checksum changed.
+    snapshot_db = connect_snapshot(snapshot_path, 'rwc')
+    sync_report = {}
+    try:
+        snapshot_db.execute("PRAGMA journal_mode = WAL")
+        snapshot_db.execute("PRAGMA synchronous = NORMAL")
+        for state_sql in SNAPSHOT_STATE_SQL:
+            snapshot_db.execute(state_sql)
+        connection.rollback()
+        with connection.cursor() as cursor:
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY;")
+        try:
+            for table_name in sorted(table_entries):
+                sync_report[table_name] = sync_table(connection, snapshot_db, table_name, table_entries[table_name], full, bucket_size)
+                if progress_callback:
+                    progress_callback(table_name, sync_report[table_name])
+        finally:
+            connection.rollback()
+        for (table_name,) in snapshot_db.execute(f'SELECT table_name FROM "{SNAPSHOT_TABLES_STATE}"').fetchall():
+            if table_name not in table_entries:
+                _drop_local_object(snapshot_db, table_name)
+                snapshot_db.execute(f'DELETE FROM "{SNAPSHOT_TABLES_STATE}" WHERE table_name = ?', (table_name,))
+                snapshot_db.execute(f'DELETE FROM "{SNAPSHOT_BUCKETS_STATE}" WHERE table_name = ?', (table_name,))
+                sync_report[table_name] = {'mode': 'dropped', 'buckets_changed': 0, 'rows_copied': 0, 'seconds': 0.0}
+        snapshot_db.commit()
+    finally:
+        snapshot_db.close()
+    return sync_report
+
+def split_script_statements(sql_script):
+    # Statement ends as SQLite sees them, so a trailing '-- comment' after ';' is fine.
+    script_statements, pending_lines = [], []
+    for line in sql_script.splitlines():
+        pending_lines.append(line)
+        if sqlite3.complete_statement("\n".join(pending_lines)):
+            statement_text = "\n".join(pending_lines).strip()
+            pending_lines = []
+            if statement_text.strip(';').strip():
+                script_statements.append(statement_text)
+    return script_statements
+
+def load_sql_script(snapshot_path, script_path):
+    # Server-less snapshot (e.g. for CI) built straight from a schema/data script like Project.sql.
+    # Views stay views here; a later sync from MySQL replaces everything with copied tables.
+    with open(script_path, encoding='utf-8') as script_file:
+        script_statements = split_script_statements(script_file.read())
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+    snapshot_db = connect_snapshot(snapshot_path, 'rwc')
+    loaded_statements = 0
+    try:
+        for statement_text in script_statements:
+            leading_words = [word.upper() for word in statement_text.split(None, 4)[:4]]
+            if leading_words[0] in ('SELECT', 'USE') or leading_words[:2] in (['CREATE', 'DATABASE'], ['CREATE', 'SCHEMA']):
+                continue
+            if leading_words == ['CREATE', 'OR', 'REPLACE', 'VIEW']:
+                view_name = statement_text.split(None, 5)[4]
+                snapshot_db.execute(f'DROP VIEW IF EXISTS "{view_name.strip("`")}"')
+                statement_text = re.sub(r"^CREATE\s+OR\s+REPLACE\s+VIEW", "CREATE VIEW", statement_text, flags=re.I)
+            try:
+                snapshot_db.execute(translate_sql(statement_text))
+            except sqlite3.Error as e:
+                raise LocalBackendError(f"{script_path}: {e} in: {statement_text[:80]}") from e
+            loaded_statements += 1
+        snapshot_db.commit()
+    finally:
+        snapshot_db.close()
+    return loaded_statements
+
+def snapshot_status(snapshot_path):
+    if not os.path.exists(snapshot_path):
+        return None
+    snapshot_db = connect_snapshot(snapshot_path, 'ro')
+    try:
+        object_count = snapshot_db.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE '\\_%' ESCAPE '\\'"
+        ).fetchone()[0]
+        has_state = snapshot_db.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (SNAPSHOT_TABLES_STATE,)).fetchone()
+        synced_tables, synced_rows, last_synced_at = snapshot_db.execute(
+            f'SELECT COUNT(*), SUM(row_count), MAX(synced_at) FROM "{SNAPSHOT_TABLES_STATE}"'
+        ).fetchone() if has_state else (0, 0, None)
+    finally:
+        snapshot_db.close()
+    return {'path': snapshot_path, 'size_bytes': os.path.getsize(snapshot_path), 'tables': object_count,
+            'synced_tables': synced_tables, 'synced_rows': synced_rows or 0, 'last_synced_at': last_synced_at}
+
+def run_project_queries(snapshot_path, query_keys):
+    # Runs predefined queries against the snapshot only: no MySQL server needed.
+    import Console
+    from result_set import fetch_result_set
+
+    local_connection = LocalConnection(snapshot_path)
+    failures = 0
+    try:
+        for query_key in query_keys:
+            query_info = Console.YOUR_PROJECT_QUERIES.get(query_key)
+            if not query_info:
+                print(f"Skipping unknown query '{query_key}'.")
+                continue
+            started_at = time.perf_counter()
+            try:
+                query_rows = fetch_result_set(local_connection, Console.resolve_project_query_sql(local_connection, query_info))
+            except pymysql.Error as e:
+                failures += 1
+                print(f"  Q{query_key:<4} ERROR {e}")
+                continue
+            print(f"  Q{query_key:<4} {(time.perf_counter() - started_at) * 1000:9.2f} ms  {len(query_rows):>8} rows")
+    finally:
+        local_connection.close()
+    return failures
+
+def main(argv=None):
+    import Console
+
+    parser = argparse.ArgumentParser(description="Sync a local SQLite snapshot of the project database and run reports on it.")
+    parser.add_argument('--path', default=Console.LOCAL_BACKEND_CONFIG['snapshot_path'], help="snapshot file")
+    parser.add_argument('--full', action='store_true', help="re-copy every table instead of only changed key ranges")
+    parser.add_argument('--bucket-size', type=int, default=Console.LOCAL_BACKEND_CONFIG['bucket_size'],
+                        help="primary-key range per checksum bucket")
+    parser.add_argument('--from-script', metavar='SQL_FILE', help="build the snapshot from a SQL script (e.g. Project.sql) instead of MySQL")
+    parser.add_argument('--run-queries', nargs='?', const=','.join(Console.YOUR_PROJECT_QUERIES), metavar='Q,Q',
+                        help="run predefined queries against the snapshot (default: all) and exit non-zero on failure")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.from_script:
+            statement_count = load_sql_script(args.path, args.from_script)
+            print(f"Loaded {statement_count} statement(s) from '{args.from_script}' into '{args.path}'.")
+        elif not args.run_queries:
+            try:
+                connection = pymysql.connect(**Console.DB_CONFIG)
+            except pymysql.Error as e:
+                print(f"FATAL: Error connecting to the MySQL database: {e}")
+                return 1
+            try:
+                sync_snapshot(connection, args.path, Console.SCHEMA_CATALOG.load(connection), full=args.full, bucket_size=args.bucket_size,
+                              progress_callback=lambda table_name, table_report: print(
+                                  f"  {table_name:<32} {table_report['mode']:<12} {table_report['rows_copied']:>10,} rows  {table_report['seconds']:7.2f}s"))
+            except pymysql.Error as e:
+                Console.handle_database_error(e, "syncing the local snapshot")
+                return 1
+            finally:
+                connection.close()
+        if args.run_queries:
+            return 1 if run_project_queries(args.path, [key.strip() for key in args.run_queries.split(',') if key.strip()]) else 0
+    except LocalBackendError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
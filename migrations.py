@@ -0,0 +1,121 @@
+import datetime
+import os
+import re
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r"^V(\d{3,})__([A-Za-z0-9_]+)\.sql$")
+STATEMENT_DELIMITER_PATTERN = re.compile(r"^\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    if not os.path.isdir(migrations_dir):
+        return []
+    found_migrations = []
+    for file_name in os.listdir(migrations_dir):
+        name_match = MIGRATION_FILE_PATTERN.match(file_name)
+        if name_match:
+            found_migrations.append((name_match.group(1), name_match.group(2), os.path.join(migrations_dir, file_name)))
+    return sorted(found_migrations, key=lambda migration: int(migration[0]))
+
+def next_migration_path(slug, migrations_dir=MIGRATIONS_DIR):
+    existing_migrations = list_migrations(migrations_dir)
+    next_version = int(existing_migrations[-1][0]) + 1 if existing_migrations else 1
+    return os.path.join(migrations_dir, f"V{next_version:03d}__{slug}.sql")
+
+def split_sql_statements(sql_script):
+    # Supports the mysql client's DELIMITER directive so triggers can live in migration files.
+    statements = []
+    current_lines = []
+    delimiter = ';'
+    for line in sql_script.splitlines():
+        delimiter_match = STATEMENT_DELIMITER_PATTERN.match(line)
+        if delimiter_match:
+            delimiter = delimiter_match.group(1)
+            continue
+        if not current_lines and (not line.strip() or line.strip().startswith('--')):
+            continue
+        current_lines.append(line)
+        if line.rstrip().endswith(delimiter):
+            statement_text = "\n".join(current_lines).rstrip()[:-len(delimiter)].strip()
+            if statement_text:
+                statements.append(statement_text)
+            current_lines = []
+    trailing_text = "\n".join(current_lines).strip()
+    if trailing_text:
+        statements.append(trailing_text)
+    return statements
+
+def ensure_migrations_table(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version VARCHAR(20) PRIMARY KEY,"
+            " name VARCHAR(200) NOT NULL,"
+            " applied_at DATETIME NOT NULL"
+            ");"
+        )
+        # Statements done so far by a migration that has not finished. DDL commits implicitly, so
+        # a migration that fails part-way resumes after its last completed statement instead of
+        # failing on the indexes or tables the earlier statements already created.
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migration_steps ("
+            " version VARCHAR(20) NOT NULL,"
+            " statement_index INT NOT NULL,"
+            " applied_at DATETIME NOT NULL,"
+            " PRIMARY KEY (version, statement_index)"
+            ");"
+        )
+    connection.commit()
+
+def applied_versions(connection):
+    ensure_migrations_table(connection)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT version FROM schema_migrations;")
+        version_rows = cursor.fetchall()
+    return {version_row['version'] if isinstance(version_row, dict) else version_row[0] for version_row in version_rows}
+
+def completed_steps(connection, version):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT statement_index FROM schema_migration_steps WHERE version = %s;", (version,))
+        step_rows = cursor.fetchall()
+    return {step_row['statement_index'] if isinstance(step_row, dict) else step_row[0] for step_row in step_rows}
+
+def apply_migration(connection, version, name, file_path):
+    # Each statement commits with its step row; a statement that fails is rolled back and the
+    # next run starts from it. Don't edit a migration that failed part-way: steps are by position.
+    with open(file_path, encoding='utf-8') as migration_file:
+        statements = split_sql_statements(migration_file.read())
+    skipped_steps = completed_steps(connection, version)
+    try:
+        with connection.cursor() as cursor:
+            for statement_index, statement_text in enumerate(statements, 1):
+                if statement_index in skipped_steps:
+                    continue
+                cursor.execute(statement_text)
+                cursor.execute(
+                    "INSERT INTO schema_migration_steps (version, statement_index, applied_at) VALUES (%s, %s, %s);",
+                    (version, statement_index, datetime.datetime.now().replace(microsecond=0))
+                )
+                connection.commit()
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (%s, %s, %s);",
+                (version, name, datetime.datetime.now().replace(microsecond=0))
+            )
+            cursor.execute("DELETE FROM schema_migration_steps WHERE version = %s;", (version,))
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    return len(statements) - len(skipped_steps)
+
+def pending_migrations(connection, migrations_dir=MIGRATIONS_DIR):
+    already_applied = applied_versions(connection)
+    return [migration for migration in list_migrations(migrations_dir) if migration[0] not in already_applied]
+
+def apply_pending_migrations(connection, migrations_dir=MIGRATIONS_DIR, progress_callback=None):
+    applied = []
+    for version, name, file_path in pending_migrations(connection, migrations_dir):
+        statement_count = apply_migration(connection, version, name, file_path)
+        applied.append((version, name))
+        if progress_callback:
+            progress_callback(version, name, statement_count)
+    return applied
@@ -0,0 +1,29 @@
+-- Baseline indexes recommended by the index advisor for YOUR_PROJECT_QUERIES.
+-- Composite indexes for the columns YOUR_PROJECT_QUERIES filter, join and group on.
+
+-- join from Job_Application and grade aggregation without touching rows (Q1, Q5, Q12, Q13)
+CREATE INDEX `idx_interview_application_grade` ON `Interview` (`applicationID`, `grade`);
+
+-- jobID filter/grouping with the applicant available from the index (Q5, Q8)
+CREATE INDEX `idx_job_application_job_person` ON `Job_Application` (`jobID`, `person_id`);
+
+-- applicant lookups by person_id (Q8, Q12, Q13)
+CREATE INDEX `idx_job_application_person_job` ON `Job_Application` (`person_id`, `jobID`);
+
+-- postedDate range predicates (Q2, Q5, Q7)
+CREATE INDEX `idx_job_position_posted_date` ON `Job_Position` (`postedDate`);
+
+-- sale_date range predicates (Q4)
+CREATE INDEX `idx_sales_history_sale_date` ON `Sales_History` (`sale_date`);
+
+-- per-salesman sale lookups joined to Sale_Product (Q6)
+CREATE INDEX `idx_sales_history_employee_sale` ON `Sales_History` (`employee_id`, `sale_id`);
+
+-- joins from Product to its sales (Q6, Q9, Q10)
+CREATE INDEX `idx_sale_product_product_sale` ON `Sale_Product` (`product_id`, `sale_id`);
+
+-- listPrice > 200 filter returning productType from the index (Q6)
+CREATE INDEX `idx_product_list_price_type` ON `Product` (`listPrice`, `productType`);
+
+-- applicant lookup by name (Q1)
+CREATE INDEX `idx_person_name` ON `Person` (`name`);
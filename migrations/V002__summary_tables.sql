@@ -0,0 +1,58 @@
+-- Materialized replacements for View1, View3 and View4.
+-- Console.py keeps them current on every write it makes; summary_tables.py provides
+-- delta (watermark) and full refreshes for writes made outside the console.
+
+CREATE TABLE summary_employee_salary (
+    employee_id INT PRIMARY KEY,
+    salary_total DECIMAL(16, 2),
+    payment_count INT NOT NULL,
+    avg_monthly_salary DECIMAL(12, 2) AS (ROUND(salary_total / NULLIF(payment_count, 0), 2)) STORED,
+    INDEX idx_summary_employee_salary_avg (avg_monthly_salary)
+);
+
+CREATE TABLE summary_product_part_cost (
+    product_id INT PRIMARY KEY,
+    total_part_cost DECIMAL(16, 2)
+);
+
+CREATE TABLE summary_product_type_sales (
+    productType VARCHAR(50) PRIMARY KEY,
+    total_items_sold BIGINT,
+    total_revenue DECIMAL(18, 2),
+    total_part_cost DECIMAL(18, 2),
+    profit DECIMAL(18, 2) AS (total_revenue - total_part_cost) STORED,
+    INDEX idx_summary_product_type_sales_items (total_items_sold),
+    INDEX idx_summary_product_type_sales_profit (profit)
+);
+
+CREATE TABLE IF NOT EXISTS summary_refresh_state (
+    source_table VARCHAR(64) PRIMARY KEY,
+    watermark BIGINT NOT NULL,
+    refreshed_at DATETIME NOT NULL
+);
+
+INSERT INTO summary_employee_salary (employee_id, salary_total, payment_count)
+SELECT e.employee_id, SUM(s.amount), COUNT(s.amount)
+FROM Employee_Salary s
+JOIN Employee e ON e.employee_id = s.employee_id
+GROUP BY e.employee_id;
+
+INSERT INTO summary_product_part_cost (product_id, total_part_cost)
+SELECT pp.product_id, SUM(pp.quantity * pt.price)
+FROM Product_Part pp
+JOIN Part pt ON pt.part_id = pp.part_id
+GROUP BY pp.product_id;
+
+INSERT INTO summary_product_type_sales (productType, total_items_sold, total_revenue, total_part_cost)
+SELECT p.productType, SUM(sp.quantity), SUM(sp.quantity * sp.unitPrice), IFNULL(SUM(sp.quantity * pc.total_part_cost), 0)
+FROM Sale_Product sp
+JOIN Product p ON p.product_id = sp.product_id
+LEFT JOIN summary_product_part_cost pc ON pc.product_id = p.product_id
+WHERE p.productType IS NOT NULL
+GROUP BY p.productType;
+
+INSERT INTO summary_refresh_state (source_table, watermark, refreshed_at)
+SELECT 'Employee_Salary', IFNULL(MAX(transaction_number), 0), NOW() FROM Employee_Salary;
+
+INSERT INTO summary_refresh_state (source_table, watermark, refreshed_at)
+SELECT 'Sale_Product', IFNULL(MAX(sale_id), 0), NOW() FROM Sale_Product;
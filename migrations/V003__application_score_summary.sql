@@ -0,0 +1,44 @@
+-- Per-application interview score aggregate used by Q5, Q12 and Q13.
+-- score_sum/scored_count reproduce AVG() over the grade scores (NULL grades are skipped) and
+-- round_count reproduces COUNT(DISTINCT interviewID), so per-job and per-person averages can be
+-- rebuilt exactly by summing rows. Maintained by summary_tables.py alongside V002's summaries.
+
+CREATE TABLE summary_application_score (
+    applicationID INT PRIMARY KEY,
+    score_sum DECIMAL(16, 2),
+    scored_count INT NOT NULL,
+    round_count INT NOT NULL,
+    avg_score DECIMAL(8, 2) AS (score_sum / NULLIF(scored_count, 0)) STORED,
+    is_selected TINYINT NOT NULL AS (IFNULL(score_sum / NULLIF(scored_count, 0) > 70 AND round_count >= 5, 0)) STORED,
+    INDEX idx_summary_application_score_selected (is_selected, applicationID)
+);
+
+INSERT INTO summary_application_score (applicationID, score_sum, scored_count, round_count)
+SELECT i.applicationID, SUM(grade_score), COUNT(grade_score), COUNT(*)
+FROM (
+    SELECT i.applicationID,
+           CASE LCASE(i.grade)
+               WHEN 'a+' THEN 95 WHEN 'a' THEN 90
+               WHEN 'b+' THEN 85 WHEN 'b' THEN 80
+               WHEN 'c+' THEN 75 WHEN 'c' THEN 70
+               WHEN 'd' THEN 60
+               ELSE CASE
+                   WHEN i.grade REGEXP '^[+-]?[0-9]+([.][0-9]+)?$' THEN TRUNCATE(CAST(i.grade AS DECIMAL(8, 2)), 0)
+                   WHEN i.grade IS NOT NULL THEN 0
+               END
+           END AS grade_score
+    FROM Interview i
+) i
+WHERE i.applicationID IS NOT NULL
+GROUP BY i.applicationID;
+
+-- The watermark table comes from V002; create it here too so this migration does not depend on
+-- V002 having run. Kept just before its first use so earlier statement positions do not move.
+CREATE TABLE IF NOT EXISTS summary_refresh_state (
+    source_table VARCHAR(64) PRIMARY KEY,
+    watermark BIGINT NOT NULL,
+    refreshed_at DATETIME NOT NULL
+);
+
+INSERT INTO summary_refresh_state (source_table, watermark, refreshed_at)
+SELECT 'Interview', IFNULL(MAX(interviewID), 0), NOW() FROM Interview;
@@ -0,0 +1,13 @@
+-- Indexes behind the keyset-paginated Person / Sales_History search (record_search.py).
+-- InnoDB secondary indexes carry the primary key, so (email) also serves ORDER BY email, person_id
+-- and (employee_id, sale_date) serves ORDER BY sale_date, sale_id within one employee.
+-- Name prefix search and sale_date range scans use idx_person_name and idx_sales_history_sale_date from V001.
+
+-- email prefix search and email-ordered pages
+CREATE INDEX `idx_person_email` ON `Person` (`email`);
+
+-- one salesman's sales by date range
+CREATE INDEX `idx_sales_history_employee_date` ON `Sales_History` (`employee_id`, `sale_date`);
+
+-- one customer's sales by date range
+CREATE INDEX `idx_sales_history_customer_date` ON `Sales_History` (`customer_id`, `sale_date`);
@@ -0,0 +1,31 @@
+-- Append-only change log written by console writes (change_capture.py), in the same transaction
+-- as the change itself. change_id comes from change_log_sequence rather than AUTO_INCREMENT: the
+-- sequence row stays locked until the writer commits, so ids become visible in commit order with
+-- no gaps and a consumer can read "change_id > checkpoint" without missing a late commit.
+
+CREATE TABLE change_log (
+    change_id BIGINT PRIMARY KEY,
+    changed_at DATETIME(6) NOT NULL,
+    table_name VARCHAR(64) NOT NULL,
+    operation VARCHAR(10) NOT NULL,
+    primary_key JSON NULL,
+    before_values JSON NULL,
+    after_values JSON NULL,
+    statement_text TEXT NULL,
+    INDEX idx_change_log_table (table_name, change_id),
+    INDEX idx_change_log_changed_at (changed_at)
+);
+
+CREATE TABLE change_log_sequence (
+    sequence_id TINYINT PRIMARY KEY,
+    last_change_id BIGINT NOT NULL
+);
+
+INSERT INTO change_log_sequence (sequence_id, last_change_id) VALUES (1, 0);
+
+-- Last change_id each named consumer has fully processed.
+CREATE TABLE change_log_checkpoint (
+    consumer VARCHAR(64) PRIMARY KEY,
+    last_change_id BIGINT NOT NULL,
+    updated_at DATETIME(6) NOT NULL
+);
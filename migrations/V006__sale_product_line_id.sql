@@ -0,0 +1,21 @@
+-- Sale_Product's key is (sale_id, product_id), so a line added later to an existing sale has a
+-- sale_id at or below the delta-refresh watermark and was never picked up. line_id grows with
+-- every inserted line and is the Sale_Product watermark from here on (summary_tables.py).
+
+ALTER TABLE Sale_Product
+    ADD COLUMN line_id BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_sale_product_line_id (line_id);
+
+-- Rebuild once so lines the sale_id watermark skipped are counted, then start from line_id.
+DELETE FROM summary_product_type_sales;
+
+INSERT INTO summary_product_type_sales (productType, total_items_sold, total_revenue, total_part_cost)
+SELECT p.productType, SUM(sp.quantity), SUM(sp.quantity * sp.unitPrice), IFNULL(SUM(sp.quantity * pc.total_part_cost), 0)
+FROM Sale_Product sp
+JOIN Product p ON p.product_id = sp.product_id
+LEFT JOIN summary_product_part_cost pc ON pc.product_id = p.product_id
+WHERE p.productType IS NOT NULL
+GROUP BY p.productType;
+
+REPLACE INTO summary_refresh_state (source_table, watermark, refreshed_at)
+SELECT 'Sale_Product', IFNULL(MAX(line_id), 0), NOW() FROM Sale_Product;
@@ -0,0 +1,20 @@
+-- transaction_number is assigned by the client, so a payment inserted below the current maximum
+-- stayed under the delta-refresh watermark and never reached summary_employee_salary. entry_id
+-- grows with every inserted payment and is the Employee_Salary watermark from here on
+-- (summary_tables.py), as line_id is for Sale_Product (V006).
+
+ALTER TABLE Employee_Salary
+    ADD COLUMN entry_id BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_employee_salary_entry_id (entry_id);
+
+-- Rebuild once so payments the transaction_number watermark skipped are counted, then start from entry_id.
+DELETE FROM summary_employee_salary;
+
+INSERT INTO summary_employee_salary (employee_id, salary_total, payment_count)
+SELECT e.employee_id, SUM(s.amount), COUNT(s.amount)
+FROM Employee_Salary s
+JOIN Employee e ON e.employee_id = s.employee_id
+GROUP BY e.employee_id;
+
+REPLACE INTO summary_refresh_state (source_table, watermark, refreshed_at)
+SELECT 'Employee_Salary', IFNULL(MAX(entry_id), 0), NOW() FROM Employee_Salary;
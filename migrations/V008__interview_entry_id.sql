@@ -0,0 +1,33 @@
+-- interviewID is assigned by the client, so an interview backfilled below the current maximum
+-- stayed under the delta-refresh watermark and never reached summary_application_score.
+-- entry_id grows with every inserted interview and is the Interview watermark from here on
+-- (summary_tables.py), as entry_id is for Employee_Salary (V007).
+
+ALTER TABLE Interview
+    ADD COLUMN entry_id BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_interview_entry_id (entry_id);
+
+-- Rebuild once so interviews the interviewID watermark skipped are counted, then start from entry_id.
+DELETE FROM summary_application_score;
+
+INSERT INTO summary_application_score (applicationID, score_sum, scored_count, round_count)
+SELECT i.applicationID, SUM(grade_score), COUNT(grade_score), COUNT(*)
+FROM (
+    SELECT i.applicationID,
+           CASE LCASE(i.grade)
+               WHEN 'a+' THEN 95 WHEN 'a' THEN 90
+               WHEN 'b+' THEN 85 WHEN 'b' THEN 80
+               WHEN 'c+' THEN 75 WHEN 'c' THEN 70
+               WHEN 'd' THEN 60
+               ELSE CASE
+                   WHEN i.grade REGEXP '^[+-]?[0-9]+([.][0-9]+)?$' THEN TRUNCATE(CAST(i.grade AS DECIMAL(8, 2)), 0)
+                   WHEN i.grade IS NOT NULL THEN 0
+               END
+           END AS grade_score
+    FROM Interview i
+) i
+WHERE i.applicationID IS NOT NULL
+GROUP BY i.applicationID;
+
+REPLACE INTO summary_refresh_state (source_table, watermark, refreshed_at)
+SELECT 'Interview', IFNULL(MAX(entry_id), 0), NOW() FROM Interview;
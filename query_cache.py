@@ -0,0 +1,115 @@
+import collections
+import sys
+import threading
+import time
+
+def estimate_result_size(result_rows):
+    # Rough deep size of a fetched result: the row container, each row and its values.
+    # Column-name strings are shared between rows, so they are counted once. Columnar results
+    # (result_set.ResultSet) report their own size.
+    if hasattr(result_rows, 'nbytes'):
+        return result_rows.nbytes()
+    total_bytes = sys.getsizeof(result_rows)
+    column_names = set()
+    for result_row in result_rows:
+        total_bytes += sys.getsizeof(result_row)
+        if isinstance(result_row, dict):
+            column_names.update(result_row)
+            result_values = result_row.values()
+        else:
+            result_values = result_row
+        total_bytes += sum(sys.getsizeof(value) for value in result_values)
+    return total_bytes + sum(sys.getsizeof(column_name) for column_name in column_names)
+
+class QueryResultCache:
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024, ttl_seconds=600):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError(f"Invalid cache limits: max_entries={max_entries}, max_bytes={max_bytes}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = collections.OrderedDict()
+        self._keys_by_table = {}
+        # Bumped by every invalidation, so a fetch that overlapped a write cannot store its rows.
+        self._table_generations = collections.Counter()
+        self._clear_generation = 0
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0, 'oversized': 0, 'stale': 0}
+
+    def _drop(self, cache_key):
+        entry = self._entries.pop(cache_key)
+        self._total_bytes -= entry['size_bytes']
+        for table_name in entry['tables']:
+            table_keys = self._keys_by_table.get(table_name)
+            if table_keys is not None:
+                table_keys.discard(cache_key)
+                if not table_keys:
+                    del self._keys_by_table[table_name]
+
+    def get(self, cache_key):
+        # Returns the cached rows (shared, do not mutate) or None on a miss.
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and (time.monotonic() - entry['stored_at']) >= self.ttl_seconds:
+                self._drop(cache_key)
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.stats['hits'] += 1
+            return entry['rows']
+
+    def generation(self, table_names):
+        # Taken before the fetch and handed back to put().
+        with self._lock:
+            return self._clear_generation, tuple(self._table_generations[table_name] for table_name in table_names)
+
+    def put(self, cache_key, result_rows, table_names, generation=None):
+        size_bytes = estimate_result_size(result_rows)
+        with self._lock:
+            if generation is not None and generation != (self._clear_generation, tuple(self._table_generations[table_name] for table_name in table_names)):
+                self.stats['stale'] += 1
+                return False
+            if cache_key in self._entries:
+                self._drop(cache_key)
+            if size_bytes > self.max_bytes:
+                self.stats['oversized'] += 1
+                return False
+            while self._entries and (len(self._entries) >= self.max_entries or self._total_bytes + size_bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+            self._entries[cache_key] = {
+                'rows': result_rows, 'tables': frozenset(table_names), 'size_bytes': size_bytes, 'stored_at': time.monotonic()
+            }
+            self._total_bytes += size_bytes
+            for table_name in table_names:
+                self._keys_by_table.setdefault(table_name, set()).add(cache_key)
+            self.stats['stores'] += 1
+            return True
+
+    def invalidate_tables(self, table_names):
+        with self._lock:
+            stale_keys = set()
+            for table_name in table_names:
+                self._table_generations[table_name] += 1
+                stale_keys.update(self._keys_by_table.get(table_name, ()))
+            for cache_key in stale_keys:
+                self._drop(cache_key)
+            self.stats['invalidations'] += len(stale_keys)
+            return len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self.stats['invalidations'] += len(self._entries)
+            self._clear_generation += 1
+            self._entries.clear()
+            self._keys_by_table.clear()
+            self._total_bytes = 0
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(self.stats, entries=len(self._entries), size_bytes=self._total_bytes,
+                        hit_rate=self.stats['hits'] / lookups if lookups else 0.0)
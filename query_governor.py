@@ -0,0 +1,231 @@
+import collections
+import contextlib
+import re
+import threading
+import time
+
+import pymysql
+
+import index_advisor
+
+QUERY_TIMEOUT_ERROR_CODE = 3024
+QUERY_INTERRUPTED_ERROR_CODE = 1317
+# Statements EXPLAIN accepts; anything else (SHOW, DDL, SET ...) runs without a row estimate.
+EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "TABLE", "INSERT", "REPLACE", "UPDATE", "DELETE")
+# sql_select_limit applies to every row-returning SELECT of the session, so it is only lowered
+# for statements that are themselves queries.
+QUERY_PREFIXES = ("SELECT", "WITH", "TABLE")
+SLOT_POLL_SECONDS = 0.2
+# A trailing LIMIT [offset,] count or LIMIT count OFFSET offset, optionally before a locking clause.
+TRAILING_LIMIT_PATTERN = re.compile(
+    r"\bLIMIT\s+(\d+)(?:\s*(?:,|\s+OFFSET\s+)\s*(\d+))?\s*(?:FOR\s+(?:UPDATE|SHARE)|LOCK\s+IN\s+SHARE\s+MODE)?\s*;?\s*$",
+    re.IGNORECASE
+)
+
+class GovernorError(pymysql.err.OperationalError):
+    # reason: 'explain_budget' or 'queue_timeout' (rejected before running), 'timeout' (stopped).
+    def __init__(self, reason, message):
+        super().__init__("GOVERNOR", message)
+        self.reason = reason
+
+class GovernedStatement:
+    def __init__(self, sql_text):
+        self.sql_text = sql_text
+        self.estimated_rows = None
+        self.heavy = False
+        self.slot = None
+        self.queued_seconds = 0.0
+        self.max_rows = None
+        self.killed = False
+
+def statement_prefix(sql_text):
+    return sql_text.lstrip(" \t\r\n(").upper()
+
+def is_explainable(sql_text):
+    return statement_prefix(sql_text).startswith(EXPLAINABLE_PREFIXES)
+
+def statement_row_limit(sql_text):
+    # Rows a top-level LIMIT lets the statement read up to (offset + count); None without one or
+    # when the LIMIT closes a subquery.
+    limit_match = TRAILING_LIMIT_PATTERN.search(sql_text)
+    if not limit_match or sql_text.count('(', 0, limit_match.start()) != sql_text.count(')', 0, limit_match.start()):
+        return None
+    return int(limit_match.group(1)) + int(limit_match.group(2) or 0)
+
+def kill_query(db_config, connection_id):
+    # KILL QUERY must come from another session.
+    kill_connection = pymysql.connect(**db_config)
+    try:
+        with kill_connection.cursor() as cursor:
+            cursor.execute(f"KILL QUERY {int(connection_id)};")
+    finally:
+        kill_connection.close()
+
+# Limits for ad-hoc statements on the shared server:
+#   * EXPLAIN's estimate of rows examined must stay under explain_row_budget, or the statement
+#     is rejected without running;
+#   * statements estimated at heavy_row_threshold rows or more take one of max_concurrent_heavy
+#     slots per MySQL user (GET_LOCK, so every console of that user shares them) and queue for
+#     up to queue_timeout_seconds;
+#   * max_execution_ms bounds the statement: MAX_EXECUTION_TIME for SELECT, a KILL QUERY
+#     watchdog for everything else;
+#   * SELECTs return at most max_rows rows (sql_select_limit one above, so truncation shows).
+class QueryGovernor:
+    def __init__(self, db_config, enabled=True, max_execution_ms=30000, max_rows=100000, explain_row_budget=50000000,
+                 heavy_row_threshold=1000000, max_concurrent_heavy=2, queue_timeout_seconds=30.0, kill_grace_seconds=2.0,
+                 event_history=50):
+        self.db_config = dict(db_config)
+        self.enabled = enabled
+        self.max_execution_ms = max_execution_ms
+        self.max_rows = max_rows
+        self.explain_row_budget = explain_row_budget
+        self.heavy_row_threshold = heavy_row_threshold
+        self.max_concurrent_heavy = max_concurrent_heavy
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.kill_grace_seconds = kill_grace_seconds
+        self.events = collections.deque(maxlen=event_history)
+        self.stats = {'governed': 0, 'heavy': 0, 'queued': 0, 'rejected': 0, 'timed_out': 0, 'truncated': 0}
+        self._lock = threading.Lock()
+
+    def limits(self):
+        return {'max_execution_ms': self.max_execution_ms, 'max_rows': self.max_rows, 'explain_row_budget': self.explain_row_budget,
+                'heavy_row_threshold': self.heavy_row_threshold, 'max_concurrent_heavy': self.max_concurrent_heavy,
+                'queue_timeout_seconds': self.queue_timeout_seconds}
+
+    def _count(self, stat_name):
+        with self._lock:
+            self.stats[stat_name] += 1
+
+    def _record_event(self, outcome, reason, sql_text, detail):
+        with self._lock:
+            self.events.append({'at': time.time(), 'outcome': outcome, 'reason': reason, 'statement': sql_text[:200], 'detail': detail})
+
+    def _reject(self, reason, sql_text, message):
+        self._count('rejected')
+        self._record_event('rejected', reason, sql_text, message)
+        return GovernorError(reason, message)
+
+    def note_truncated(self, sql_text, rows_returned):
+        self._count('truncated')
+        self._record_event('truncated', 'row_cap', sql_text, f"stopped after {rows_returned} row(s)")
+
+    def estimate_rows(self, connection, sql_text):
+        # None when the statement can't be explained; the statement then reports its own error.
+        if not is_explainable(sql_text):
+            return None
+        try:
+            plan = index_advisor.explain_query(connection, sql_text)
+        except (pymysql.Error, ValueError):
+            return None
+        row_limit = statement_row_limit(sql_text) if statement_prefix(sql_text).startswith(QUERY_PREFIXES) else None
+        return index_advisor.estimate_rows_examined(plan, row_limit)
+
+    def _acquire_slot(self, connection, governed_statement, wait_callback):
+        # Named locks belong to the session, so the slot is held on the statement's own connection
+        # and is freed by the server if that connection dies.
+        deadline = time.monotonic() + self.queue_timeout_seconds
+        queue_started_at = time.monotonic()
+        with connection.cursor() as cursor:
+            while True:
+                for slot in range(1, self.max_concurrent_heavy + 1):
+                    cursor.execute("SELECT GET_LOCK(LEFT(CONCAT('query_governor:', %s, ':', CURRENT_USER()), 64), 0) AS acquired;", (slot,))
+                    acquired_row = cursor.fetchone()
+                    acquired = acquired_row['acquired'] if isinstance(acquired_row, dict) else acquired_row[0]
+                    if acquired == 1:
+                        governed_statement.slot = slot
+                        governed_statement.queued_seconds = time.monotonic() - queue_started_at
+                        return
+                if time.monotonic() >= deadline:
+                    raise self._reject('queue_timeout', governed_statement.sql_text,
+                                       f"All {self.max_concurrent_heavy} heavy-statement slot(s) for this user stayed busy for "
+                                       f"{self.queue_timeout_seconds:.0f}s; try again later.")
+                if not governed_statement.queued_seconds:
+                    self._count('queued')
+                    if wait_callback:
+                        wait_callback(governed_statement)
+                governed_statement.queued_seconds = time.monotonic() - queue_started_at
+                time.sleep(SLOT_POLL_SECONDS)
+
+    def _release_slot(self, connection, governed_statement):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT RELEASE_LOCK(LEFT(CONCAT('query_governor:', %s, ':', CURRENT_USER()), 64));",
+                               (governed_statement.slot,))
+                cursor.fetchall()
+        except pymysql.Error:
+            pass
+
+    def _set_limits(self, connection, sql_text):
+        with connection.cursor() as cursor:
+            cursor.execute("SET SESSION max_execution_time = %s;", (self.max_execution_ms or 0,))
+            if self.max_rows and statement_prefix(sql_text).startswith(QUERY_PREFIXES):
+                cursor.execute("SET SESSION sql_select_limit = %s;", (self.max_rows + 1,))
+
+    def _reset_limits(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SET SESSION max_execution_time = DEFAULT, sql_select_limit = DEFAULT;")
+        except pymysql.Error:
+            pass
+
+    @contextlib.contextmanager
+    def govern(self, connection, sql_text, wait_callback=None):
+        # Wraps executing and fetching one statement. Yields a GovernedStatement whose max_rows the
+        # caller passes to its fetch; raises GovernorError when the statement is refused or stopped.
+        governed_statement = GovernedStatement(sql_text)
+        if not self.enabled:
+            yield governed_statement
+            return
+        self._count('governed')
+        governed_statement.estimated_rows = self.estimate_rows(connection, sql_text)
+        if self.explain_row_budget and governed_statement.estimated_rows is not None \
+                and governed_statement.estimated_rows > self.explain_row_budget:
+            raise self._reject('explain_budget', sql_text,
+                               f"EXPLAIN estimates {governed_statement.estimated_rows:,.0f} rows examined, over the budget of "
+                               f"{self.explain_row_budget:,}; add a filter or an index, or check the join conditions.")
+        governed_statement.heavy = governed_statement.estimated_rows is not None \
+            and governed_statement.estimated_rows >= self.heavy_row_threshold
+        if governed_statement.heavy:
+            self._count('heavy')
+            self._acquire_slot(connection, governed_statement, wait_callback)
+
+        if self.max_rows and statement_prefix(sql_text).startswith(QUERY_PREFIXES):
+            governed_statement.max_rows = self.max_rows
+        watchdog_lock = threading.Lock()
+        finished = False
+
+        def stop_statement():
+            with watchdog_lock:
+                if finished:
+                    return
+                governed_statement.killed = True
+                try:
+                    kill_query(self.db_config, connection_id)
+                except pymysql.Error:
+                    pass
+
+        watchdog = None
+        try:
+            self._set_limits(connection, sql_text)
+            if self.max_execution_ms:
+                connection_id = connection.thread_id()
+                # MAX_EXECUTION_TIME only covers read-only SELECTs; the watchdog stops the rest.
+                watchdog = threading.Timer(self.max_execution_ms / 1000 + self.kill_grace_seconds, stop_statement)
+                watchdog.daemon = True
+                watchdog.start()
+            yield governed_statement
+        except pymysql.Error as e:
+            error_code = e.args[0] if e.args else None
+            if error_code == QUERY_TIMEOUT_ERROR_CODE or (error_code == QUERY_INTERRUPTED_ERROR_CODE and governed_statement.killed):
+                self._count('timed_out')
+                self._record_event('killed', 'timeout', sql_text, f"over {self.max_execution_ms} ms")
+                raise GovernorError('timeout', f"Statement stopped after exceeding the {self.max_execution_ms} ms time limit.") from e
+            raise
+        finally:
+            with watchdog_lock:
+                finished = True
+            if watchdog:
+                watchdog.cancel()
+            self._reset_limits(connection)
+            if governed_statement.slot is not None:
+                self._release_slot(connection, governed_statement)
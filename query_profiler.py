@@ -0,0 +1,219 @@
+import collections
+import contextlib
+import json
+import math
+import re
+import threading
+import time
+
+import pymysql
+import pymysql.cursors
+
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Batched INSERTs can be megabytes long; only this much of a statement is fingerprinted and kept.
+MAX_STATEMENT_CHARS = 4000
+
+# The profiled statement is the newest completed event for this connection's thread; the metrics
+# query itself is still running, so it is only in events_statements_current.
+SERVER_METRICS_QUERY = """
+    SELECT TIMER_WAIT / 1000000000 AS server_ms, LOCK_TIME / 1000000000 AS lock_ms,
+           ROWS_EXAMINED AS rows_examined, ROWS_SENT AS rows_sent, ROWS_AFFECTED AS rows_affected,
+           NO_INDEX_USED AS no_index_used, CREATED_TMP_DISK_TABLES AS tmp_disk_tables, SORT_ROWS AS sort_rows
+    FROM performance_schema.events_statements_history
+    WHERE THREAD_ID = (SELECT THREAD_ID FROM performance_schema.threads WHERE PROCESSLIST_ID = CONNECTION_ID())
+    ORDER BY EVENT_ID DESC
+    LIMIT 1;
+"""
+
+# Access denied, unknown table, or performance_schema disabled: stop asking for server metrics.
+SERVER_METRICS_UNAVAILABLE_CODES = (1044, 1142, 1146, 1049, 1227, 1683)
+
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+NUMBER_LITERAL_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[max(1, math.ceil(pct / 100.0 * len(sorted_values))) - 1]
+
+def normalize_statement(sql_text):
+    # Statement fingerprint for aggregation: literals become ?, IN lists collapse, whitespace folds.
+    fingerprint = STRING_LITERAL_PATTERN.sub('?', sql_text)
+    fingerprint = NUMBER_LITERAL_PATTERN.sub('?', fingerprint)
+    fingerprint = IN_LIST_PATTERN.sub('(?+)', fingerprint)
+    return WHITESPACE_PATTERN.sub(' ', fingerprint).strip().rstrip(';')
+
+class StatementProfile:
+    def __init__(self, profiler, connection, statement, label):
+        self.profiler = profiler
+        self.connection = connection
+        self.statement = statement
+        self.label = label
+        self.cache_hit = False
+        self.rows = None
+        self.server = None
+        self.wall_ms = None
+        self.timings = {}
+        self.started_at = time.perf_counter()
+
+    def capture_server_metrics(self):
+        # Call straight after the profiled statement, before anything else runs on the connection.
+        self.server = self.profiler.fetch_server_metrics(self.connection)
+
+    @contextlib.contextmanager
+    def phase(self, phase_name):
+        phase_started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase_name] = self.timings.get(phase_name, 0.0) + (time.perf_counter() - phase_started_at) * 1000
+
+class QueryProfiler:
+    def __init__(self, enabled=True, window_size=1000, server_metrics=True, trace_path=None, top_statement_limit=500):
+        self.enabled = enabled
+        self.server_metrics = server_metrics
+        self.top_statement_limit = top_statement_limit
+        self._window = collections.deque(maxlen=window_size)
+        self._statements = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._trace_file = None
+        self.trace_path = None
+        if trace_path:
+            self.start_trace(trace_path)
+
+    def is_suppressed(self):
+        return getattr(self._local, 'suppressed', False)
+
+    @contextlib.contextmanager
+    def suppressed(self):
+        # Statements run inside an explicit profile (and the metrics query) are not recorded twice.
+        previous = self.is_suppressed()
+        self._local.suppressed = True
+        try:
+            yield
+        finally:
+            self._local.suppressed = previous
+
+    def fetch_server_metrics(self, connection):
+        if not self.enabled or not self.server_metrics:
+            return None
+        try:
+            with self.suppressed(), connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(SERVER_METRICS_QUERY)
+                metrics_row = cursor.fetchone()
+        except pymysql.Error as e:
+            if e.args and e.args[0] in SERVER_METRICS_UNAVAILABLE_CODES:
+                self.server_metrics = False
+            return None
+        if not metrics_row:
+            return None
+        return {metric_name: float(metric_value) if metric_value is not None else None for metric_name, metric_value in metrics_row.items()}
+
+    @contextlib.contextmanager
+    def profile(self, connection, statement=None, label=None):
+        statement_profile = StatementProfile(self, connection, statement, label)
+        if not self.enabled:
+            yield statement_profile
+            return
+        failed = False
+        with self.suppressed():
+            try:
+                yield statement_profile
+            except Exception:
+                failed = True
+                raise
+            finally:
+                wall_ms = statement_profile.wall_ms = (time.perf_counter() - statement_profile.started_at) * 1000
+                self.record(statement_profile.statement or '', label=label, wall_ms=wall_ms, rows=statement_profile.rows,
+                            cache_hit=statement_profile.cache_hit, failed=failed, server=statement_profile.server,
+                            **statement_profile.timings)
+
+    def record(self, statement, label=None, wall_ms=0.0, rows=None, source='console', **details):
+        if not self.enabled:
+            return None
+        if isinstance(statement, bytes):
+            statement = statement[:MAX_STATEMENT_CHARS].decode('utf-8', 'replace')
+        statement = statement[:MAX_STATEMENT_CHARS]
+        fingerprint = normalize_statement(statement)
+        statement_record = dict(details, at=time.time(), label=label, source=source, fingerprint=fingerprint,
+                                wall_ms=round(wall_ms, 3), rows=rows)
+        with self._lock:
+            self._window.append(statement_record)
+            aggregate = self._statements.get(fingerprint)
+            if aggregate is None:
+                if len(self._statements) >= self.top_statement_limit:
+                    # Forget the cheapest fingerprint so a long session cannot grow the table without bound.
+                    del self._statements[min(self._statements, key=lambda key: self._statements[key]['total_ms'])]
+                aggregate = self._statements[fingerprint] = {
+                    'fingerprint': fingerprint, 'label': label, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'sample_sql': statement, 'last_server': None
+                }
+            aggregate['count'] += 1
+            aggregate['total_ms'] += wall_ms
+            if wall_ms >= aggregate['max_ms']:
+                aggregate['max_ms'] = wall_ms
+                aggregate['sample_sql'] = statement
+            if label:
+                aggregate['label'] = label
+            if details.get('server'):
+                aggregate['last_server'] = details['server']
+            if self._trace_file is not None:
+                self._trace_file.write(json.dumps(dict(statement_record, statement=statement), default=str) + "\n")
+                self._trace_file.flush()
+        return statement_record
+
+    def histogram(self):
+        bucket_counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        with self._lock:
+            wall_times = [statement_record['wall_ms'] for statement_record in self._window]
+        for wall_ms in wall_times:
+            bucket_index = 0
+            while bucket_index < len(HISTOGRAM_BUCKETS_MS) and wall_ms > HISTOGRAM_BUCKETS_MS[bucket_index]:
+                bucket_index += 1
+            bucket_counts[bucket_index] += 1
+        bucket_labels = [f"<= {bucket_ms} ms" for bucket_ms in HISTOGRAM_BUCKETS_MS] + [f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+        return list(zip(bucket_labels, bucket_counts)), sorted(wall_times)
+
+    def top_statements(self, limit=10, order_by='max_ms'):
+        with self._lock:
+            aggregates = [dict(aggregate) for aggregate in self._statements.values()]
+        for aggregate in aggregates:
+            aggregate['avg_ms'] = aggregate['total_ms'] / aggregate['count']
+        return sorted(aggregates, key=lambda aggregate: aggregate[order_by], reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._window.clear()
+            self._statements.clear()
+
+    def start_trace(self, trace_path):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+            self._trace_file = open(trace_path, 'a', encoding='utf-8')
+            self.trace_path = trace_path
+
+    def stop_trace(self):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+            self._trace_file = None
+            self.trace_path = None
+
+def profiling_cursor_class(profiler, base_class=pymysql.cursors.DictCursor):
+    # Cursor class for DB_CONFIG['cursorclass'] that records every execute() through the profiler.
+    class ProfilingCursor(base_class):
+        def execute(self, query, args=None):
+            if not profiler.enabled or profiler.is_suppressed():
+                return super().execute(query, args)
+            started_at = time.perf_counter()
+            try:
+                return super().execute(query, args)
+            finally:
+                profiler.record(query, wall_ms=(time.perf_counter() - started_at) * 1000, rows=self.rowcount, source='cursor')
+
+    ProfilingCursor.__name__ = f"Profiling{base_class.__name__}"
+    return ProfilingCursor
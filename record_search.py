@@ -0,0 +1,160 @@
+import base64
+import datetime
+import decimal
+import hashlib
+import json
+
+# Filter kinds: 'prefix' is an index-backed LIKE 'abc%', 'date_from'/'date_to' form a half-open
+# sale_date range (date_to is inclusive for the user, exclusive in SQL), 'int'/'equals' match exactly.
+SEARCH_ENTITIES = {
+    'person': {
+        'table': 'Person',
+        'columns': ('person_id', 'name', 'email', 'city', 'state'),
+        'filters': {
+            'name': ('name', 'prefix'),
+            'email': ('email', 'prefix'),
+            'city': ('city', 'equals')
+        },
+        'sorts': {
+            'name': ('name', 'person_id'),
+            'email': ('email', 'person_id'),
+            'id': ('person_id',)
+        },
+        'default_sort': 'name'
+    },
+    'sales': {
+        'table': 'Sales_History',
+        'columns': ('sale_id', 'sale_date', 'customer_id', 'employee_id', 'total_amount'),
+        'filters': {
+            'from': ('sale_date', 'date_from'),
+            'to': ('sale_date', 'date_to'),
+            'employee': ('employee_id', 'int'),
+            'customer': ('customer_id', 'int')
+        },
+        'sorts': {
+            'date': ('sale_date', 'sale_id'),
+            'id': ('sale_id',)
+        },
+        'default_sort': 'date'
+    }
+}
+
+class SearchCriteriaError(ValueError):
+    pass
+
+def escape_like_prefix(prefix):
+    return prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def parse_filter_value(filter_name, filter_kind, raw_value):
+    raw_value = raw_value.strip()
+    try:
+        if filter_kind in ('date_from', 'date_to'):
+            return datetime.date.fromisoformat(raw_value)
+        if filter_kind == 'int':
+            return int(raw_value)
+    except ValueError:
+        expected = "a date (YYYY-MM-DD)" if filter_kind in ('date_from', 'date_to') else "a whole number"
+        raise SearchCriteriaError(f"Filter '{filter_name}' expects {expected}, got {raw_value!r}.")
+    if not raw_value:
+        raise SearchCriteriaError(f"Filter '{filter_name}' cannot be empty.")
+    return raw_value
+
+def build_criteria(entity_name, raw_filters, sort_name=None, descending=False):
+    # Turns user input into validated, typed search criteria.
+    entity = SEARCH_ENTITIES.get(entity_name)
+    if entity is None:
+        raise SearchCriteriaError(f"Unknown search '{entity_name}'. Choose one of: {', '.join(SEARCH_ENTITIES)}")
+    sort_name = sort_name or entity['default_sort']
+    if sort_name not in entity['sorts']:
+        raise SearchCriteriaError(f"Unknown sort '{sort_name}'. Choose one of: {', '.join(entity['sorts'])}")
+    typed_filters = {}
+    for filter_name, raw_value in raw_filters.items():
+        if filter_name not in entity['filters']:
+            raise SearchCriteriaError(f"Unknown filter '{filter_name}'. Choose from: {', '.join(entity['filters'])}")
+        if raw_value is None or not str(raw_value).strip():
+            continue
+        typed_filters[filter_name] = parse_filter_value(filter_name, entity['filters'][filter_name][1], str(raw_value))
+    if 'from' in typed_filters and 'to' in typed_filters and typed_filters['from'] > typed_filters['to']:
+        raise SearchCriteriaError("The 'from' date must not be after the 'to' date.")
+    return {'entity': entity_name, 'filters': typed_filters, 'sort': sort_name, 'descending': bool(descending)}
+
+def criteria_fingerprint(criteria):
+    criteria_text = json.dumps(criteria, sort_keys=True, default=str)
+    return hashlib.sha1(criteria_text.encode('utf-8')).hexdigest()[:12]
+
+def json_key_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+def encode_cursor(criteria, last_row):
+    sort_columns = SEARCH_ENTITIES[criteria['entity']]['sorts'][criteria['sort']]
+    cursor_payload = {'c': criteria_fingerprint(criteria), 'k': [json_key_value(last_row[column]) for column in sort_columns]}
+    return base64.urlsafe_b64encode(json.dumps(cursor_payload).encode('utf-8')).decode('ascii')
+
+def decode_cursor(criteria, cursor_token):
+    try:
+        cursor_payload = json.loads(base64.urlsafe_b64decode(cursor_token.encode('ascii')))
+        last_key = cursor_payload['k']
+    except (ValueError, KeyError, TypeError):
+        raise SearchCriteriaError("The page cursor is malformed.")
+    sort_columns = SEARCH_ENTITIES[criteria['entity']]['sorts'][criteria['sort']]
+    if cursor_payload.get('c') != criteria_fingerprint(criteria) or len(last_key) != len(sort_columns):
+        raise SearchCriteriaError("The page cursor belongs to a different search.")
+    return tuple(last_key)
+
+def build_search_sql(criteria, page_size, last_key=None):
+    entity = SEARCH_ENTITIES[criteria['entity']]
+    sort_columns = entity['sorts'][criteria['sort']]
+    where_clauses, query_params = [], []
+    for filter_name, filter_value in criteria['filters'].items():
+        column_name, filter_kind = entity['filters'][filter_name]
+        if filter_kind == 'prefix':
+            where_clauses.append(f"`{column_name}` LIKE %s")
+            query_params.append(escape_like_prefix(filter_value))
+        elif filter_kind == 'date_from':
+            where_clauses.append(f"`{column_name}` >= %s")
+            query_params.append(filter_value)
+        elif filter_kind == 'date_to':
+            where_clauses.append(f"`{column_name}` < %s")
+            query_params.append(filter_value + datetime.timedelta(days=1))
+        else:
+            where_clauses.append(f"`{column_name}` = %s")
+            query_params.append(filter_value)
+    # Row comparisons skip NULLs, so rows without a sort value are left out of that sort order.
+    for column_name in sort_columns[:-1]:
+        where_clauses.append(f"`{column_name}` IS NOT NULL")
+
+    sort_tuple_sql = ", ".join(f"`{column_name}`" for column_name in sort_columns)
+    if last_key is not None:
+        # The redundant bound on the leading sort column gives the optimizer a plain index range
+        # even when an equality filter precedes the sort columns in the index.
+        where_clauses.append(f"`{sort_columns[0]}` {'<=' if criteria['descending'] else '>='} %s")
+        query_params.append(last_key[0])
+        where_clauses.append(f"({sort_tuple_sql}) {'<' if criteria['descending'] else '>'} ({', '.join(['%s'] * len(sort_columns))})")
+        query_params.extend(last_key)
+
+    sort_direction = " DESC" if criteria['descending'] else ""
+    search_sql = f"SELECT {', '.join(f'`{column_name}`' for column_name in entity['columns'])} FROM `{entity['table']}`"
+    if where_clauses:
+        search_sql += " WHERE " + " AND ".join(where_clauses)
+    search_sql += f" ORDER BY {', '.join(f'`{column_name}`{sort_direction}' for column_name in sort_columns)} LIMIT {int(page_size) + 1};"
+    return search_sql, tuple(query_params)
+
+def search_page(connection, criteria, page_size=25, cursor_token=None):
+    # Keyset (seek) pagination: each page starts after the previous page's last sort key, so any
+    # page is one index range scan of page_size + 1 rows. The extra row only signals has_more.
+    last_key = decode_cursor(criteria, cursor_token) if cursor_token else None
+    search_sql, query_params = build_search_sql(criteria, page_size, last_key)
+    with connection.cursor() as cursor:
+        cursor.execute(search_sql, query_params)
+        page_rows = list(cursor.fetchall())
+    has_more = len(page_rows) > page_size
+    page_rows = page_rows[:page_size]
+    return {
+        'rows': page_rows,
+        'has_more': has_more,
+        'next_cursor': encode_cursor(criteria, page_rows[-1]) if has_more else None
+    }
@@ -0,0 +1,83 @@
+import contextlib
+import time
+
+import pymysql.cursors
+
+# "Which groups are related to every member of a set" (relational division) in one grouped pass.
+# A division spec names:
+#   select    - output columns, taken from the grouped rows
+#   from      - the dividend: one row per (group, member) pair. Candidate groups are joined with
+#               LEFT JOINs so a group without any member still appears (member NULL), and member
+#               rows are restricted to divisor members in the join conditions
+#   group_by  - the output grouping, which must include group_key
+#   group_key - the single column identifying a group, used by the bitset strategy
+#   member    - the member column
+#   divisor   - a SELECT of the distinct divisor members
+# A NULL divisor member can never be matched, as with the nested NOT EXISTS form.
+
+DIVISION_STRATEGIES = ('sql', 'bitset')
+
+class DivisionError(ValueError):
+    pass
+
+def division_sql(spec):
+    return (
+        f"SELECT {spec['select']}\n"
+        f"FROM {spec['from']}\n"
+        f"GROUP BY {', '.join(spec['group_by'])}\n"
+        f"HAVING COUNT(DISTINCT {spec['member']}) = (SELECT COUNT(*) FROM ({spec['divisor']}) divisor);"
+    )
+
+def dividend_pairs_sql(spec):
+    return f"SELECT {spec['group_key']} AS group_id, {spec['member']} AS member FROM {spec['from']};"
+
+def divide_by_bitset(connection, dividend_sql, divisor_sql, params=None, chunk_size=10000, govern=None):
+    # Client-side division: each divisor member gets a bit, each group ORs in the bits of its
+    # streamed (group, member) rows, and a group qualifies when its mask is full. One pass over
+    # the dividend and O(groups) memory; members outside the divisor are ignored.
+    # govern(sql) wraps each statement (QueryGovernor.govern). A stream cut at the governor's row
+    # cap would give a wrong answer, so passing the cap raises DivisionError instead.
+    govern = govern or (lambda sql_text: contextlib.nullcontext())
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        with govern(divisor_sql) as governed_statement:
+            cursor.execute(divisor_sql)
+            member_bits = {}
+            for rows_read, divisor_row in enumerate(cursor.fetchall_unbuffered(), 1):
+                check_row_cap(governed_statement, rows_read, "divisor")
+                member_bits.setdefault(divisor_row[0], 1 << len(member_bits))
+        # A NULL divisor member keeps its bit but can never be set below.
+        full_mask = (1 << len(member_bits)) - 1
+        member_bits.pop(None, None)
+
+        group_masks = {}
+        with govern(dividend_sql) as governed_statement:
+            cursor.execute(dividend_sql, params)
+            rows_read = 0
+            while True:
+                dividend_rows = cursor.fetchmany(chunk_size)
+                if not dividend_rows:
+                    break
+                rows_read += len(dividend_rows)
+                check_row_cap(governed_statement, rows_read, "dividend")
+                for group_id, member in dividend_rows:
+                    group_masks[group_id] = group_masks.get(group_id, 0) | member_bits.get(member, 0)
+    return [group_id for group_id, group_mask in group_masks.items() if group_mask == full_mask]
+
+def check_row_cap(governed_statement, rows_read, query_role):
+    max_rows = governed_statement.max_rows if governed_statement is not None else None
+    if max_rows is not None and rows_read > max_rows:
+        raise DivisionError(f"The {query_role} query returned more than the governor's row cap of {max_rows} row(s); "
+                            "narrow it, since a partial stream would give a wrong answer.")
+
+def run_division(connection, spec, strategy='sql'):
+    # Returns (rows, elapsed_seconds). The bitset strategy returns group_key values only.
+    if strategy not in DIVISION_STRATEGIES:
+        raise DivisionError(f"Unknown division strategy '{strategy}'. Choose one of: {', '.join(DIVISION_STRATEGIES)}")
+    started_at = time.perf_counter()
+    if strategy == 'sql':
+        with connection.cursor() as cursor:
+            cursor.execute(division_sql(spec))
+            division_rows = list(cursor.fetchall())
+    else:
+        division_rows = [{'group_id': group_id} for group_id in divide_by_bitset(connection, dividend_pairs_sql(spec), spec['divisor'])]
+    return division_rows, time.perf_counter() - started_at
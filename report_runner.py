@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+
+import pymysql
+
+import Console
+from async_engine import AsyncQueryEngine
+from bulk_export import EXPORT_FILE_EXTENSIONS, EXPORT_WRITERS, export_query
+from db_pool import ConnectionPool
+
+REPORT_OUTPUT_DIR = "report_output"
+REPORT_SUMMARY_FILE = "summary.json"
+
+def report_job(query_key, output_path, file_format, compress, chunk_size):
+    def work(connection, job):
+        def report_progress(rows_exported, elapsed_seconds):
+            job.rows_fetched = rows_exported
+            job.check_cancelled()
+
+        resolved_sql = Console.resolve_project_query_sql(connection, Console.YOUR_PROJECT_QUERIES[query_key])
+        return export_query(connection, resolved_sql, output_path, file_format=file_format, chunk_size=chunk_size,
+                            compress=compress, progress_callback=report_progress)
+    return work
+
+async def run_reports(job_engine, report_jobs, parallelism, timeout):
+    # The semaphore holds reports back until a worker is free, so each timeout covers execution only.
+    worker_slots = asyncio.Semaphore(parallelism)
+
+    async def run_one(label, work):
+        async with worker_slots:
+            return await job_engine.run(label, work, timeout=timeout)
+
+    return await asyncio.gather(*(run_one(label, work) for label, work in report_jobs))
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Run predefined project queries in parallel and write each result set to a file.")
+    parser.add_argument('--queries', default=','.join(Console.YOUR_PROJECT_QUERIES), help="comma-separated project query numbers (default: all)")
+    parser.add_argument('--parallelism', type=int, default=4, help="queries run at the same time, one pooled connection each")
+    parser.add_argument('--timeout', type=float, default=300.0, help="seconds before a query is killed with KILL QUERY")
+    parser.add_argument('--format', default=Console.EXPORT_CONFIG['default_format'], choices=list(EXPORT_WRITERS))
+    parser.add_argument('--compress', action='store_true', help="gzip each result file")
+    parser.add_argument('--output-dir', help="directory for result files (default: report_output/<timestamp>)")
+    parser.add_argument('--host', default=Console.DB_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=Console.DB_CONFIG['port'])
+    parser.add_argument('--user', default=Console.DB_CONFIG['user'])
+    parser.add_argument('--password', default=Console.DB_CONFIG['password'])
+    parser.add_argument('--database', default=Console.DB_CONFIG['database'])
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.parallelism < 1 or args.timeout <= 0:
+        print("--parallelism must be at least 1 and --timeout must be positive.")
+        return 2
+    query_keys = [key.strip() for key in args.queries.split(',') if key.strip()]
+    unknown_keys = [query_key for query_key in query_keys if query_key not in Console.YOUR_PROJECT_QUERIES]
+    if unknown_keys:
+        print(f"Unknown query number(s): {', '.join(unknown_keys)}")
+        return 2
+
+    output_dir = args.output_dir or os.path.join(REPORT_OUTPUT_DIR, datetime.datetime.now().strftime('%Y%m%d-%H%M%S'))
+    os.makedirs(output_dir, exist_ok=True)
+    db_config = dict(Console.DB_CONFIG, host=args.host, port=args.port, user=args.user, password=args.password, database=args.database)
+    parallelism = min(args.parallelism, len(query_keys)) or 1
+    try:
+        pool = ConnectionPool(db_config, min_size=parallelism, max_size=parallelism, checkout_timeout=Console.POOL_CONFIG['checkout_timeout'],
+                              session_settings=Console.POOL_CONFIG['session_settings']).open()
+    except pymysql.Error as e:
+        print(f"FATAL: Error connecting to the MySQL database: {e}")
+        return 1
+
+    output_paths = {
+        query_key: os.path.join(output_dir, f"Q{query_key}{EXPORT_FILE_EXTENSIONS[args.format]}{'.gz' if args.compress else ''}")
+        for query_key in query_keys
+    }
+    report_jobs = [
+        (f"Q{query_key}", report_job(query_key, output_paths[query_key], args.format, args.compress, Console.EXPORT_CONFIG['chunk_size']))
+        for query_key in query_keys
+    ]
+    job_engine = AsyncQueryEngine(pool, max_workers=parallelism)
+    print(f"Running {len(report_jobs)} report(s) with parallelism {parallelism} and a {args.timeout:g}s timeout...")
+    started_at = time.perf_counter()
+    try:
+        finished_jobs = job_engine.run_until_complete(run_reports(job_engine, report_jobs, parallelism, args.timeout))
+    finally:
+        job_engine.close()
+        pool.close()
+    wall_seconds = time.perf_counter() - started_at
+
+    report_summary = {'run_at': datetime.datetime.now().isoformat(timespec='seconds'), 'parallelism': parallelism,
+                      'timeout_seconds': args.timeout, 'wall_seconds': wall_seconds, 'queries': {}}
+    print(f"\n{'query':<6} {'state':<10} {'rows':>10} {'seconds':>9}  file / error")
+    for query_key, job in zip(query_keys, finished_jobs):
+        if job.state == 'done':
+            detail = output_paths[query_key]
+        else:
+            # Leave no partial result files behind for reports that did not finish.
+            if os.path.exists(output_paths[query_key]):
+                os.remove(output_paths[query_key])
+            detail = f"timed out after {args.timeout:g}s" if job.state == 'timed_out' else str(job.error or job.state)
+        print(f"{job.label:<6} {job.state:<10} {job.rows_fetched:>10,} {job.elapsed_seconds():>9.2f}  {detail}")
+        report_summary['queries'][job.label] = {
+            'state': job.state, 'rows': job.rows_fetched, 'seconds': job.elapsed_seconds(),
+            'file': output_paths[query_key] if job.state == 'done' else None, 'error': None if job.state == 'done' else detail
+        }
+
+    serial_seconds = sum(query_result['seconds'] for query_result in report_summary['queries'].values())
+    report_summary['sum_of_query_seconds'] = serial_seconds
+    print(f"\nWall clock {wall_seconds:.2f}s for {serial_seconds:.2f}s of query time "
+          f"(slowest {max((job.elapsed_seconds() for job in finished_jobs), default=0.0):.2f}s).")
+    with open(os.path.join(output_dir, REPORT_SUMMARY_FILE), 'w', encoding='utf-8') as summary_file:
+        json.dump(report_summary, summary_file, indent=2)
+    print(f"Timing summary written to '{os.path.join(output_dir, REPORT_SUMMARY_FILE)}'.")
+    return 0 if all(job.state == 'done' for job in finished_jobs) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
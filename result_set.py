@@ -0,0 +1,154 @@
+import collections.abc
+import sys
+from array import array
+
+import pymysql.cursors
+
+# Typed buffers for columns whose values are all ints (64-bit) or all floats; any other column,
+# or one that meets a NULL or a second type, is kept as a plain list of values.
+TYPED_COLUMN_CODES = {int: 'q', float: 'd'}
+
+def _new_column(first_value):
+    typecode = TYPED_COLUMN_CODES.get(type(first_value))
+    return array(typecode) if typecode else []
+
+def _extend_column(column_values, chunk_values):
+    # Returns the column to keep: the same buffer, or a list once the typed buffer can't hold a value.
+    if isinstance(column_values, list):
+        column_values.extend(chunk_values)
+        return column_values
+    filled_length = len(column_values)
+    try:
+        column_values.extend(chunk_values)
+        return column_values
+    except (TypeError, OverflowError):
+        # array.extend() appends item by item, so drop the partial chunk before degrading.
+        del column_values[filled_length:]
+        column_values = column_values.tolist()
+        column_values.extend(chunk_values)
+        return column_values
+
+class RowView(collections.abc.Mapping):
+    # Read-only row['col'] access into a ResultSet; no per-row dict and no repeated keys.
+    __slots__ = ('_result_set', '_row_index')
+
+    def __init__(self, result_set, row_index):
+        self._result_set = result_set
+        self._row_index = row_index
+
+    def __getitem__(self, column_name):
+        return self._result_set._columns[self._result_set._index_by_name[column_name]][self._row_index]
+
+    def __iter__(self):
+        return iter(self._result_set.column_names)
+
+    def __len__(self):
+        return len(self._result_set.column_names)
+
+    def keys(self):
+        return self._result_set.column_names
+
+    def values(self):
+        return tuple(column_values[self._row_index] for column_values in self._result_set._columns)
+
+    def __repr__(self):
+        return f"RowView({dict(zip(self._result_set.column_names, self.values()))!r})"
+
+class ResultSet:
+    # A fetched result held column-wise. Indexing and iteration hand out RowViews, so callers written
+    # for DictCursor rows keep working; tuples() and column() give the compact forms directly.
+    def __init__(self, column_names):
+        # Repeated names (SELECT a.id, b.id) get a positional suffix, as a dict row would lose one.
+        unique_names = []
+        for column_index, column_name in enumerate(column_names):
+            unique_names.append(column_name if column_name not in unique_names else f"{column_name}.{column_index}")
+        self.column_names = tuple(unique_names)
+        self._index_by_name = {column_name: column_index for column_index, column_name in enumerate(self.column_names)}
+        self._columns = [None] * len(self.column_names)
+        self._row_count = 0
+        # Set when max_rows stopped the fetch with more rows left on the cursor.
+        self.truncated = False
+
+    @classmethod
+    def from_cursor(cls, cursor, chunk_size=10000, progress_callback=None, max_rows=None):
+        # Drains an executed tuple cursor (SSCursor streams, so only one chunk of tuples is alive at
+        # a time). progress_callback(rows_fetched) runs after every chunk and may raise to stop.
+        result_set = cls([column_info[0] for column_info in cursor.description or ()])
+        while True:
+            if max_rows is not None and result_set._row_count >= max_rows:
+                result_set.truncated = bool(cursor.fetchmany(1))
+                break
+            row_chunk = cursor.fetchmany(chunk_size if max_rows is None else min(chunk_size, max_rows - result_set._row_count))
+            if not row_chunk:
+                break
+            result_set.extend(row_chunk)
+            if progress_callback:
+                progress_callback(result_set._row_count)
+        return result_set
+
+    def extend(self, row_chunk):
+        if not row_chunk:
+            return
+        for column_index, chunk_values in enumerate(zip(*row_chunk)):
+            column_values = self._columns[column_index]
+            if column_values is None:
+                # Typed by the first value; a leading NULL starts a list rather than guessing.
+                column_values = _new_column(chunk_values[0])
+            self._columns[column_index] = _extend_column(column_values, chunk_values)
+        self._row_count += len(row_chunk)
+
+    def __len__(self):
+        return self._row_count
+
+    def __getitem__(self, row_index):
+        if isinstance(row_index, slice):
+            return [RowView(self, index) for index in range(*row_index.indices(self._row_count))]
+        if row_index < 0:
+            row_index += self._row_count
+        if not 0 <= row_index < self._row_count:
+            raise IndexError("result set row index out of range")
+        return RowView(self, row_index)
+
+    def __iter__(self):
+        for row_index in range(self._row_count):
+            yield RowView(self, row_index)
+
+    def tuples(self):
+        return zip(*self._columns) if self._columns and self._row_count else iter(())
+
+    def column(self, column_name):
+        # The column's own buffer (array or list); treat it as read-only.
+        return self._columns[self._index_by_name[column_name]] or []
+
+    def column_array(self, column_name):
+        # NumPy view for typed columns (no copy); other columns become object arrays. Imported here
+        # because every report fetch loads this module and most never ask for an array.
+        try:
+            import numpy
+        except ImportError:
+            raise RuntimeError("NumPy is not installed.") from None
+        column_values = self.column(column_name)
+        if isinstance(column_values, array):
+            return numpy.frombuffer(column_values, dtype=numpy.int64 if column_values.typecode == 'q' else numpy.float64)
+        return numpy.array(column_values, dtype=object)
+
+    def column_types(self):
+        return {column_name: (column_values.typecode if isinstance(column_values, array) else 'list')
+                for column_name, column_values in zip(self.column_names, self._columns)}
+
+    def nbytes(self):
+        # Deep size: typed buffers are counted as-is, list columns with their values.
+        total_bytes = sys.getsizeof(self) + sum(sys.getsizeof(column_name) for column_name in self.column_names)
+        for column_values in self._columns:
+            if column_values is None:
+                continue
+            total_bytes += sys.getsizeof(column_values)
+            if isinstance(column_values, list):
+                total_bytes += sum(sys.getsizeof(value) for value in column_values)
+        return total_bytes
+
+def fetch_result_set(connection, sql_query, query_params=None, chunk_size=10000, cursor_class=pymysql.cursors.SSCursor,
+                     progress_callback=None, max_rows=None):
+    with connection.cursor(cursor_class) as cursor:
+        cursor.execute(sql_query, query_params)
+        return ResultSet.from_cursor(cursor, chunk_size, progress_callback, max_rows)
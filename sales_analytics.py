@@ -0,0 +1,216 @@
+import time
+from array import array
+
+import pymysql.cursors
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Line-level dimensions are stored as dictionary codes per sale line; 'product_type' is an
+# attribute of the product and is answered by rolling product totals up.
+LINE_DIMENSIONS = ('product', 'month', 'salesperson', 'customer', 'site')
+PRODUCT_DIMENSIONS = ('product_type',)
+ANALYTICS_DIMENSIONS = LINE_DIMENSIONS + PRODUCT_DIMENSIONS
+ANALYTICS_MEASURES = ('revenue', 'cost', 'profit', 'quantity', 'lines')
+ANALYTICS_SOURCE_TABLES = ('Sale_Product', 'Sales_History', 'Product', 'Product_Part', 'Part')
+
+SALE_LINES_SQL = """
+    SELECT sp.product_id, sp.quantity, sp.unitPrice, sh.sale_date, sh.employee_id, sh.customer_id{site_column}
+    FROM Sale_Product sp
+    JOIN Sales_History sh ON sh.sale_id = sp.sale_id;
+"""
+
+class AnalyticsError(Exception):
+    pass
+
+class AnalyticsMemoryError(AnalyticsError):
+    pass
+
+class CodedColumn:
+    # Dictionary encoding: one 32-bit code per row, each distinct label stored once.
+    def __init__(self):
+        self.codes = array('i')
+        self.labels = []
+        self._code_by_label = {}
+
+    def code_for(self, label):
+        code = self._code_by_label.get(label)
+        if code is None:
+            code = self._code_by_label[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def find(self, label):
+        return self._code_by_label.get(label)
+
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes) + 64 * len(self.labels)
+
+def group_sums(codes, values, group_count, row_mask=None):
+    if numpy is not None:
+        code_array = numpy.frombuffer(codes, dtype=numpy.int32)
+        value_array = numpy.frombuffer(values, dtype=numpy.float64) if isinstance(values, array) else values
+        if row_mask is not None:
+            code_array, value_array = code_array[row_mask], value_array[row_mask]
+        return numpy.bincount(code_array, weights=value_array, minlength=group_count).tolist()
+    totals = [0.0] * group_count
+    if row_mask is None:
+        for code, value in zip(codes, values):
+            totals[code] += value
+    else:
+        for code, value, keep in zip(codes, values, row_mask):
+            if keep:
+                totals[code] += value
+    return totals
+
+def group_counts(codes, group_count, row_mask=None):
+    if numpy is not None:
+        code_array = numpy.frombuffer(codes, dtype=numpy.int32)
+        if row_mask is not None:
+            code_array = code_array[row_mask]
+        return numpy.bincount(code_array, minlength=group_count).tolist()
+    counts = [0] * group_count
+    if row_mask is None:
+        for code in codes:
+            counts[code] += 1
+    else:
+        for code, keep in zip(codes, row_mask):
+            if keep:
+                counts[code] += 1
+    return counts
+
+class SalesDataset:
+    # One row per Sale_Product line, held column-wise in typed arrays.
+    def __init__(self, include_site=False):
+        self.include_site = include_site
+        self.columns = {dimension: CodedColumn() for dimension in LINE_DIMENSIONS if dimension != 'site' or include_site}
+        self.quantity = array('d')
+        self.revenue = array('d')
+        self.cost = array('d')
+        self.product_types = {}
+        self.loaded_at = None
+        self.load_seconds = None
+        self.stale = False
+
+    def __len__(self):
+        return len(self.quantity)
+
+    def nbytes(self):
+        return sum(column.nbytes() for column in self.columns.values()) + 8 * 3 * len(self.quantity)
+
+    def summary(self):
+        return {'lines': len(self), 'bytes': self.nbytes(), 'load_seconds': self.load_seconds,
+                'backend': 'numpy' if numpy is not None else 'array', 'dimensions': self.dimensions()}
+
+    def dimensions(self):
+        return [dimension for dimension in ANALYTICS_DIMENSIONS if dimension in self.columns or dimension in PRODUCT_DIMENSIONS]
+
+    def _row_mask(self, filters):
+        if not filters:
+            return None
+        filter_codes = []
+        for dimension, label in filters.items():
+            if dimension not in self.columns:
+                raise AnalyticsError(f"Cannot filter on '{dimension}'. Choose one of: {', '.join(self.columns)}")
+            filter_codes.append((self.columns[dimension].codes, self.columns[dimension].find(label)))
+        if any(code is None for _, code in filter_codes):
+            return [False] * len(self) if numpy is None else numpy.zeros(len(self), dtype=bool)
+        if numpy is not None:
+            row_mask = numpy.ones(len(self), dtype=bool)
+            for codes, code in filter_codes:
+                row_mask &= numpy.frombuffer(codes, dtype=numpy.int32) == code
+            return row_mask
+        return [all(codes[row_index] == code for codes, code in filter_codes) for row_index in range(len(self))]
+
+    def aggregate(self, dimension, order_by='profit', descending=True, top_n=None, filters=None):
+        if dimension not in self.dimensions():
+            raise AnalyticsError(f"Unknown dimension '{dimension}'. Choose one of: {', '.join(self.dimensions())}")
+        if order_by not in ANALYTICS_MEASURES + ('label',):
+            raise AnalyticsError(f"Cannot order by '{order_by}'. Choose one of: {', '.join(ANALYTICS_MEASURES)}")
+        row_mask = self._row_mask(filters)
+        group_column = self.columns['product' if dimension in PRODUCT_DIMENSIONS else dimension]
+        group_count = len(group_column.labels)
+        measure_totals = {
+            'revenue': group_sums(group_column.codes, self.revenue, group_count, row_mask),
+            'cost': group_sums(group_column.codes, self.cost, group_count, row_mask),
+            'quantity': group_sums(group_column.codes, self.quantity, group_count, row_mask),
+            'lines': group_counts(group_column.codes, group_count, row_mask)
+        }
+        group_labels = group_column.labels
+        if dimension == 'product_type':
+            # Roll the (few) product totals up to their product type.
+            type_totals = {}
+            for product_index, product_id in enumerate(group_labels):
+                type_entry = type_totals.setdefault(self.product_types.get(product_id), dict.fromkeys(measure_totals, 0))
+                for measure, totals in measure_totals.items():
+                    type_entry[measure] += totals[product_index]
+            group_labels = list(type_totals)
+            measure_totals = {measure: [type_totals[label][measure] for label in group_labels] for measure in measure_totals}
+
+        result_rows = []
+        for group_index, label in enumerate(group_labels):
+            if not measure_totals['lines'][group_index]:
+                continue
+            revenue, cost = measure_totals['revenue'][group_index], measure_totals['cost'][group_index]
+            result_rows.append({dimension: label, 'revenue': round(revenue, 2), 'cost': round(cost, 2), 'profit': round(revenue - cost, 2),
+                                'quantity': int(measure_totals['quantity'][group_index]), 'lines': int(measure_totals['lines'][group_index])})
+        sort_key = (lambda result_row: str(result_row[dimension])) if order_by == 'label' else (lambda result_row: result_row[order_by])
+        result_rows.sort(key=sort_key, reverse=descending)
+        return result_rows[:top_n] if top_n else result_rows
+
+def fetch_product_dimensions(connection):
+    # Small tables: product types and the per-unit part cost (View4) computed client-side.
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute("SELECT product_id, productType FROM Product;")
+        product_types = dict(cursor.fetchall_unbuffered())
+        cursor.execute("SELECT part_id, price FROM Part;")
+        part_prices = {part_id: float(price) for part_id, price in cursor.fetchall_unbuffered() if price is not None}
+        cursor.execute("SELECT product_id, part_id, quantity FROM Product_Part;")
+        unit_costs = {}
+        for product_id, part_id, part_quantity in cursor.fetchall_unbuffered():
+            if part_quantity is not None and part_id in part_prices:
+                unit_costs[product_id] = unit_costs.get(product_id, 0.0) + part_quantity * part_prices[part_id]
+    return product_types, unit_costs
+
+def load_sales_dataset(connection, memory_budget_bytes=256 * 1024 * 1024, include_site=False, chunk_size=10000, progress_callback=None):
+    started_at = time.perf_counter()
+    dataset = SalesDataset(include_site=include_site)
+    dataset.product_types, unit_costs = fetch_product_dimensions(connection)
+    product_column, month_column = dataset.columns['product'], dataset.columns['month']
+    salesperson_column, customer_column = dataset.columns['salesperson'], dataset.columns['customer']
+    site_column = dataset.columns.get('site')
+    month_label_by_date = {}
+
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(SALE_LINES_SQL.format(site_column=", sh.siteID" if include_site else ""))
+        while True:
+            line_rows = cursor.fetchmany(chunk_size)
+            if not line_rows:
+                break
+            for line_row in line_rows:
+                product_id, quantity, unit_price, sale_date = line_row[0], line_row[1] or 0, line_row[2], line_row[3]
+                month_label = month_label_by_date.get(sale_date)
+                if month_label is None:
+                    month_label = month_label_by_date[sale_date] = sale_date.strftime('%Y-%m') if sale_date else None
+                product_column.codes.append(product_column.code_for(product_id))
+                month_column.codes.append(month_column.code_for(month_label))
+                salesperson_column.codes.append(salesperson_column.code_for(line_row[4]))
+                customer_column.codes.append(customer_column.code_for(line_row[5]))
+                if site_column is not None:
+                    site_column.codes.append(site_column.code_for(line_row[6]))
+                dataset.quantity.append(quantity)
+                dataset.revenue.append(quantity * float(unit_price) if unit_price is not None else 0.0)
+                dataset.cost.append(quantity * unit_costs.get(product_id, 0.0))
+            # Checked per chunk, so the budget can be overshot by at most one chunk.
+            if dataset.nbytes() > memory_budget_bytes:
+                raise AnalyticsMemoryError(
+                    f"Sales data exceeds the {memory_budget_bytes / (1024 * 1024):,.1f} MiB analytics budget after {len(dataset):,} lines."
+                )
+            if progress_callback:
+                progress_callback(len(dataset), dataset.nbytes(), time.perf_counter() - started_at)
+
+    dataset.loaded_at = time.time()
+    dataset.load_seconds = time.perf_counter() - started_at
+    return dataset
@@ -0,0 +1,131 @@
+import threading
+import time
+
+CATALOG_QUERY = """
+    SELECT 'table' AS entry_kind, t.TABLE_NAME AS table_name, NULL AS column_name, 0 AS position,
+           t.TABLE_TYPE AS column_type, NULL AS is_nullable, NULL AS column_key, NULL AS column_default,
+           NULL AS extra, NULL AS ref_table, NULL AS ref_column, NULL AS index_name, NULL AS non_unique
+    FROM information_schema.TABLES t
+    WHERE t.TABLE_SCHEMA = DATABASE() {table_filter_t}
+    UNION ALL
+    SELECT 'column', c.TABLE_NAME, c.COLUMN_NAME, c.ORDINAL_POSITION,
+           c.COLUMN_TYPE, c.IS_NULLABLE, c.COLUMN_KEY, c.COLUMN_DEFAULT,
+           c.EXTRA, NULL, NULL, NULL, NULL
+    FROM information_schema.COLUMNS c
+    WHERE c.TABLE_SCHEMA = DATABASE() {table_filter_c}
+    UNION ALL
+    SELECT 'foreign_key', k.TABLE_NAME, k.COLUMN_NAME, k.ORDINAL_POSITION,
+           NULL, NULL, NULL, NULL,
+           NULL, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME, k.CONSTRAINT_NAME, NULL
+    FROM information_schema.KEY_COLUMN_USAGE k
+    WHERE k.TABLE_SCHEMA = DATABASE() AND k.REFERENCED_TABLE_NAME IS NOT NULL {table_filter_k}
+    UNION ALL
+    SELECT 'index', s.TABLE_NAME, s.COLUMN_NAME, s.SEQ_IN_INDEX,
+           NULL, NULL, NULL, NULL,
+           NULL, NULL, NULL, s.INDEX_NAME, s.NON_UNIQUE
+    FROM information_schema.STATISTICS s
+    WHERE s.TABLE_SCHEMA = DATABASE() {table_filter_s}
+    ORDER BY table_name, entry_kind, index_name, position;
+"""
+
+DDL_STATEMENT_PREFIXES = ("CREATE", "ALTER", "DROP", "RENAME", "TRUNCATE")
+
+def is_ddl_statement(sql_text):
+    return sql_text.strip().upper().startswith(DDL_STATEMENT_PREFIXES)
+
+class SchemaCatalog:
+    def __init__(self, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        self._tables = {}
+        self._table_list_loaded_at = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0, 'invalidations': 0}
+
+    def _is_fresh(self, loaded_at):
+        return loaded_at is not None and (time.monotonic() - loaded_at) < self.ttl_seconds
+
+    def load(self, connection, table_name=None):
+        query_params = ()
+        filters = {'table_filter_t': '', 'table_filter_c': '', 'table_filter_k': '', 'table_filter_s': ''}
+        if table_name is not None:
+            for filter_key, alias in (('table_filter_t', 't'), ('table_filter_c', 'c'), ('table_filter_k', 'k'), ('table_filter_s', 's')):
+                filters[filter_key] = f"AND {alias}.TABLE_NAME = %s"
+            query_params = (table_name,) * 4
+
+        with connection.cursor() as cursor:
+            cursor.execute(CATALOG_QUERY.format(**filters), query_params)
+            catalog_rows = cursor.fetchall()
+
+        loaded_at = time.monotonic()
+        loaded_tables = {}
+        for catalog_row in catalog_rows:
+            entry = loaded_tables.setdefault(catalog_row['table_name'], {
+                'table_type': None, 'columns': [], 'primary_key': [], 'foreign_keys': [], 'indexes': {}, 'loaded_at': loaded_at
+            })
+            entry_kind = catalog_row['entry_kind']
+            if entry_kind == 'table':
+                entry['table_type'] = catalog_row['column_type']
+            elif entry_kind == 'column':
+                entry['columns'].append({
+                    'name': catalog_row['column_name'], 'type': catalog_row['column_type'],
+                    'nullable': (catalog_row['is_nullable'] or '').upper() == 'YES', 'key_type': catalog_row['column_key'] or '',
+                    'default_value': catalog_row['column_default'], 'extra_info': catalog_row['extra'] or ''
+                })
+            elif entry_kind == 'foreign_key':
+                entry['foreign_keys'].append({
+                    'constraint': catalog_row['index_name'], 'column': catalog_row['column_name'],
+                    'ref_table': catalog_row['ref_table'], 'ref_column': catalog_row['ref_column']
+                })
+            elif entry_kind == 'index':
+                index_entry = entry['indexes'].setdefault(catalog_row['index_name'], {
+                    'columns': [], 'unique': not int(catalog_row['non_unique'] or 0)
+                })
+                index_entry['columns'].append(catalog_row['column_name'])
+
+        for entry in loaded_tables.values():
+            if 'PRIMARY' in entry['indexes']:
+                entry['primary_key'] = list(entry['indexes']['PRIMARY']['columns'])
+            else:
+                entry['primary_key'] = [col['name'] for col in entry['columns'] if col['key_type'] == 'PRI']
+
+        with self._lock:
+            self.stats['loads'] += 1
+            if table_name is None:
+                self._tables = loaded_tables
+                self._table_list_loaded_at = loaded_at
+            else:
+                self._tables.pop(table_name, None)
+                self._tables.update(loaded_tables)
+        return loaded_tables
+
+    def table_names(self, connection):
+        with self._lock:
+            if self._is_fresh(self._table_list_loaded_at):
+                self.stats['hits'] += 1
+                return sorted(self._tables)
+            self.stats['misses'] += 1
+        return sorted(self.load(connection))
+
+    def get_table(self, connection, table_name):
+        with self._lock:
+            entry = self._tables.get(table_name)
+            if entry is not None and self._is_fresh(entry['loaded_at']):
+                self.stats['hits'] += 1
+                return entry
+            self.stats['misses'] += 1
+        return self.load(connection, table_name).get(table_name)
+
+    def get_columns(self, connection, table_name):
+        entry = self.get_table(connection, table_name)
+        if entry is None:
+            return [], []
+        return [dict(col) for col in entry['columns']], list(entry['primary_key'])
+
+    def invalidate(self, table_name=None):
+        with self._lock:
+            self.stats['invalidations'] += 1
+            if table_name is None:
+                self._tables = {}
+                self._table_list_loaded_at = None
+            else:
+                self._tables.pop(table_name, None)
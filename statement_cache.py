@@ -0,0 +1,147 @@
+import collections
+import itertools
+import threading
+import time
+import weakref
+
+import pymysql
+
+STATEMENT_OPERATIONS = ('insert', 'update', 'delete', 'select')
+UNKNOWN_PREPARED_STATEMENT_CODE = 1243
+# max_prepared_stmt_count reached: fall back to plain execution for the rest of the session.
+TOO_MANY_PREPARED_STATEMENTS_CODE = 1461
+
+class CachedStatement:
+    __slots__ = ('key', 'sql', 'prepare_sql', 'param_count')
+
+    def __init__(self, key, sql, prepare_sql, param_count):
+        self.key = key
+        self.sql = sql
+        self.prepare_sql = prepare_sql
+        self.param_count = param_count
+
+def build_statement(table_name, operation, columns=(), key_columns=()):
+    key_clause = " AND ".join(f"`{col}` = %s" for col in key_columns)
+    if operation == 'insert':
+        statement_sql = f"INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in columns)}) VALUES ({', '.join(['%s'] * len(columns))});"
+    elif operation == 'update':
+        statement_sql = f"UPDATE `{table_name}` SET {', '.join(f'`{col}` = %s' for col in columns)} WHERE {key_clause};"
+    elif operation == 'delete':
+        statement_sql = f"DELETE FROM `{table_name}` WHERE {key_clause};"
+    elif operation == 'select':
+        statement_sql = f"SELECT * FROM `{table_name}` WHERE {key_clause};"
+    else:
+        raise ValueError(f"Unknown statement operation '{operation}'. Choose one of: {', '.join(STATEMENT_OPERATIONS)}")
+    return statement_sql
+
+# Canonical parameterized CRUD statements, one per (table, operation, columns, key columns).
+# PyMySQL only speaks the text protocol, so with server_prepare the cache uses SQL-level
+# PREPARE/EXECUTE: the server parses each statement once per connection, at the cost of a
+# SET round trip for the parameters on every execution.
+class StatementCache:
+    def __init__(self, max_entries=256, server_prepare=False):
+        if max_entries < 1:
+            raise ValueError(f"Invalid statement cache size: max_entries={max_entries}")
+        self.max_entries = max_entries
+        self.server_prepare = server_prepare
+        self._statements = collections.OrderedDict()
+        self._prepared_by_connection = weakref.WeakKeyDictionary()
+        self._statement_names = itertools.count(1)
+        self._lock = threading.Lock()
+        self.stats = {operation: self._empty_stats() for operation in STATEMENT_OPERATIONS}
+
+    @staticmethod
+    def _empty_stats():
+        return {'hits': 0, 'misses': 0, 'build_ms': 0.0, 'lookup_ms': 0.0, 'executions': 0, 'execute_ms': 0.0, 'prepares': 0}
+
+    def get(self, table_name, operation, columns=(), key_columns=()):
+        started_at = time.perf_counter()
+        statement_key = (table_name, operation, tuple(columns), tuple(key_columns))
+        with self._lock:
+            statement = self._statements.get(statement_key)
+            if statement is not None:
+                self._statements.move_to_end(statement_key)
+                self.stats[operation]['hits'] += 1
+                self.stats[operation]['lookup_ms'] += (time.perf_counter() - started_at) * 1000
+                return statement
+        statement_sql = build_statement(table_name, operation, columns, key_columns)
+        statement = CachedStatement(statement_key, statement_sql, statement_sql.replace('%s', '?').rstrip(';'),
+                                    statement_sql.count('%s'))
+        with self._lock:
+            self._statements[statement_key] = statement
+            while len(self._statements) > self.max_entries:
+                self._statements.popitem(last=False)
+            self.stats[operation]['misses'] += 1
+            self.stats[operation]['build_ms'] += (time.perf_counter() - started_at) * 1000
+        return statement
+
+    def _prepared_names(self, connection):
+        # Prepared statements belong to one server session; a reconnect gets a new thread id.
+        with self._lock:
+            session_id, prepared_names = self._prepared_by_connection.get(connection, (None, None))
+            if prepared_names is None or session_id != connection.thread_id():
+                prepared_names = {}
+                self._prepared_by_connection[connection] = (connection.thread_id(), prepared_names)
+            return prepared_names
+
+    def _execute_prepared(self, cursor, statement, params):
+        prepared_names = self._prepared_names(cursor.connection)
+        for attempt in range(2):
+            statement_name = prepared_names.get(statement.key)
+            if statement_name is None:
+                statement_name = f"crud_stmt_{next(self._statement_names)}"
+                cursor.execute(f"PREPARE {statement_name} FROM %s;", (statement.prepare_sql,))
+                prepared_names[statement.key] = statement_name
+                with self._lock:
+                    self.stats[statement.key[1]]['prepares'] += 1
+            try:
+                if not params:
+                    return cursor.execute(f"EXECUTE {statement_name};")
+                param_names = [f"@crud_p{param_index}" for param_index in range(len(params))]
+                cursor.execute(f"SET {', '.join(f'{param_name} = %s' for param_name in param_names)};", tuple(params))
+                return cursor.execute(f"EXECUTE {statement_name} USING {', '.join(param_names)};")
+            except pymysql.err.OperationalError as e:
+                # Deallocated behind our back (e.g. by a client-side reset): prepare again once.
+                if attempt or not e.args or e.args[0] != UNKNOWN_PREPARED_STATEMENT_CODE:
+                    raise
+                prepared_names.pop(statement.key, None)
+
+    def execute(self, cursor, table_name, operation, columns=(), key_columns=(), params=()):
+        # Returns the affected/selected row count, like cursor.execute().
+        statement = self.get(table_name, operation, columns, key_columns)
+        if len(params) != statement.param_count:
+            raise ValueError(f"Statement for `{table_name}` ({operation}) takes {statement.param_count} parameter(s), got {len(params)}.")
+        started_at = time.perf_counter()
+        try:
+            if self.server_prepare:
+                try:
+                    return self._execute_prepared(cursor, statement, params)
+                except pymysql.err.OperationalError as e:
+                    if not e.args or e.args[0] != TOO_MANY_PREPARED_STATEMENTS_CODE:
+                        raise
+                    self.server_prepare = False
+            return cursor.execute(statement.sql, tuple(params))
+        finally:
+            with self._lock:
+                self.stats[operation]['executions'] += 1
+                self.stats[operation]['execute_ms'] += (time.perf_counter() - started_at) * 1000
+
+    def clear(self):
+        # After DDL. Server-side prepared statements are kept: MySQL re-prepares them itself when
+        # the table definition changes.
+        with self._lock:
+            self._statements.clear()
+
+    def snapshot(self):
+        with self._lock:
+            operation_stats = {operation: dict(stats) for operation, stats in self.stats.items()}
+            entry_count = len(self._statements)
+        for stats in operation_stats.values():
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            average_build_ms = stats['build_ms'] / stats['misses'] if stats['misses'] else 0.0
+            average_lookup_ms = stats['lookup_ms'] / stats['hits'] if stats['hits'] else 0.0
+            # Client-side saving only: each hit skipped building the SQL text.
+            stats['saved_ms'] = max(0.0, stats['hits'] * (average_build_ms - average_lookup_ms))
+            stats['avg_execute_ms'] = stats['execute_ms'] / stats['executions'] if stats['executions'] else 0.0
+        return {'entries': entry_count, 'server_prepare': self.server_prepare, 'operations': operation_stats}
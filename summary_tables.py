@@ -0,0 +1,448 @@
+import argparse
+import sys
+
+SUMMARY_TABLES = {
+    'employee_salary': 'summary_employee_salary',
+    'product_part_cost': 'summary_product_part_cost',
+    'product_type_sales': 'summary_product_type_sales',
+    'application_score': 'summary_application_score'
+}
+REFRESH_STATE_TABLE = 'summary_refresh_state'
+
+# Base tables whose writes can change a summary row, and the summaries they feed.
+SUMMARY_SOURCE_TABLES = {
+    'Employee_Salary': ('employee_salary',),
+    'Product_Part': ('product_part_cost', 'product_type_sales'),
+    'Part': ('product_part_cost', 'product_type_sales'),
+    'Sale_Product': ('product_type_sales',),
+    'Product': ('product_type_sales',),
+    'Interview': ('application_score',)
+}
+
+# Insert-only delta refresh for writes made outside the console: source rows whose watermark
+# column is above the stored watermark are aggregated and added to the summaries. The column
+# must grow with every inserted row, so the tables carry an AUTO_INCREMENT column for it:
+# Sale_Product's line_id (V006), Employee_Salary's entry_id (V007) and Interview's entry_id (V008).
+# A summary therefore holds exactly the source rows at or below its table's watermark; console
+# writes keep to that (apply_incremental_refresh) and full rebuilds move it (reset_watermarks).
+DELTA_WATERMARKS = {
+    'Employee_Salary': {'column': 'entry_id', 'source_alias': 's', 'summary': 'employee_salary'},
+    'Sale_Product': {'column': 'line_id', 'source_alias': 'sp', 'summary': 'product_type_sales'},
+    'Interview': {'column': 'entry_id', 'source_alias': 'i', 'summary': 'application_score'}
+}
+
+# Numeric score for an Interview.grade, matching the CASE the reports used to inline: letter
+# grades map to fixed scores, numeric text is truncated like CAST(... AS SIGNED), other text
+# scores 0 and NULL stays NULL. The REGEXP guard avoids the truncation warnings that strict
+# mode turns into errors inside INSERT ... SELECT.
+GRADE_SCORE_SQL = """CASE LCASE(i.grade)
+                WHEN 'a+' THEN 95 WHEN 'a' THEN 90
+                WHEN 'b+' THEN 85 WHEN 'b' THEN 80
+                WHEN 'c+' THEN 75 WHEN 'c' THEN 70
+                WHEN 'd' THEN 60
+                ELSE CASE
+                    WHEN i.grade REGEXP '^[+-]?[0-9]+([.][0-9]+)?$' THEN TRUNCATE(CAST(i.grade AS DECIMAL(8, 2)), 0)
+                    WHEN i.grade IS NOT NULL THEN 0
+                END
+            END"""
+
+# 'select' aggregates the source tables into summary rows (a full rebuild, or the watermark delta
+# with a filter in {where}/{and_where}). value_columns are additive, so a delta is added to the
+# stored row; orphan_filter finds rows that no longer have any source rows.
+SUMMARY_REFRESH_SQL = {
+    'employee_salary': {
+        'table': 'summary_employee_salary',
+        'key_column': 'employee_id',
+        'value_columns': ('salary_total', 'payment_count'),
+        'select': """
+            SELECT e.employee_id, SUM(s.amount) AS salary_total, COUNT(s.amount) AS payment_count
+            FROM Employee_Salary s
+            JOIN Employee e ON e.employee_id = s.employee_id
+            {where}
+            GROUP BY e.employee_id
+        """,
+        'orphan_filter': "NOT EXISTS (SELECT 1 FROM Employee_Salary s WHERE s.employee_id = summary_employee_salary.employee_id)"
+    },
+    'product_part_cost': {
+        'table': 'summary_product_part_cost',
+        'key_column': 'product_id',
+        'value_columns': ('total_part_cost',),
+        'select': """
+            SELECT pp.product_id, SUM(pp.quantity * pt.price) AS total_part_cost
+            FROM Product_Part pp
+            JOIN Part pt ON pt.part_id = pp.part_id
+            {where}
+            GROUP BY pp.product_id
+        """,
+        'orphan_filter': "NOT EXISTS (SELECT 1 FROM Product_Part pp WHERE pp.product_id = summary_product_part_cost.product_id)"
+    },
+    'product_type_sales': {
+        'table': 'summary_product_type_sales',
+        'key_column': 'productType',
+        'value_columns': ('total_items_sold', 'total_revenue', 'total_part_cost'),
+        'select': """
+            SELECT p.productType, SUM(sp.quantity) AS total_items_sold, SUM(sp.quantity * sp.unitPrice) AS total_revenue,
+                   IFNULL(SUM(sp.quantity * pc.total_part_cost), 0) AS total_part_cost
+            FROM Sale_Product sp
+            JOIN Product p ON p.product_id = sp.product_id
+            LEFT JOIN summary_product_part_cost pc ON pc.product_id = p.product_id
+            WHERE p.productType IS NOT NULL {and_where}
+            GROUP BY p.productType
+        """,
+        'orphan_filter': "NOT EXISTS (SELECT 1 FROM Sale_Product sp JOIN Product p ON p.product_id = sp.product_id "
+                         "WHERE p.productType = summary_product_type_sales.productType)"
+    },
+    'application_score': {
+        'table': 'summary_application_score',
+        'key_column': 'applicationID',
+        'value_columns': ('score_sum', 'scored_count', 'round_count'),
+        'select': """
+            SELECT i.applicationID, SUM(grade_score) AS score_sum, COUNT(grade_score) AS scored_count, COUNT(*) AS round_count
+            FROM (
+                SELECT i.applicationID, i.entry_id, """ + GRADE_SCORE_SQL + """ AS grade_score
+                FROM Interview i
+            ) i
+            WHERE i.applicationID IS NOT NULL {and_where}
+            GROUP BY i.applicationID
+        """,
+        'orphan_filter': "NOT EXISTS (SELECT 1 FROM Interview i WHERE i.applicationID = summary_application_score.applicationID)"
+    }
+}
+
+# Part costs feed product-type profit, so they must be refreshed first.
+SUMMARY_REFRESH_ORDER = ('employee_salary', 'product_part_cost', 'product_type_sales', 'application_score')
+
+def installed_summaries(table_names):
+    # Summaries arrive in separate migrations; only maintain the ones whose tables exist.
+    if REFRESH_STATE_TABLE not in table_names:
+        return ()
+    return tuple(summary_name for summary_name in SUMMARY_REFRESH_ORDER if SUMMARY_TABLES[summary_name] in table_names)
+
+def dependent_summaries(table_name, summary_names):
+    return tuple(summary_name for summary_name in summary_names if summary_name in SUMMARY_SOURCE_TABLES.get(table_name, ()))
+
+def fetch_column_values(cursor, sql_query, params):
+    cursor.execute(sql_query, params)
+    return {list(result_row.values())[0] if isinstance(result_row, dict) else result_row[0] for result_row in cursor.fetchall()}
+
+def in_list_sql(values):
+    return ", ".join(['%s'] * len(values))
+
+def sorted_keys(keys):
+    return sorted(set(keys) - {None}, key=str)
+
+def signed_rows(row_changes):
+    # A before image is taken out of the summaries and an after image added in.
+    for before_row, after_row in row_changes:
+        if before_row is not None:
+            yield -1, before_row
+        if after_row is not None:
+            yield 1, after_row
+
+def term(*factors):
+    # One row's share of SUM(a * b): nothing when a factor is NULL, as SUM() skips it.
+    product = 1
+    for factor in factors:
+        if factor is None:
+            return 0
+        product *= factor
+    return product
+
+class SummaryDeltas:
+    # Per summary: key -> signed change of each value column, and the keys that lost source rows
+    # (their summary row may have to go).
+    def __init__(self):
+        self.key_deltas = {}
+        self.removal_keys = {}
+
+    def add(self, summary_name, key, values, removal=False):
+        if key is None:
+            return
+        key_deltas = self.key_deltas.setdefault(summary_name, {})
+        key_deltas[key] = [total + value for total, value in zip(key_deltas.get(key, [0] * len(values)), values)]
+        if removal:
+            self.removal_keys.setdefault(summary_name, set()).add(key)
+
+    def summary_keys(self):
+        return {summary_name: set(key_deltas) for summary_name, key_deltas in self.key_deltas.items()}
+
+def fetch_dict_rows(cursor, sql_query, params):
+    cursor.execute(sql_query, params)
+    return [result_row if isinstance(result_row, dict) else dict(zip([column_info[0] for column_info in cursor.description], result_row))
+            for result_row in cursor.fetchall()]
+
+def current_watermark(cursor, source_table, for_update=False):
+    # None when the table has no stored watermark yet.
+    cursor.execute(f"SELECT watermark FROM summary_refresh_state WHERE source_table = %s{' FOR UPDATE' if for_update else ''};",
+                   (source_table,))
+    state_row = cursor.fetchone()
+    if state_row is None:
+        return None
+    return state_row['watermark'] if isinstance(state_row, dict) else state_row[0]
+
+def product_info(cursor, product_ids, with_sales=False):
+    # productType and unit part cost per product; with_sales adds the product's sold units and revenue,
+    # which move together when its type or part cost changes. Only sale lines the summary already
+    # holds are counted; lines above the watermark get the new type and cost at the next delta
+    # refresh, and the locked watermark keeps one from running in between.
+    product_ids = sorted_keys(product_ids)
+    if not product_ids:
+        return {}
+    sales_sql, sales_params = "", ()
+    if with_sales:
+        sale_watermark = current_watermark(cursor, 'Sale_Product', for_update=True)
+        line_filter = "" if sale_watermark is None else f" AND sp.`{DELTA_WATERMARKS['Sale_Product']['column']}` <= %s"
+        sales_sql = f""",
+               (SELECT SUM(sp.quantity) FROM Sale_Product sp WHERE sp.product_id = p.product_id{line_filter}) AS units_sold,
+               (SELECT SUM(sp.quantity * sp.unitPrice) FROM Sale_Product sp WHERE sp.product_id = p.product_id{line_filter}) AS revenue"""
+        sales_params = () if sale_watermark is None else (sale_watermark, sale_watermark)
+    product_rows = fetch_dict_rows(
+        cursor,
+        f"""SELECT p.product_id, p.productType, pc.total_part_cost{sales_sql}
+        FROM Product p
+        LEFT JOIN summary_product_part_cost pc ON pc.product_id = p.product_id
+        WHERE p.product_id IN ({in_list_sql(product_ids)});""",
+        sales_params + tuple(product_ids)
+    )
+    return {product_row['product_id']: product_row for product_row in product_rows}
+
+def grade_scores(cursor, grades):
+    # Scores come from GRADE_SCORE_SQL itself so the deltas can't drift from the full rebuild.
+    grades = sorted_keys(grades)
+    if not grades:
+        return {}
+    score_rows = fetch_dict_rows(
+        cursor,
+        f"SELECT i.grade, {GRADE_SCORE_SQL} AS grade_score FROM ({' UNION ALL '.join(['SELECT %s AS grade'] * len(grades))}) i;",
+        tuple(grades)
+    )
+    return {score_row['grade']: score_row['grade_score'] for score_row in score_rows}
+
+def add_part_cost_deltas(cursor, summary_deltas, cost_deltas, removal_products=()):
+    # A product's part cost changes the cost of every unit of it already sold.
+    for product_id, cost_delta in cost_deltas.items():
+        summary_deltas.add('product_part_cost', product_id, [cost_delta], product_id in removal_products)
+    for product_id, product_row in product_info(cursor, [product_id for product_id, cost_delta in cost_deltas.items() if cost_delta],
+                                                with_sales=True).items():
+        if product_row['productType'] is not None:
+            summary_deltas.add('product_type_sales', product_row['productType'], [0, 0, term(product_row['units_sold'], cost_deltas[product_id])])
+
+def summary_deltas_for(connection, table_name, row_changes):
+    # row_changes: (before, after) images as stored in the database. Lookups read the tables after
+    # the write, so the caller runs this once the statement has been executed.
+    summary_deltas = SummaryDeltas()
+    row_changes = list(row_changes)
+    with connection.cursor() as cursor:
+        if table_name == 'Employee_Salary':
+            for sign, row_values in signed_rows(row_changes):
+                amount = row_values.get('amount')
+                summary_deltas.add('employee_salary', row_values.get('employee_id'), [sign * term(amount), sign * (amount is not None)], sign < 0)
+        elif table_name == 'Interview':
+            scores = grade_scores(cursor, [row_values.get('grade') for _, row_values in signed_rows(row_changes)])
+            for sign, row_values in signed_rows(row_changes):
+                grade_score = scores.get(row_values.get('grade'))
+                summary_deltas.add('application_score', row_values.get('applicationID'),
+                                   [sign * term(grade_score), sign * (grade_score is not None), sign], sign < 0)
+        elif table_name == 'Sale_Product':
+            products = product_info(cursor, [row_values.get('product_id') for _, row_values in signed_rows(row_changes)])
+            for sign, row_values in signed_rows(row_changes):
+                product_row = products.get(row_values.get('product_id'))
+                if product_row is None or product_row['productType'] is None:
+                    continue
+                quantity = row_values.get('quantity')
+                summary_deltas.add('product_type_sales', product_row['productType'],
+                                   [sign * term(quantity), sign * term(quantity, row_values.get('unitPrice')),
+                                    sign * term(quantity, product_row['total_part_cost'])], sign < 0)
+        elif table_name == 'Product':
+            # Only a change of productType moves the product's sales between summary rows.
+            moved_changes = [(before_row, after_row) for before_row, after_row in row_changes
+                             if before_row is None or after_row is None or before_row.get('productType') != after_row.get('productType')
+                             or before_row.get('product_id') != after_row.get('product_id')]
+            products = product_info(cursor, [row_values.get('product_id') for _, row_values in signed_rows(moved_changes)], with_sales=True)
+            for sign, row_values in signed_rows(moved_changes):
+                product_row = products.get(row_values.get('product_id'))
+                if product_row is None or row_values.get('productType') is None:
+                    continue
+                summary_deltas.add('product_type_sales', row_values.get('productType'),
+                                   [sign * term(product_row['units_sold']), sign * term(product_row['revenue']),
+                                    sign * term(product_row['units_sold'], product_row['total_part_cost'])], sign < 0)
+        elif table_name == 'Product_Part':
+            part_ids = sorted_keys(row_values.get('part_id') for _, row_values in signed_rows(row_changes))
+            part_prices = {part_row['part_id']: part_row['price'] for part_row in fetch_dict_rows(
+                cursor, f"SELECT part_id, price FROM Part WHERE part_id IN ({in_list_sql(part_ids)});", tuple(part_ids))} if part_ids else {}
+            cost_deltas, removal_products = {}, set()
+            for sign, row_values in signed_rows(row_changes):
+                product_id = row_values.get('product_id')
+                cost_deltas[product_id] = cost_deltas.get(product_id, 0) + sign * term(row_values.get('quantity'), part_prices.get(row_values.get('part_id')))
+                if sign < 0:
+                    removal_products.add(product_id)
+            cost_deltas.pop(None, None)
+            add_part_cost_deltas(cursor, summary_deltas, cost_deltas, removal_products)
+        elif table_name == 'Part':
+            part_ids = sorted_keys(row_values.get('part_id') for _, row_values in signed_rows(row_changes))
+            part_usage = fetch_dict_rows(
+                cursor, f"SELECT part_id, product_id, quantity FROM Product_Part WHERE part_id IN ({in_list_sql(part_ids)});", tuple(part_ids)
+            ) if part_ids else []
+            cost_deltas = {}
+            for sign, row_values in signed_rows(row_changes):
+                for usage_row in part_usage:
+                    if usage_row['part_id'] == row_values.get('part_id'):
+                        cost_deltas[usage_row['product_id']] = cost_deltas.get(usage_row['product_id'], 0) \
+                            + sign * term(usage_row['quantity'], row_values.get('price'))
+            add_part_cost_deltas(cursor, summary_deltas, cost_deltas)
+    return summary_deltas
+
+def apply_summary_deltas(connection, summary_name, key_deltas, removal_keys=()):
+    # Adds each key's deltas to its summary row (creating it), in key order so concurrent writers
+    # lock summary rows in the same order. Rows left without source rows are then removed.
+    refresh_sql = SUMMARY_REFRESH_SQL[summary_name]
+    value_columns = refresh_sql['value_columns']
+    delta_rows = [(key,) + tuple(key_deltas[key]) for key in sorted_keys(key_deltas) if any(key_deltas[key])]
+    removal_keys = sorted_keys(removal_keys)
+    with connection.cursor() as cursor:
+        if delta_rows:
+            cursor.executemany(
+                f"INSERT INTO {refresh_sql['table']} ({refresh_sql['key_column']}, {', '.join(value_columns)}) "
+                f"VALUES ({in_list_sql(delta_rows[0])}) ON DUPLICATE KEY UPDATE "
+                + ", ".join(f"{column} = IFNULL({column}, 0) + VALUES({column})" for column in value_columns),
+                delta_rows
+            )
+        if removal_keys:
+            cursor.execute(f"DELETE FROM {refresh_sql['table']} WHERE {refresh_sql['key_column']} IN ({in_list_sql(removal_keys)}) "
+                           f"AND {refresh_sql['orphan_filter']};", tuple(removal_keys))
+    return len(delta_rows)
+
+def refresh_summary_full(connection, summary_name):
+    refresh_sql = SUMMARY_REFRESH_SQL[summary_name]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {refresh_sql['table']};")
+        return cursor.execute(f"INSERT INTO {refresh_sql['table']} ({refresh_sql['key_column']}, {', '.join(refresh_sql['value_columns'])}) "
+                              + refresh_sql['select'].format(where='', and_where='') + ";")
+
+def split_at_watermark(row_changes, watermark_column, watermark):
+    # Drops the images of rows above the watermark, which the summary does not hold yet. Inserted
+    # rows always are (the column grows with every insert), even if the image lacks the column.
+    # Returns the remaining changes and whether a row above the watermark now exists.
+    held_changes, rows_above = [], False
+    for before_row, after_row in row_changes:
+        if before_row is not None and (before_row.get(watermark_column) or 0) > watermark:
+            before_row = None
+        if after_row is not None and (before_row is None or (after_row.get(watermark_column) or 0) > watermark):
+            after_row, rows_above = None, True
+        held_changes.append((before_row, after_row))
+    return held_changes, rows_above
+
+def apply_incremental_refresh(connection, table_name, row_changes, summary_names=SUMMARY_REFRESH_ORDER):
+    # Constant work per written row: its before/after images become signed deltas on the few
+    # summary rows it feeds, instead of re-aggregating the source tables for those keys. Rows above
+    # a delta table's watermark (inserts, and rows other clients added since the last refresh) are
+    # left to refresh_delta, which adds them at their current values and moves the watermark.
+    if table_name not in SUMMARY_SOURCE_TABLES:
+        return {}
+    row_changes = list(row_changes)
+    watermark_info = DELTA_WATERMARKS.get(table_name)
+    catch_up = False
+    if watermark_info and watermark_info['summary'] in summary_names:
+        with connection.cursor() as cursor:
+            watermark = current_watermark(cursor, table_name, for_update=True)
+        if watermark is not None:
+            row_changes, catch_up = split_at_watermark(row_changes, watermark_info['column'], watermark)
+    summary_deltas = summary_deltas_for(connection, table_name, row_changes)
+    for summary_name in SUMMARY_REFRESH_ORDER:
+        if summary_name in summary_names and summary_name in summary_deltas.key_deltas:
+            apply_summary_deltas(connection, summary_name, summary_deltas.key_deltas[summary_name],
+                                 summary_deltas.removal_keys.get(summary_name, ()))
+    if catch_up:
+        refresh_delta(connection, table_name)
+    return {summary_name: keys for summary_name, keys in summary_deltas.summary_keys().items() if summary_name in summary_names}
+
+def reset_watermarks(connection, summary_names):
+    # A rebuilt summary holds every current source row, so its delta starts from the top again.
+    with connection.cursor() as cursor:
+        for source_table, watermark_info in DELTA_WATERMARKS.items():
+            if watermark_info['summary'] in summary_names:
+                cursor.execute(
+                    f"REPLACE INTO summary_refresh_state (source_table, watermark, refreshed_at) "
+                    f"SELECT %s, IFNULL(MAX(`{watermark_info['column']}`), 0), NOW() FROM `{source_table}`;",
+                    (source_table,)
+                )
+
+def refresh_summaries_full(connection, summary_names):
+    # Rebuilds the given summaries in dependency order and resets their watermarks.
+    refreshed = {}
+    for summary_name in SUMMARY_REFRESH_ORDER:
+        if summary_name in summary_names:
+            refreshed[summary_name] = refresh_summary_full(connection, summary_name)
+    reset_watermarks(connection, refreshed)
+    return refreshed
+
+def refresh_dependent_summaries_full(connection, table_name, summary_names=SUMMARY_REFRESH_ORDER):
+    return list(refresh_summaries_full(connection, dependent_summaries(table_name, summary_names)))
+
+def refresh_delta(connection, source_table):
+    # Adds the rows inserted since the last watermark to the summary; returns how many there were.
+    watermark_info = DELTA_WATERMARKS[source_table]
+    refresh_sql = SUMMARY_REFRESH_SQL[watermark_info['summary']]
+    watermark_column = f"{watermark_info['source_alias']}.`{watermark_info['column']}`"
+    with connection.cursor() as cursor:
+        last_watermark = current_watermark(cursor, source_table, for_update=True) or 0
+        cursor.execute(
+            f"SELECT COUNT(*) AS new_rows, MAX(`{watermark_info['column']}`) AS new_watermark FROM `{source_table}` WHERE `{watermark_info['column']}` > %s;",
+            (last_watermark,)
+        )
+        watermark_row = cursor.fetchone()
+        if watermark_row['new_watermark'] is None:
+            return 0
+        watermark_filter = f"{watermark_column} > %s AND {watermark_column} <= %s"
+        cursor.execute(
+            f"INSERT INTO {refresh_sql['table']} ({refresh_sql['key_column']}, {', '.join(refresh_sql['value_columns'])}) "
+            f"SELECT * FROM ({refresh_sql['select'].format(where=f'WHERE {watermark_filter}', and_where=f'AND {watermark_filter}')}) AS delta "
+            "ON DUPLICATE KEY UPDATE " + ", ".join(f"{column} = IFNULL({refresh_sql['table']}.{column}, 0) + IFNULL(delta.{column}, 0)"
+                                                   for column in refresh_sql['value_columns']) + ";",
+            (last_watermark, watermark_row['new_watermark'])
+        )
+        cursor.execute(
+            "REPLACE INTO summary_refresh_state (source_table, watermark, refreshed_at) VALUES (%s, %s, NOW());",
+            (source_table, watermark_row['new_watermark'])
+        )
+    return watermark_row['new_rows']
+
+def refresh_all(connection, full=False, summary_names=SUMMARY_REFRESH_ORDER):
+    if full:
+        refresh_report = refresh_summaries_full(connection, summary_names)
+    else:
+        refresh_report = {source_table: refresh_delta(connection, source_table)
+                          for source_table, watermark_info in DELTA_WATERMARKS.items() if watermark_info['summary'] in summary_names}
+    connection.commit()
+    return refresh_report
+
+def main(argv=None):
+    import pymysql
+    import Console
+
+    parser = argparse.ArgumentParser(description="Refresh the materialized summary tables (for cron).")
+    parser.add_argument('--full', action='store_true', help="rebuild every summary instead of applying the insert delta")
+    args = parser.parse_args(argv)
+    try:
+        connection = pymysql.connect(**Console.DB_CONFIG)
+    except pymysql.Error as e:
+        print(f"FATAL: Error connecting to the MySQL database: {e}")
+        return 1
+    try:
+        summary_names = installed_summaries(Console.SCHEMA_CATALOG.table_names(connection))
+        if not summary_names:
+            print("No summary tables are installed; apply the summary migrations first.")
+            return 1
+        refresh_report = refresh_all(connection, full=args.full, summary_names=summary_names)
+    except pymysql.Error as e:
+        connection.rollback()
+        Console.handle_database_error(e, "refreshing summary tables")
+        return 1
+    finally:
+        connection.close()
+    for refreshed_name, refreshed_count in refresh_report.items():
+        print(f"{refreshed_name}: {refreshed_count} {'row(s) rebuilt' if args.full else 'new source row(s) applied'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import itertools
+import os
+import shlex
+import sys
+
+DEFAULT_MAX_COLUMN_WIDTH = 40
+DEFAULT_SAMPLE_ROWS = 1000
+DEFAULT_CHUNK_ROWS = 2000
+DEFAULT_PAGER_COMMAND = "less -S -F -R -X"
+COLUMN_SEPARATOR = " | "
+ELLIPSIS = '...'
+# Line breaks and tabs inside a value would break the row layout.
+CONTROL_CHARACTERS = {ord('\n'): ' ', ord('\r'): ' ', ord('\t'): ' '}
+
+def row_tuples(rows, column_names):
+    # ResultSets hand out plain tuples without building a row view per row. Mapping rows from one
+    # cursor share their key order; a row missing a column shows it empty.
+    if hasattr(rows, 'tuples'):
+        return rows.tuples()
+    column_count = len(column_names)
+    return (row.values() if len(row) == column_count else [row.get(column_name, '') for column_name in column_names] for row in rows)
+
+def sample_column_widths(column_names, sample_rows, max_column_width):
+    # Widths come from the header and the first sample_rows rows only, capped at max_column_width;
+    # a header is never cut. Later, longer values overflow their column rather than being cut.
+    column_widths = [min(len(str(column_name)), max_column_width) for column_name in column_names]
+    for row in sample_rows:
+        for column_index, value in enumerate(row):
+            value_length = len(str(value))
+            if value_length > column_widths[column_index]:
+                column_widths[column_index] = min(value_length, max_column_width)
+    return [max(column_width, len(str(column_name))) for column_width, column_name in zip(column_widths, column_names)]
+
+def row_formatter(column_widths, max_column_width=DEFAULT_MAX_COLUMN_WIDTH):
+    # One %-template per table. Only cells over max_column_width (or a wider header) are cut with
+    # an ellipsis; a cell wider than its sampled width but under that cap pushes the rest of its
+    # line right. Control characters are replaced per line (a 1:1 swap, so the padding stays right).
+    row_template = COLUMN_SEPARATOR.join(f"%-{column_width}s" for column_width in column_widths)
+    cut_widths = [(cap_width, max(cap_width - len(ELLIPSIS), 0))
+                  for cap_width in (max(column_width, max_column_width) for column_width in column_widths)]
+
+    def format_row(row):
+        row_line = row_template % tuple([cell_text if len(cell_text) <= cap_width else cell_text[:cut_width] + ELLIPSIS
+                                         for cell_text, (cap_width, cut_width) in zip(map(str, row), cut_widths)])
+        if '\n' in row_line or '\r' in row_line or '\t' in row_line:
+            row_line = row_line.translate(CONTROL_CHARACTERS)
+        return row_line
+
+    return format_row
+
+def render_rows(output_stream, column_names, rows, max_column_width=DEFAULT_MAX_COLUMN_WIDTH, sample_rows=DEFAULT_SAMPLE_ROWS,
+                chunk_rows=DEFAULT_CHUNK_ROWS):
+    # rows: tuples in column_names order. Each cell is converted to text once and rows are written
+    # chunk_rows at a time. Returns the number of rows written.
+    row_iter = iter(rows)
+    sample = []
+    for row in row_iter:
+        sample.append(row)
+        if len(sample) >= sample_rows:
+            break
+    column_widths = sample_column_widths(column_names, sample, max_column_width)
+    format_row = row_formatter(column_widths, max_column_width)
+    separator_line = COLUMN_SEPARATOR.join('-' * column_width for column_width in column_widths)
+    output_stream.write("\n" + format_row(column_names) + "\n" + separator_line + "\n")
+
+    row_count = 0
+    line_chunk = []
+    for row in itertools.chain(sample, row_iter):
+        line_chunk.append(format_row(row))
+        if len(line_chunk) >= chunk_rows:
+            output_stream.write("\n".join(line_chunk) + "\n")
+            row_count += len(line_chunk)
+            line_chunk = []
+    row_count += len(line_chunk)
+    line_chunk.append(separator_line)
+    output_stream.write("\n".join(line_chunk) + "\n")
+    return row_count
+
+def terminal_rows():
+    import shutil
+    return shutil.get_terminal_size(fallback=(80, 24)).lines
+
+def should_page(row_count, pager_mode, output_stream=None):
+    # 'auto' pages only an interactive terminal, and only when the table would scroll past it.
+    output_stream = output_stream or sys.stdout
+    if pager_mode == 'never':
+        return False
+    if not output_stream.isatty():
+        return False
+    return pager_mode == 'always' or row_count + 5 > terminal_rows()
+
+def open_pager(pager_command=None):
+    # $PAGER wins over the default; returns None when no pager can be started (e.g. no `less`).
+    import subprocess
+
+    pager_command = pager_command or os.environ.get('PAGER') or DEFAULT_PAGER_COMMAND
+    try:
+        return subprocess.Popen(shlex.split(pager_command), stdin=subprocess.PIPE, encoding=sys.stdout.encoding or 'utf-8',
+                                errors='replace')
+    except OSError:
+        return None
+
+def render_table(column_names, rows, row_count, footer=None, max_column_width=DEFAULT_MAX_COLUMN_WIDTH,
+                 sample_rows=DEFAULT_SAMPLE_ROWS, chunk_rows=DEFAULT_CHUNK_ROWS, pager_mode='auto', pager_command=None):
+    column_names = list(column_names)
+    pager_process = open_pager(pager_command) if should_page(row_count, pager_mode) else None
+    output_stream = pager_process.stdin if pager_process else sys.stdout
+    try:
+        render_rows(output_stream, [str(column_name) for column_name in column_names], rows, max_column_width, sample_rows, chunk_rows)
+        if footer:
+            output_stream.write(footer + "\n")
+        output_stream.flush()
+    except BrokenPipeError:
+        # The pager was quit before the last row; that is the reader's choice, not an error.
+        if not pager_process:
+            raise
+    finally:
+        if pager_process:
+            try:
+                pager_process.stdin.close()
+            except BrokenPipeError:
+                pass
+            pager_process.wait()